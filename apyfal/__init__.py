@@ -25,8 +25,9 @@ if (_py[0] < 2) or (_py[0] == 2 and _py[1] < 7) or (_py[0] == 3 and _py[1] < 4):
     from sys import version
     raise ImportError('Python %s is not supported by Apyfal' % version)
 
-import apyfal.host as _hst
-import apyfal.client as _clt
+from importlib import import_module as _import_module
+from os import getpid as _getpid
+
 import apyfal.exceptions as _exc
 import apyfal.configuration as _cfg
 from apyfal._utilities import get_logger as _get_logger
@@ -35,15 +36,38 @@ from apyfal._utilities import get_logger as _get_logger
 # Makes get_logger available here for easy access
 get_logger = _get_logger
 
+# Sub packages imported on first access to reduce "import apyfal" time
+_LAZY_MODULES = ('client', 'host', 'pool', 'storage')
+
+if _py >= (3, 7):
+    def __getattr__(name):
+        """Imports sub packages on first access"""
+        if name in _LAZY_MODULES:
+            return _import_module('apyfal.%s' % name)
+        raise AttributeError(
+            "module 'apyfal' has no attribute '%s'" % name)
+
+else:
+    # Python < 3.7: No module "__getattr__" support, imports eagerly
+    import apyfal.host
+    import apyfal.client
+
 
 class Accelerator(object):
     """
     This class provides the full accelerator features by handling
     Accelerator and its host.
 
+    Accelerators can be shared with other processes (Like "multiprocessing"
+    pool workers) by pickling them, or with their "handle". In other
+    processes, they are attached to the same host and configuration and never
+    stop them.
+
     Args:
-        accelerator (str): Name of the accelerator to initialize,
+        accelerator (str or apyfal.client.AcceleratorHandle): Name of the accelerator to initialize,
             to know the accelerator list please visit "https://accelstore.accelize.com".
+            Can also be an handle of an accelerator to attach to, other arguments are
+            then ignored.
         config (str or apyfal.configuration.Configuration or file-like object):
             Can be Configuration instance, apyfal.storage URL, paths, file-like object.
             If not set, will search it in current working directory, in current
@@ -62,9 +86,23 @@ class Accelerator(object):
         host_kwargs: Keyword arguments related to specific host. See targeted host class
             to see full list of arguments.
     """
+    # Process that created the accelerator
+    _pid = None
+
     def __init__(self, accelerator=None, config=None, accelize_client_id=None,
                  accelize_secret_id=None, host_type=None, host_ip=None,
                  stop_mode='term', **host_kwargs):
+        self._pid = _getpid()
+
+        # Lazy import since not required to import "apyfal"
+        from apyfal.host import Host
+        from apyfal.client import AcceleratorClient, AcceleratorHandle
+
+        # Attach to an existing accelerator, without host
+        if isinstance(accelerator, AcceleratorHandle):
+            self._host = None
+            self._client = accelerator.attach_client()
+            return
 
         # Initialize configuration
         config = _cfg.create_configuration(config)
@@ -73,7 +111,7 @@ class Accelerator(object):
         host_type = host_type or config['host']['host_type']
         if host_type is not None:
             # Use a remote host
-            self._host = _hst.Host(
+            self._host = Host(
                 host_type=host_type, config=config, host_ip=host_ip,
                 stop_mode=stop_mode, **host_kwargs)
 
@@ -89,11 +127,13 @@ class Accelerator(object):
             # Use local host
             self._host = None
 
-            # Use default local client if not specified IP
-            client_type = 'REST' if host_ip else None
+            # Use default local client if not specified IP, or local broker
+            # if configured
+            client_type = 'REST' if host_ip else (
+                'Broker' if config['host']['broker_socket'] else None)
 
         # Create AcceleratorClient object
-        self._client = _clt.AcceleratorClient(
+        self._client = AcceleratorClient(
             accelerator=accelerator, client_type=client_type,
             accelize_client_id=accelize_client_id, host_ip=host_ip,
             accelize_secret_id=accelize_secret_id, config=config)
@@ -105,7 +145,28 @@ class Accelerator(object):
         self.stop()
 
     def __del__(self):
-        self.stop()
+        # Copies of accelerator in forked processes do not stop host
+        if self._pid == _getpid():
+            self.stop()
+
+    def __reduce__(self):
+        # Pickled as handle, unpickled as attached accelerator
+        return Accelerator, (self.handle,)
+
+    @property
+    def handle(self):
+        """
+        Serializable handle that other processes can use to attach to this
+        accelerator.
+
+        Returns:
+            apyfal.client.AcceleratorHandle: Handle.
+
+        Raises:
+            apyfal.exceptions.ClientRuntimeException: Accelerator can't be
+                shared with other processes.
+        """
+        return self._client.handle
 
     @property
     def client(self):
@@ -135,9 +196,11 @@ class Accelerator(object):
             stop_mode (str or int): Host stop mode. If not None, override current "stop_mode" value.
                 See "apyfal.host.Host.stop_mode" property for more
                 information and possible values.
-            datafile (str or file-like object): Depending on the accelerator,
-                a configuration data file need to be loaded before a process can be run.
-                Can be apyfal.storage URL, paths, file-like object.
+            datafile (str or file-like object or bytes-like object):
+                Depending on the accelerator, a configuration data file need
+                to be loaded before a process can be run. Can be
+                apyfal.storage URL, paths, file-like object, object supporting
+                the buffer protocol.
             info_dict (bool): If True, returns a dict containing information on
                 configuration operation.
             parameters (str or dict): Accelerator configuration specific parameters
@@ -171,10 +234,15 @@ class Accelerator(object):
         Processes with accelerator.
 
         Args:
-            file_in (str or file-like object): Input file to process.
-                Can be apyfal.storage URL, paths, file-like object.
-            file_out (str or file-like object): Output processed file.
-                Can be apyfal.storage URL, paths, file-like object.
+            file_in (str or file-like object or bytes-like object): Input
+                file to process. Can be apyfal.storage URL, paths, file-like
+                object, object supporting the buffer protocol (bytes,
+                memoryview, NumPy array, ...).
+            file_out (str or file-like object or bytes-like object): Output
+                processed file. Can be apyfal.storage URL, paths, file-like
+                object, writable object supporting the buffer protocol. A
+                bytearray is resized to output size, other buffers must be
+                large enough to contain output.
             info_dict (bool): If True, returns a dict containing information on
                 process operation.
             parameters (str or dict): Accelerator process specific parameters
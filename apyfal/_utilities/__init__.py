@@ -10,7 +10,7 @@ import re
 import sys
 import time
 
-import requests
+from apyfal._utilities.retry import RetryPolicy
 
 
 _CACHE = dict()  # Store some cached values
@@ -52,14 +52,57 @@ else:
     ABC = abc.ABCMeta('ABC', (object,), {})
 
 
+# Factory subclasses registry: {factory class: {lowercase name: subclass}}
+_FACTORY_REGISTRY = dict()
+
+
+class _FactoryMeta(abc.ABCMeta):
+    """Abstract base class metaclass registering subclasses defining a "NAME"
+    class attribute in factory registry."""
+
+    def __init__(cls, name, bases, namespace):
+        abc.ABCMeta.__init__(cls, name, bases, namespace)
+        if namespace.get('NAME'):
+            register(cls)
+
+
+# Abstract base class of classes instantiated with "factory"
+FactoryABC = _FactoryMeta('FactoryABC', (object,), {})
+
+
+def register(subclass, cls_type=None):
+    """Register a subclass to make it available from "factory".
+
+    Subclasses of "FactoryABC" defining a "NAME" class attribute are
+    registered on definition.
+
+    Args:
+        subclass (class): Subclass to register.
+        cls_type (str): Type name. Default to "subclass.NAME".
+
+    Returns:
+        class: subclass.
+    """
+    cls_type_low = (cls_type or subclass.NAME).lower()
+    for base in subclass.__mro__[1:]:
+        if isinstance(base, _FactoryMeta):
+            _FACTORY_REGISTRY.setdefault(base, dict())[
+                cls_type_low] = subclass
+    return subclass
+
+
 def factory(cls, cls_type, parameter_name, exc_type):
     """Find and instantiate target subclass by its name.
 
-    Target subclass must follow rules:
-    - module containing subclass must be in a submodule of the
-      one containing the parent class.
-    - module containing subclass name must be cls_type.lower()
-    - Class must have a class attribute NAME matching cls_type.
+    Target subclass is found in registered subclasses (See "register").
+
+    If not already registered, target subclass is imported from:
+    - A submodule of the one containing the parent class, named
+      cls_type.lower(). Class must have a class attribute NAME matching
+      cls_type.
+    - An entry point named cls_type.lower() in the group named as the
+      module containing the parent class (Example: "apyfal.storage").
+      This allows subclasses provided by third party packages.
 
     Args:
         cls (class): Parent class.
@@ -76,36 +119,67 @@ def factory(cls, cls_type, parameter_name, exc_type):
         return object.__new__(cls)
 
     cls_type_low = cls_type.lower()
+    registry = _FACTORY_REGISTRY.setdefault(cls, dict())
 
-    # Finds module containing target subclass
+    # Finds registered target subclass
+    try:
+        return object.__new__(registry[cls_type_low])
+    except KeyError:
+        pass
+
+    # Finds module containing target subclass, subclass is registered
+    # on import
     module_name = '%s.%s' % (cls.__module__, cls_type_low)
     try:
-        module = import_module(module_name)
+        import_module(module_name)
     except ImportError as exception:
-        if cls_type_low in str(exception):
-            # If ImportError for current module name, may be
-            # a configuration error.
+        if cls_type_low not in str(exception):
+            # ImportError of another module, raised as it
+            raise
+
+        # If no module, finds entry point
+        for entry_point in _entry_points(cls.__module__):
+            if entry_point.name.lower() == cls_type_low:
+                register(entry_point.load(), cls_type_low)
+                break
+        else:
+            # May be a configuration error.
             raise exc_type(
                 "No module '%s' for '%s' %s" % (
                     module_name, cls_type, parameter_name))
-        # ImportError of another module, raised as it
-        raise
 
-    # Finds target subclass
-    for name in dir(module):
-        member = getattr(module, name)
-        try:
-            if getattr(member, 'NAME').lower() == cls_type_low:
-                break
-        except AttributeError:
-            continue
-    else:
+    # Instantiates target subclass
+    try:
+        return object.__new__(registry[cls_type_low])
+    except KeyError:
         raise exc_type(
             "No class found in '%s' for '%s' %s" % (
                 module_name, cls_type, parameter_name))
 
-    # Instantiates target subclass
-    return object.__new__(member)
+
+def _entry_points(group):
+    """
+    Get entry points of a group.
+
+    Args:
+        group (str): Entry points group.
+
+    Returns:
+        list: Entry points with "name" attribute and "load" method.
+    """
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        # Python < 3.8
+        from pkg_resources import iter_entry_points
+        return list(iter_entry_points(group))
+
+    points = entry_points()
+    try:
+        return list(points.select(group=group))
+    except AttributeError:
+        # Python < 3.10
+        return list(points.get(group, ()))
 
 
 def get_first_arg(args, kwargs, name):
@@ -161,19 +235,38 @@ class Timeout:
         return False
 
 
-def http_session(max_retries=2, https=True):
+#: Default retry and timeout policy of network calls
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+def http_session(max_retries=None, https=True, retry_policy=None,
+                 pool_size=None):
     """
     Instantiate HTTP session
 
     Args:
-        max_retries (int): The maximum number of retries each connection should attempt
+        max_retries (int): The maximum number of retries each connection should attempt.
+            If specified, overrides "retry_policy" value.
         https (bool): If True, enables HTTPS and HTTP support. Else only HTTP support.
+        retry_policy (apyfal._utilities.retry.RetryPolicy): Retry and timeout policy.
+            Default to "DEFAULT_RETRY_POLICY".
+        pool_size (int): Maximum number of connections kept by host.
+            Should be the number of threads using the session.
+            Default to "requests" default value.
 
     Returns:
         requests.Session: Http session
     """
+    # Lazy import since "requests" is slow to import and not always used
+    import requests
+    from apyfal._utilities.http import TimeoutHTTPAdapter
+
     session = requests.Session()
-    adapter = requests.adapters.HTTPAdapter(max_retries=max_retries)
+    kwargs = dict(pool_connections=pool_size, pool_maxsize=pool_size) \
+        if pool_size else dict()
+    adapter = TimeoutHTTPAdapter(
+        retry_policy or DEFAULT_RETRY_POLICY, max_retries=max_retries,
+        **kwargs)
     session.mount('http://', adapter)
     if https:
         session.mount('https://', adapter)
@@ -188,13 +281,16 @@ def handle_request_exceptions(exc_type):
         exc_type (apyfal.exceptions.AcceleratorException subclass):
             Exception type to raise.
     """
+    # Lazy import since "requests" is slow to import and not always used
+    from requests import RequestException
+
     try:
         yield
-    except requests.RequestException as exception:
+    except RequestException as exception:
         raise exc_type(exc=exception)
 
 
-def check_url(url, timeout=0.0, max_retries=0, sleep=0.5):
+def check_url(url, timeout=0.0, max_retries=0, sleep=0.5, retry_policy=None):
     """
     Checking if an HTTP is up and running.
 
@@ -206,17 +302,22 @@ def check_url(url, timeout=0.0, max_retries=0, sleep=0.5):
         timeout (float): Timeout value in seconds.
         max_retries (int): Number of tries per connexion attempt.
         sleep (float): Period between connexion attempt in seconds.
+        retry_policy (apyfal._utilities.retry.RetryPolicy): Policy providing
+            connexion attempts timeouts and retries backoff.
 
     Returns:
         bool: True if success, False elsewhere
     """
-    session = http_session(max_retries=max_retries, https=False)
+    from requests import RequestException
+
+    session = http_session(
+        max_retries=max_retries, https=False, retry_policy=retry_policy)
     with Timeout(timeout, sleep=sleep) as timeout:
         while True:
             try:
                 if session.get(url).status_code == 200:
                     return True
-            except requests.RequestException:
+            except RequestException:
                 pass
             if timeout.reached():
                 return False
@@ -0,0 +1,256 @@
+# coding=utf-8
+"""Streaming compression of data transferred between client and host"""
+
+from io import RawIOBase as _RawIOBase
+import zlib as _zlib
+
+try:
+    from time import process_time as _process_time
+except ImportError:
+    # Python 2: "time.clock" is process time on Unix
+    from time import clock as _process_time
+
+try:
+    import zstandard as _zstd
+except ImportError:
+    _zstd = None
+
+from apyfal.exceptions import (
+    ClientConfigurationException as _ClientConfigurationException,
+    ClientRuntimeException as _ClientRuntimeException)
+
+#: Supported encodings
+ENCODINGS = ('gzip', 'zstd')
+
+#: Default size in bytes of chunks read from compressed stream source
+CHUNK_SIZE = 1024 ** 2
+
+# "zlib" window bits: gzip header, and gzip or zlib header auto detection
+_GZIP_WBITS = 16 + _zlib.MAX_WBITS
+_AUTO_WBITS = 32 + _zlib.MAX_WBITS
+
+
+def _check_zstd():
+    """
+    Checks "zstandard" package is available.
+
+    Raises:
+        apyfal.exceptions.ClientConfigurationException:
+            "zstandard" package not installed.
+    """
+    if _zstd is None:
+        raise _ClientConfigurationException(
+            '"zstandard" package is required for "zstd" compression')
+
+
+def compressor(encoding, level=None):
+    """
+    Returns a compression object.
+
+    Args:
+        encoding (str): Encoding in "ENCODINGS".
+        level (int): Compression level. Default to library default.
+
+    Returns:
+        object: Compression object with "compress" and "flush" methods.
+    """
+    if encoding == 'gzip':
+        return _zlib.compressobj(
+            _zlib.Z_DEFAULT_COMPRESSION if level is None else level,
+            _zlib.DEFLATED, _GZIP_WBITS)
+
+    elif encoding == 'zstd':
+        _check_zstd()
+        return _zstd.ZstdCompressor(
+            level=3 if level is None else level).compressobj()
+
+    raise _ClientConfigurationException(
+        gen_msg=('no_find_named', 'compression encoding', encoding))
+
+
+def decompressor(encoding):
+    """
+    Returns a decompression object.
+
+    Args:
+        encoding (str): HTTP "Content-Encoding" value.
+
+    Returns:
+        object: Decompression object with "decompress" and "flush" methods.
+    """
+    if encoding in ('gzip', 'x-gzip', 'deflate'):
+        return _zlib.decompressobj(_AUTO_WBITS)
+
+    elif encoding == 'zstd':
+        _check_zstd()
+        return _zstd.ZstdDecompressor().decompressobj()
+
+    raise _ClientRuntimeException(
+        'Unsupported content encoding: %s' % encoding)
+
+
+class _CompressionStream(_RawIOBase):
+    """Base compression stream wrapper with transfer statistics.
+
+    Args:
+        stream (file-like object): Binary stream.
+        encoding (str): Encoding.
+    """
+
+    def __init__(self, stream, encoding):
+        _RawIOBase.__init__(self)
+        self._stream = stream
+        self._encoding = encoding
+        self._size = 0
+        self._compressed_size = 0
+        self._cpu_time = 0.0
+
+    @property
+    def stats(self):
+        """
+        Transfer statistics.
+
+        Returns:
+            dict: "encoding", "size" (uncompressed size in bytes),
+                "compressed_size" (In bytes), "cpu_time" (Process time spent
+                in compression or decompression, in seconds).
+        """
+        return {'encoding': self._encoding, 'size': self._size,
+                'compressed_size': self._compressed_size,
+                'cpu_time': self._cpu_time}
+
+
+class CompressReader(_CompressionStream):
+    """Readable stream returning compressed content of another stream.
+
+    Args:
+        stream (file-like object): Binary stream to compress.
+        encoding (str): Encoding in "ENCODINGS".
+        level (int): Compression level.
+        chunk_size (int): Size in bytes of chunks read from stream.
+    """
+
+    def __init__(self, stream, encoding, level=None, chunk_size=CHUNK_SIZE):
+        _CompressionStream.__init__(self, stream, encoding)
+        self._compressor = compressor(encoding, level)
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._eof = False
+
+    def readable(self):
+        """
+        Returns True if the stream can be read from.
+
+        Returns:
+            bool: readable.
+        """
+        return True
+
+    def read(self, size=-1):
+        """
+        Read and return up to size bytes of compressed data.
+
+        Args:
+            size (int): Number of bytes to read. -1 to read until end of
+                stream.
+
+        Returns:
+            bytes: Compressed data.
+        """
+        # Compresses source chunks until enough data is available
+        while (size is None or size < 0 or
+               len(self._buffer) < size) and not self._eof:
+            data = self._stream.read(self._chunk_size)
+            start = _process_time()
+            if data:
+                compressed = self._compressor.compress(data)
+                self._size += len(data)
+            else:
+                compressed = self._compressor.flush()
+                self._eof = True
+            self._cpu_time += _process_time() - start
+            self._compressed_size += len(compressed)
+            self._buffer += compressed
+
+        # Returns compressed data
+        if size is None or size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def readinto(self, b):
+        """
+        Read compressed bytes into a pre-allocated, writable bytes-like
+        object b.
+
+        Args:
+            b (bytes-like object): buffer.
+
+        Returns:
+            int: number of bytes read
+        """
+        data = self.read(len(b))
+        size = len(data)
+        b[:size] = data
+        return size
+
+
+class DecompressWriter(_CompressionStream):
+    """Writable stream decompressing written data to another stream.
+
+    The underlying stream is not closed on close.
+
+    Args:
+        stream (file-like object): Binary stream receiving decompressed data.
+        encoding (str): HTTP "Content-Encoding" value.
+    """
+
+    def __init__(self, stream, encoding):
+        _CompressionStream.__init__(self, stream, encoding)
+        self._decompressor = decompressor(encoding)
+
+    def writable(self):
+        """
+        Return True if the stream supports writing.
+
+        Returns:
+            bool: Writable
+        """
+        return True
+
+    def write(self, b):
+        """
+        Write the given compressed bytes-like object, b.
+
+        Args:
+            b (bytes-like object): Compressed bytes to write.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        start = _process_time()
+        data = self._decompressor.decompress(b)
+        self._cpu_time += _process_time() - start
+        self._compressed_size += len(b)
+        self._write(data)
+        return len(b)
+
+    def _write(self, data):
+        """
+        Write decompressed data to stream.
+
+        Args:
+            data (bytes): Decompressed data.
+        """
+        if data:
+            self._size += len(data)
+            self._stream.write(data)
+
+    def close(self):
+        """
+        Flush remaining decompressed data and close the stream.
+        """
+        if not self.closed:
+            self._write(self._decompressor.flush())
+        _CompressionStream.close(self)
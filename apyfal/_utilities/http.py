@@ -0,0 +1,103 @@
+# coding=utf-8
+"""HTTP utilities based on "requests"
+
+This module is imported only when "requests" is used."""
+
+from requests.adapters import HTTPAdapter as _HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry as _Retry
+
+
+class PolicyRetry(_Retry):
+    """"urllib3" retry configuration applying a RetryPolicy backoff delay
+    and retry budget.
+
+    Args:
+        policy (RetryPolicy): Policy.
+        args, kwargs: "urllib3.util.retry.Retry" arguments.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._policy = kwargs.pop('policy', None)
+        _Retry.__init__(self, *args, **kwargs)
+
+    def new(self, **kwargs):
+        """
+        Returns a copy with updated values, keeping policy.
+
+        Args:
+            kwargs: "urllib3.util.retry.Retry" arguments.
+
+        Returns:
+            PolicyRetry: Retry configuration.
+        """
+        retry = _Retry.new(self, **kwargs)
+        retry._policy = self._policy
+        return retry
+
+    def increment(self, *args, **kwargs):
+        """
+        Increment retry counters, and raise if no retry left or if retry
+        budget is exhausted.
+
+        A retry token is only consumed if "urllib3" retries the call.
+
+        Args:
+            args, kwargs: "urllib3.util.retry.Retry.increment" arguments.
+
+        Returns:
+            PolicyRetry: Retry configuration.
+        """
+        # Raises if "urllib3" does not retry
+        retry = _Retry.increment(self, *args, **kwargs)
+
+        if self._policy is not None and not self._policy.allow_retry(
+                len(self.history)):
+            # No retry left: Let "urllib3" raise its error
+            return _Retry.increment(self.new(total=0), *args, **kwargs)
+        return retry
+
+    def get_backoff_time(self):
+        """
+        Backoff delay before retry.
+
+        Returns:
+            float: Delay in seconds.
+        """
+        if self._policy is None or not self.history:
+            return _Retry.get_backoff_time(self)
+        return self._policy.delay(len(self.history) - 1)
+
+
+class TimeoutHTTPAdapter(_HTTPAdapter):
+    """"requests" HTTP adapter applying a RetryPolicy.
+
+    Timeouts apply to requests without timeout.
+
+    Args:
+        policy (RetryPolicy): Policy.
+        max_retries (int): If specified, overrides policy maximum number of
+            retries.
+        kwargs: "requests.adapters.HTTPAdapter" arguments.
+    """
+
+    def __init__(self, policy, max_retries=None, **kwargs):
+        self._timeout = policy.timeout
+        self._policy = policy
+        _HTTPAdapter.__init__(
+            self, max_retries=policy.urllib3_retry(max_retries), **kwargs)
+
+    def send(self, request, **kwargs):
+        """
+        Sends request.
+
+        Args:
+            request (requests.PreparedRequest): Request.
+            kwargs: "requests.adapters.HTTPAdapter.send" arguments.
+
+        Returns:
+            requests.Response: Response.
+        """
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self._timeout
+        self._policy.record_call()
+        return _HTTPAdapter.send(self, request, **kwargs)
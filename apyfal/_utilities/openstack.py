@@ -49,7 +49,8 @@ class ExceptionHandler:
                 raise (to_raise or cls.RUNTIME)(exc=exception, **exc_kwargs)
 
 
-def connect(region, auth_url, client_id, secret_id, project_id, interface):
+def connect(region, auth_url, client_id, secret_id, project_id, interface,
+            retry_policy=None, pool_size=None):
     """
     Connect to OpenStack.
 
@@ -60,13 +61,32 @@ def connect(region, auth_url, client_id, secret_id, project_id, interface):
         secret_id (str): OpenStack secret ID.
         project_id (str): OpenStack project ID.
         interface (str): OpenStack interface.
+        retry_policy (apyfal._utilities.retry.RetryPolicy): Retry and
+            timeout policy.
+        pool_size (int): Maximum number of connections kept by host.
+            Should be the number of threads using the connection.
+            Default to "requests" default value.
 
     Returns:
         Connection: OpenStack connection.
     """
-    return Connection(
+    kwargs = dict()
+    if retry_policy is not None:
+        kwargs.update(api_timeout=retry_policy.read_timeout,
+                      connect_retries=retry_policy.max_retries)
+    connection = Connection(
         region_name=region,
         auth=dict(
             auth_url=auth_url, username=client_id,
             password=secret_id, project_id=project_id),
-        compute_api_version='2', identity_interface=interface)
+        compute_api_version='2', identity_interface=interface, **kwargs)
+
+    # Sizes the connection pool of the underlying "requests" session, keeping
+    # the TCP keep-alive adapter used by default by keystoneauth
+    if pool_size:
+        from keystoneauth1.session import TCPKeepAliveAdapter
+        adapter = TCPKeepAliveAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size)
+        for scheme in ('https://', 'http://'):
+            connection.session.session.mount(scheme, adapter)
+    return connection
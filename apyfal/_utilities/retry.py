@@ -0,0 +1,252 @@
+# coding=utf-8
+"""Retry and timeout policy of network calls"""
+
+from random import uniform as _uniform
+from threading import Lock as _Lock
+from time import sleep as _sleep
+
+
+class RetryPolicy(object):
+    """Retry and timeout policy of network calls.
+
+    Failed calls are retried after an exponential backoff delay with full
+    jitter: the delay before retry "n" is a random value between 0 and
+    "backoff * 2 ** n", capped to "max_backoff".
+
+    Retries are limited by a retry budget shared by all calls using the
+    policy: each call adds "retry_budget" retry token, each retry consumes
+    one token. This avoids retry storms when a service is overloaded.
+
+    Non idempotent calls should only be retried on connection errors, when
+    the request was not sent.
+
+    Args:
+        max_retries (int): Maximum number of retries of a call.
+        backoff (float): Base backoff delay in seconds.
+        max_backoff (float): Maximum backoff delay in seconds.
+        connect_timeout (float): Connection timeout in seconds.
+        read_timeout (float): Timeout in seconds waiting for server response
+            data.
+        retry_budget (float): Retry tokens added by each call (0 to 1).
+            This is the maximum ratio of retries over calls once the
+            "MAX_TOKENS" initial tokens are consumed.
+    """
+    #: Default maximum number of retries of a call
+    MAX_RETRIES = 3
+
+    #: Default base backoff delay in seconds
+    BACKOFF = 0.5
+
+    #: Default maximum backoff delay in seconds
+    MAX_BACKOFF = 10.0
+
+    #: Default connection timeout in seconds
+    CONNECT_TIMEOUT = 30.0
+
+    #: Default timeout in seconds waiting for server response data
+    READ_TIMEOUT = 1200.0
+
+    #: Default retry tokens added by each call
+    RETRY_BUDGET = 0.2
+
+    #: Maximum and initial number of retry tokens
+    MAX_TOKENS = 10.0
+
+    #: Configuration section keys and related arguments
+    CONFIG_KEYS = (
+        ('retry_max', 'max_retries'), ('retry_backoff', 'backoff'),
+        ('retry_max_backoff', 'max_backoff'), ('retry_budget', 'retry_budget'),
+        ('connect_timeout', 'connect_timeout'),
+        ('read_timeout', 'read_timeout'))
+
+    def __init__(self, max_retries=None, backoff=None, max_backoff=None,
+                 connect_timeout=None, read_timeout=None, retry_budget=None):
+        self._max_retries = int(
+            self.MAX_RETRIES if max_retries is None else max_retries)
+        self._backoff = float(self.BACKOFF if backoff is None else backoff)
+        self._max_backoff = float(
+            self.MAX_BACKOFF if max_backoff is None else max_backoff)
+        self._connect_timeout = float(
+            connect_timeout or self.CONNECT_TIMEOUT)
+        self._read_timeout = float(read_timeout or self.READ_TIMEOUT)
+        self._retry_budget = float(
+            self.RETRY_BUDGET if retry_budget is None else retry_budget)
+        self._tokens = self.MAX_TOKENS
+        self._tokens_lock = _Lock()
+
+    @classmethod
+    def from_section(cls, section):
+        """
+        Instantiate policy from a configuration section.
+
+        Args:
+            section (apyfal.configuration._Section): Configuration section.
+
+        Returns:
+            RetryPolicy: Policy.
+        """
+        return cls(**{argument: section.get_literal(key)
+                      for key, argument in cls.CONFIG_KEYS})
+
+    @property
+    def max_retries(self):
+        """
+        Maximum number of retries of a call.
+
+        Returns:
+            int: Retries.
+        """
+        return self._max_retries
+
+    @property
+    def connect_timeout(self):
+        """
+        Connection timeout.
+
+        Returns:
+            float: Timeout in seconds.
+        """
+        return self._connect_timeout
+
+    @property
+    def read_timeout(self):
+        """
+        Timeout waiting for server response data.
+
+        Returns:
+            float: Timeout in seconds.
+        """
+        return self._read_timeout
+
+    @property
+    def timeout(self):
+        """
+        Connection and read timeouts, as expected by "requests".
+
+        Returns:
+            tuple of float: Connect timeout, read timeout.
+        """
+        return self._connect_timeout, self._read_timeout
+
+    def delay(self, retry):
+        """
+        Backoff delay before a retry.
+
+        Args:
+            retry (int): Retry number, starting from 0.
+
+        Returns:
+            float: Delay in seconds.
+        """
+        return _uniform(0, min(
+            self._max_backoff, self._backoff * 2 ** min(retry, 32)))
+
+    def record_call(self):
+        """
+        Record a call, adding tokens to retry budget.
+        """
+        with self._tokens_lock:
+            self._tokens = min(
+                self._tokens + self._retry_budget, self.MAX_TOKENS)
+
+    def allow_retry(self, retry):
+        """
+        Check if a failed call can be retried, and consume a retry token.
+
+        Args:
+            retry (int): Retry number, starting from 0.
+
+        Returns:
+            bool: True if call can be retried.
+        """
+        if retry >= self._max_retries:
+            return False
+        with self._tokens_lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+        return True
+
+    def next_retry(self, retry):
+        """
+        Check if a failed call can be retried, and waits backoff delay.
+
+        Args:
+            retry (int): Retry number, starting from 0.
+
+        Returns:
+            bool: True if call can be retried.
+        """
+        if not self.allow_retry(retry):
+            return False
+        _sleep(self.delay(retry))
+        return True
+
+    def call(self, func, retry_on, *args, **kwargs):
+        """
+        Call a function, and retries it on failure.
+
+        Args:
+            func (callable): Function to call. Must be idempotent, or
+                "retry_on" must contains only errors raised when the call had
+                no effect.
+            retry_on (tuple of Exception subclasses): Exceptions to retry on.
+            args: "func" positional arguments.
+            kwargs: "func" keyword arguments.
+
+        Returns:
+            object: "func" result.
+        """
+        self.record_call()
+        retry = 0
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except retry_on:
+                if not self.next_retry(retry):
+                    raise
+            retry += 1
+
+    def urllib3_retry(self, max_retries=None):
+        """
+        Retry configuration for "urllib3" and "requests".
+
+        "urllib3" only retries idempotent HTTP methods on read errors.
+
+        Args:
+            max_retries (int): If specified, overrides maximum number of
+                retries.
+
+        Returns:
+            urllib3.util.retry.Retry: Retry configuration.
+        """
+        # Lazy import since "requests" is not always used
+        from apyfal._utilities.http import PolicyRetry
+
+        retries = self._max_retries if max_retries is None else max_retries
+        return PolicyRetry(
+            total=retries, connect=retries, read=retries, status=0,
+            redirect=None, raise_on_status=False, policy=self)
+
+    def urllib3_timeout(self):
+        """
+        Timeout configuration for "urllib3".
+
+        Returns:
+            urllib3.util.timeout.Timeout: Timeout configuration.
+        """
+        # Lazy import since "requests" is not always used
+        from requests.packages.urllib3.util.timeout import Timeout
+
+        return Timeout(connect=self._connect_timeout, read=self._read_timeout)
+
+    def botocore_kwargs(self):
+        """
+        Retries and timeouts arguments of "botocore.config.Config".
+
+        Returns:
+            dict: Arguments.
+        """
+        return dict(connect_timeout=self._connect_timeout,
+                    read_timeout=self._read_timeout,
+                    retries={'max_attempts': self._max_retries})
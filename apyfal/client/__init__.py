@@ -2,8 +2,9 @@
 from abc import abstractmethod as _abstractmethod
 from contextlib import contextmanager as _contextmanager
 from copy import deepcopy as _deepcopy
+from hashlib import sha256 as _sha256
 import json as _json
-from os import remove as _remove
+from os import remove as _remove, getpid as _getpid
 import os.path as _os_path
 from shutil import rmtree as _rmtree
 from tempfile import mkdtemp as _mkdtemp
@@ -13,9 +14,13 @@ import apyfal._utilities as _utl
 import apyfal.exceptions as _exc
 import apyfal.configuration as _cfg
 import apyfal.storage as _srg
+from apyfal.client._cache import (
+    ResultCache as _ResultCache, file_id as _file_id)
+from apyfal.storage._checksum import new as _new_checksum
+from apyfal.storage._transfer import link_or_copy as _link_or_copy
 
 
-class AcceleratorClient(_utl.ABC):
+class AcceleratorClient(_utl.FactoryABC):
     """
     REST accelerator client.
 
@@ -74,15 +79,21 @@ class AcceleratorClient(_utl.ABC):
         return _utl.factory(
             cls, client_type, 'client_type', _exc.ClientConfigurationException)
 
+    # Process that created the client
+    _pid = None
+
     def __init__(self, accelerator=None, client_type=None, accelize_client_id=None,
-                 accelize_secret_id=None, config=None, **_):
+                 accelize_secret_id=None, config=None, session_uuid=None,
+                 **_):
+        self._pid = _getpid()
         self._name = accelerator
         self._client_type = client_type
         self._url = None
         self._stopped = False
+        self._cancelled = False
 
         # Define a session UUID
-        self._session_uuid = str(_uuid())
+        self._session_uuid = session_uuid or str(_uuid())
 
         # Dict to cache values
         self._cache = {}
@@ -112,6 +123,18 @@ class AcceleratorClient(_utl.ABC):
         self._process_parameters = self._load_configuration(
             self.DEFAULT_PROCESS_PARAMETERS, 'process')
 
+        #: Checksum algorithm of data transferred by client
+        self._checksum = config['storage']['checksum']
+
+        #: Process results cache
+        result_cache = config['storage']['result_cache']
+        self._result_cache = (_ResultCache(
+            result_cache, config.compiled['storage'].get_literal(
+                'result_cache_hash')) if result_cache else None)
+
+        # Configuration identifier of cached process results
+        self._result_configuration = None
+
     def __enter__(self):
         return self
 
@@ -119,7 +142,13 @@ class AcceleratorClient(_utl.ABC):
         self.stop()
 
     def __del__(self):
-        self.stop()
+        # Copies of client in forked processes do not stop accelerator
+        if self._pid == _getpid():
+            self.stop()
+
+    def __reduce__(self):
+        # Pickled as handle, unpickled as attached client
+        return _attach_client, (self.handle,)
 
     @property
     def name(self):
@@ -131,14 +160,32 @@ class AcceleratorClient(_utl.ABC):
         """
         return self._name
 
+    @property
+    def handle(self):
+        """
+        Serializable handle that other processes can use to attach to this
+        accelerator.
+
+        Returns:
+            AcceleratorHandle: Handle.
+
+        Raises:
+            apyfal.exceptions.ClientRuntimeException: Accelerator can't be
+                shared with other processes.
+        """
+        raise _exc.ClientRuntimeException(
+            'Only configured remote accelerators can be shared')
+
     def start(self, datafile=None, info_dict=False, host_env=None, **parameters):
         """
         Configures accelerator.
 
         Args:
-            datafile (str or file-like object): Depending on the accelerator,
-                a configuration data file need to be loaded before a process can be run.
-                Can be apyfal.storage URL, paths, file-like object.
+            datafile (str or file-like object or bytes-like object):
+                Depending on the accelerator, a configuration data file need
+                to be loaded before a process can be run. Can be
+                apyfal.storage URL, paths, file-like object, object supporting
+                the buffer protocol.
             info_dict (bool): If True, returns a dict containing information on
                 configuration operation.
             parameters (str or dict): Accelerator configuration specific parameters
@@ -152,20 +199,35 @@ class AcceleratorClient(_utl.ABC):
             dict: Optional, only if "info_dict" is True. AcceleratorClient response.
                 AcceleratorClient contain output information from  configuration operation.
                 Take a look accelerator documentation for more information.
+                If "checksum" is set in the "storage" configuration section,
+                "app" section contains a "checksums" dict with checksums of
+                data transferred by client.
         """
         # Configure start
         parameters = self._get_parameters(parameters, self._configuration_parameters)
         parameters['env'].update(host_env or dict())
 
+        # Identifies configuration before data file is read
+        self._result_configuration = None
+        configuration = None
+        if self._result_cache is not None:
+            configuration = self._result_cache.configuration(
+                parameters, datafile if datafile is not None else
+                parameters['app'].get('specific', dict()).get('datafile'))
+
         # Handle files
-        with self._data_file(
-                datafile, parameters, 'datafile', mode='rb') as datafile:
+        checksums = dict()
+        with self._data_file(datafile, parameters, 'datafile', mode='rb',
+                             checksums=checksums) as datafile:
 
             # Starts
             response = self._start(datafile, parameters)
 
         # Check response status
         self._raise_for_status(response, "Failed to configure accelerator: ")
+        self._result_configuration = configuration
+        if checksums:
+            response['app']['checksums'] = checksums
 
         # Returns optional response
         if info_dict:
@@ -189,10 +251,15 @@ class AcceleratorClient(_utl.ABC):
         Processes with accelerator.
 
         Args:
-            file_in (str or file-like object): Input file to process.
-                Can be apyfal.storage URL, paths, file-like object.
-            file_out (str or file-like object): Output processed file.
-                Can be apyfal.storage URL, paths, file-like object.
+            file_in (str or file-like object or bytes-like object): Input
+                file to process. Can be apyfal.storage URL, paths, file-like
+                object, object supporting the buffer protocol (bytes,
+                memoryview, NumPy array, ...).
+            file_out (str or file-like object or bytes-like object): Output
+                processed file. Can be apyfal.storage URL, paths, file-like
+                object, writable object supporting the buffer protocol. A
+                bytearray is resized to output size, other buffers must be
+                large enough to contain output.
             info_dict (bool): If True, returns a dict containing information on
                 process operation.
             parameters (str or dict): Accelerator process specific parameters
@@ -207,22 +274,160 @@ class AcceleratorClient(_utl.ABC):
             dict: Optional, only if "info_dict" is True. AcceleratorClient response.
                 AcceleratorClient contain output information from  process operation.
                 Take a look accelerator documentation for more information.
+                If "checksum" is set in the "storage" configuration section,
+                "app" section contains a "checksums" dict with checksums of
+                data transferred by client.
+                If "result_cache" is set in the "storage" configuration
+                section, "app" section contains "cached" set to True if result
+                was returned from cache. Results are cached only once
+                accelerator was configured with "start".
         """
+        # Process admitted: Clears cancellation of previous process
+        self._cancelled = False
+
         # Configures processing
         parameters = self._get_parameters(parameters, self._process_parameters)
 
+        # Returns cached result if any. Results are only cached if
+        # accelerator configuration is known
+        cache_key = None
+        if (self._result_cache is not None and file_in is not None and
+                self._result_configuration is not None):
+            cache_key = self._result_cache.key(
+                self._name, parameters, file_in, self._result_configuration)
+
+        if cache_key is not None:
+            response = self._result_cache.get(cache_key, file_out)
+            if response is not None:
+                response['app']['cached'] = True
+                return self._process_result(response, info_dict)
+
+            # Processes to temporary file to cache output
+            output = (None if file_out is None else
+                      _os_path.join(self._tmp_dir, str(_uuid())))
+            try:
+                response = self._process_files(file_in, output, parameters)
+                try:
+                    self._result_cache.put(cache_key, response, output)
+                except (IOError, OSError, _exc.StorageException) as exception:
+                    _utl.get_logger().warning(
+                        'Unable to cache process result: %s', exception)
+                if output is not None:
+                    _srg.copy(output, file_out)
+            finally:
+                if output is not None and _os_path.isfile(output):
+                    _remove(output)
+
+        else:
+            response = self._process_files(file_in, file_out, parameters)
+
+        return self._process_result(response, info_dict)
+
+    def cancel(self):
+        """
+        Cancels the running process operation, if supported by client.
+
+        Cancelled process operation raises
+        "apyfal.exceptions.ClientRuntimeException".
+        """
+        self._cancelled = True
+
+    def _check_cancelled(self):
+        """
+        Raises if the running process operation was cancelled.
+
+        Raises:
+            apyfal.exceptions.ClientRuntimeException: Process cancelled.
+        """
+        if self._cancelled:
+            raise _exc.ClientRuntimeException('Process cancelled')
+
+    def _process_files(self, file_in, file_out, parameters):
+        """
+        Processes with accelerator and check response status.
+
+        Args:
+            file_in (str or file-like object or bytes-like object): Input
+                file to process.
+            file_out (str or file-like object or bytes-like object): Output
+                processed file.
+            parameters (dict): Parameters dict.
+
+        Returns:
+            dict: AcceleratorClient response.
+        """
         # Handle files
-        with self._data_file(
-                file_in, parameters, 'file_in', mode='rb') as file_in:
-            with self._data_file(
-                    file_out, parameters, 'file_out', mode='wb') as file_out:
+        checksums = dict()
+        try:
+            with self._data_file(file_in, parameters, 'file_in', mode='rb',
+                                 checksums=checksums) as file_in:
+                with self._data_file(
+                        file_out, parameters, 'file_out', mode='wb',
+                        checksums=checksums) as file_out:
 
-                # Processes
-                response = self._process(file_in, file_out, parameters)
+                    # Processes, if not cancelled while getting files
+                    self._check_cancelled()
+                    response = self._process(file_in, file_out, parameters)
+
+        # Cancellation only applies to this process
+        finally:
+            self._cancelled = False
 
         # Check response status
         self._raise_for_status(response, "Processing failed: ")
+        if checksums:
+            response['app']['checksums'] = checksums
+        return response
+
+    @staticmethod
+    def _configuration_fingerprint(datafile, parameters, datafile_digest=None):
+        """
+        Fingerprint of a configuration. Accelerators already configured
+        with the same fingerprint don't need to be configured again.
+
+        Args:
+            datafile (str or file-like object or None): Local data file.
+            parameters (dict): Parameters dict.
+            datafile_digest (str): Data file digest, if already computed
+                with "apyfal.client._datafile.digest".
 
+        Returns:
+            str or None: Fingerprint, None if the configuration can't be
+                fingerprinted.
+        """
+        # Data file stream can't be read twice
+        if hasattr(datafile, 'read'):
+            return None
+
+        # Data file URL forwarded to host is identified by storage metadata
+        if not datafile:
+            datafile = parameters.get('app', dict()).get(
+                'specific', dict()).get('datafile')
+
+        fingerprint = _sha256(_json.dumps(
+            parameters, sort_keys=True).encode())
+        if datafile:
+            datafile_id = (['sha256', datafile_digest] if datafile_digest
+                           else _file_id(datafile))
+            if datafile_id is None:
+                return None
+            fingerprint.update(b'\0')
+            fingerprint.update(_json.dumps(datafile_id).encode())
+        return fingerprint.hexdigest()
+
+    @staticmethod
+    def _process_result(response, info_dict):
+        """
+        Returns process result.
+
+        Args:
+            response (dict): AcceleratorClient response.
+            info_dict (bool): If True, returns response with result.
+
+        Returns:
+            dict: Result from process operation.
+            dict: Optional, only if "info_dict" is True. AcceleratorClient response.
+        """
         # Get result from response
         try:
             result = response['app'].pop('specific')
@@ -273,6 +478,7 @@ class AcceleratorClient(_utl.ABC):
 
         # Clears cache
         self._cache.clear()
+        self._result_configuration = None
 
         # Returns optional response
         if info_dict:
@@ -373,23 +579,29 @@ class AcceleratorClient(_utl.ABC):
         # Load default parameters
         parameters = _deepcopy(default_parameters)
 
-        # Update with configuration
+        # Update with configuration, values copied since compiled values
+        # are shared
+        compiled = self._config.compiled
         for section in (
                 section, '%s.%s' % (section, self._name)):
-            self._get_parameters(
-                {key: self._config[section].get_literal(key)
-                 for key in self._config[section]}, parameters, copy=False)
+            self._get_parameters(_deepcopy(
+                {key: compiled[section][key]
+                 for key in self._config[section]}), parameters, copy=False)
         return parameters
 
     @_contextmanager
-    def _data_file(self, url, parameters, parameter_name, mode):
+    def _data_file(self, url, parameters, parameter_name, mode,
+                   checksums=None):
         """Get files with apyfal.storage.
 
         Args:
-            url (str or file-like object): Input URL.
+            url (str or file-like object or bytes-like object): Input URL.
             parameters (dict): Parameters dict.
             parameter_name (str): Parameter name for input URL.
             mode (str): Access mode. 'r' or 'w'.
+            checksums (dict): If specified and checksum enabled, checksum of
+                data transferred by client is added to it with
+                "parameter_name" as key.
 
         Returns:
             str or file-like object or None:
@@ -431,12 +643,17 @@ class AcceleratorClient(_utl.ABC):
         # Client side:
         # Sends URL to host side as parameters and
         # yields None to client
-        if self.REMOTE and scheme not in ('stream', 'file'):
-            parameters['app']['specific'][parameter_name] = url
+        if self.REMOTE and scheme not in ('stream', 'buffer', 'file', 'memory'):
+            parameters['app']['specific'][parameter_name] = self._forward_url(
+                url, mode)
             yield None
 
         # Other case, yields file in expected format (file or stream)
         else:
+            # Computes checksum of transferred data
+            checksum = (_new_checksum(self._checksum) if
+                        self._checksum and checksums is not None else False)
+
             # As file
             if self.PARAMETER_IO_FORMAT.get(
                     parameter_name, 'file') == 'file':
@@ -444,24 +661,44 @@ class AcceleratorClient(_utl.ABC):
                 # Already a file
                 if scheme == 'file':
                     yield path
+                    return
 
                 # Use temporary file
                 else:
-                    with self.as_tmp_file(url, mode) as file:
+                    with self.as_tmp_file(url, mode, checksum) as file:
                         yield file
             # As stream
             else:
-                with _srg.open(url, mode) as stream:
+                with _srg.open(url, mode, checksum=checksum) as stream:
                     yield stream
 
+            if checksum:
+                checksums[parameter_name] = checksum.hexdigest()
+
+    def _forward_url(self, url, mode):
+        """
+        Returns URL to forward to host.
+
+        Args:
+            url (str): apyfal.storage URL.
+            mode (str): Access mode. 'r' or 'w'.
+
+        Returns:
+            str: URL.
+        """
+        return url
+
     @_contextmanager
-    def as_tmp_file(self, url, mode):
+    def as_tmp_file(self, url, mode, checksum=None):
         """
         Return temporary representation of a file.
 
         Args:
             url (str): apyfal.storage URL of the file.
             mode (str): Access mode. 'r' or 'w'.
+            checksum (str or object or bool): Computes checksum of
+                transferred data on the fly.
+                See "apyfal.storage.copy" for more information.
 
         Returns:
             str or file-like object: temporary object.
@@ -472,14 +709,24 @@ class AcceleratorClient(_utl.ABC):
 
         # Gets input file
         if 'r' in mode:
-            _srg.copy(url, local_path)
+            scheme, path = _srg.parse_url(url)
+
+            # Links local file if on same file system and input is not
+            # modified. Files written back must be copied, since the write
+            # back truncates destination.
+            if 'w' in mode:
+                _srg.copy(url, local_path, checksum=checksum)
+            elif scheme == 'file' and not checksum:
+                _link_or_copy(path, local_path)
+            else:
+                _srg._copy_to_tmp(url, local_path, checksum=checksum)
 
         # Yields local temporary path
         yield local_path
 
         # Sends output file
         if 'w' in mode:
-            _srg.copy(local_path, url)
+            _srg.copy(local_path, url, checksum=checksum)
 
         # Clears temporary file
         _remove(local_path)
@@ -497,3 +744,137 @@ class AcceleratorClient(_utl.ABC):
         except KeyError:
             self._cache['tmp_dir'] = _mkdtemp(dir=_cfg.ACCELERATOR_TMP_ROOT)
             return self._cache['tmp_dir']
+
+
+class AcceleratorHandle(object):
+    """
+    Lightweight serializable handle of a configured remote accelerator.
+
+    The handle can be pickled and sent to other processes (Like
+    "multiprocessing" pool workers) that attach to the same accelerator
+    without starting or configuring it again.
+
+    Attached accelerators never stop the accelerator or its host, this
+    remains the responsibility of the process that started it.
+
+    Credentials are not pickled with the configuration: The unpickling
+    process reads them again from the configuration file.
+
+    Args:
+        accelerator (str): Name of the accelerator.
+        url (str): URL of the accelerator host.
+        configuration_url (str): URL of the accelerator configuration.
+        session_uuid (str): Session UUID.
+        config (apyfal.configuration.Configuration): Configuration.
+    """
+
+    #: Configuration parameters containing credentials
+    SECRET_KEYS = ('client_id', 'secret_id')
+
+    def __init__(self, accelerator, url, configuration_url, session_uuid,
+                 config):
+        self._name = accelerator
+        self._url = url
+        self._configuration_url = configuration_url
+        self._session_uuid = session_uuid
+        self._config = config
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+
+        # Pickles configuration without credentials, and its file to read
+        # them again
+        sections = self._config.__getstate__()
+        for parameters in sections.values():
+            for key in self.SECRET_KEYS:
+                parameters.pop(key, None)
+        state['_config'] = sections
+        state['_config_file'] = self._config._file
+        return state
+
+    def __setstate__(self, state):
+        sections = state.pop('_config')
+        config_file = state.pop('_config_file')
+        self.__dict__.update(state)
+
+        self._config = config = _cfg.Configuration.__new__(_cfg.Configuration)
+        config.__setstate__(sections)
+
+        # Reads credentials again from configuration file
+        for section_name, section in _cfg.Configuration(
+                config_file).items():
+            for key in self.SECRET_KEYS:
+                value = dict(section).get(key)
+                if value:
+                    config[section_name][key] = value
+        config._file = config_file
+
+    @property
+    def name(self):
+        """
+        Accelerator name
+
+        Returns:
+            str: name
+        """
+        return self._name
+
+    @property
+    def url(self):
+        """
+        URL of the accelerator host.
+
+        Returns:
+            str: URL
+        """
+        return self._url
+
+    @property
+    def configuration_url(self):
+        """
+        URL of the accelerator configuration.
+
+        Returns:
+            str: URL
+        """
+        return self._configuration_url
+
+    def attach_client(self):
+        """
+        Attach an accelerator client to the accelerator.
+
+        Returns:
+            AcceleratorClient: Accelerator client.
+        """
+        client = AcceleratorClient(
+            accelerator=self._name, client_type='REST', host_ip=self._url,
+            configuration_url=self._configuration_url, config=self._config,
+            session_uuid=self._session_uuid)
+
+        # Never stops shared accelerator
+        client._stopped = True
+        return client
+
+    def attach(self):
+        """
+        Attach an "apyfal.Accelerator" to the accelerator.
+
+        Returns:
+            apyfal.Accelerator: Accelerator without host.
+        """
+        # Lazy import to avoid circular import
+        from apyfal import Accelerator
+        return Accelerator(accelerator=self)
+
+
+def _attach_client(handle):
+    """
+    Attach an accelerator client from handle. Used to unpickle clients.
+
+    Args:
+        handle (AcceleratorHandle): Handle.
+
+    Returns:
+        AcceleratorClient: Accelerator client.
+    """
+    return handle.attach_client()
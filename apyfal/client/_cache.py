@@ -0,0 +1,262 @@
+# coding=utf-8
+"""Cache of process results"""
+
+from hashlib import sha256 as _sha256
+import json as _json
+from os import fstat as _os_fstat, stat as _os_stat
+import os.path as _os_path
+
+import apyfal._utilities as _utl
+import apyfal.exceptions as _exc
+import apyfal.storage as _srg
+from apyfal.storage._transfer import byte_view as _byte_view
+
+# Size in bytes of chunks read to hash inputs
+_CHUNK_SIZE = 1024 ** 2
+
+
+def file_id(file_in, hash_content=False):
+    """
+    Get file identifier, from its storage metadata or its content.
+
+    Local files are identified by their path, size and modification time,
+    and not seekable streams by their content only if in memory. Content is
+    read and hashed only if "hash_content" is True.
+
+    Args:
+        file_in (str or file-like object or bytes-like object): File.
+        hash_content (bool): If True, identifies local files and streams by
+            their content.
+
+    Returns:
+        list or None: Identifier. None if file can't be identified.
+    """
+    scheme, path = _srg.parse_url(file_in, host=False)
+
+    # Local content: Hashes content
+    if scheme == 'buffer':
+        return ['sha256', _sha256(_byte_view(path)).hexdigest()]
+
+    elif scheme == 'file':
+        if hash_content:
+            try:
+                with open(path, 'rb') as stream:
+                    return _hash_stream(stream)
+            except (IOError, OSError):
+                # Not existing file
+                return None
+
+        # Identifies file by its status
+        try:
+            return _stat_id(_os_stat(path), _os_path.realpath(path))
+        except OSError:
+            return None
+
+    elif scheme == 'stream':
+        try:
+            position = path.tell()
+        except (IOError, OSError, AttributeError, ValueError):
+            # Not seekable stream
+            return None
+
+        # Stream content already in memory
+        try:
+            return ['sha256', _sha256(
+                _byte_view(path.getvalue())[position:]).hexdigest()]
+        except AttributeError:
+            pass
+
+        if hash_content:
+            try:
+                return _hash_stream(path)
+            finally:
+                path.seek(position)
+
+        # Stream of a file: Identifies file by its status and stream position
+        try:
+            return _stat_id(_os_fstat(path.fileno()), position)
+        except (IOError, OSError, AttributeError, ValueError):
+            return None
+
+    # Storage content: Uses storage metadata
+    try:
+        metadata = _srg._STORAGE[scheme].get_metadata(path)
+    except (ValueError, _exc.StorageException):
+        metadata = None
+    if not metadata:
+        return None
+    return [file_in] + [metadata.get(key) for key in (
+        'md5', 'etag', 'last_modified', 'size')]
+
+
+def _hash_stream(stream):
+    """
+    Get identifier of a stream content, from current position.
+
+    Args:
+        stream (file-like object): Stream.
+
+    Returns:
+        list: Identifier.
+    """
+    checksum = _sha256()
+    for chunk in iter(lambda: stream.read(_CHUNK_SIZE), b''):
+        checksum.update(chunk)
+    return ['sha256', checksum.hexdigest()]
+
+
+def _stat_id(stat, location):
+    """
+    Get identifier of a local file from its status.
+
+    Args:
+        stat (os.stat_result): File status.
+        location (str or int): File real path or stream position.
+
+    Returns:
+        list: Identifier.
+    """
+    try:
+        mtime_ns = stat.st_mtime_ns
+    except AttributeError:
+        # Python 2
+        mtime_ns = int(stat.st_mtime * 1e9)
+    return ['file', stat.st_dev, stat.st_ino, location, stat.st_size,
+            mtime_ns]
+
+
+class ResultCache(object):
+    """Cache of process results.
+
+    Results are stored by a key computed from the accelerator name, its
+    configuration, the process parameters and the input file. Input files on
+    storage are identified by their URL and metadata (MD5 or ETag,
+    Last-Modified, size), local files by their path, size and modification
+    time, and in memory data by its content.
+
+    Each entry contains the process response and output file.
+
+    Args:
+        url (str): Cache directory or apyfal.storage URL.
+        hash_content (bool): If True, identifies local files and streams by
+            their content. This requires to read them entirely on each
+            process.
+    """
+
+    def __init__(self, url, hash_content=False):
+        self._url = url.rstrip('/')
+        self._hash_content = bool(hash_content)
+
+        # Creates local directory
+        scheme, path = _srg.parse_url(self._url)
+        self._local = scheme == 'file'
+        if self._local:
+            self._url = _os_path.abspath(_os_path.expanduser(path))
+            _utl.makedirs(self._url, exist_ok=True)
+
+    @property
+    def url(self):
+        """
+        Cache URL.
+
+        Returns:
+            str: URL.
+        """
+        return self._url
+
+    def configuration(self, parameters, datafile=None):
+        """
+        Get identifier of an accelerator configuration.
+
+        Args:
+            parameters (dict): Configuration parameters.
+            datafile (str or file-like object or bytes-like object):
+                Configuration data file.
+
+        Returns:
+            str or None: Identifier, None if configuration can't be
+                identified.
+        """
+        datafile_id = None
+        if datafile is not None:
+            datafile_id = file_id(datafile, self._hash_content)
+            if datafile_id is None:
+                return None
+        return _sha256(_json.dumps(
+            [parameters, datafile_id], sort_keys=True).encode()).hexdigest()
+
+    def key(self, accelerator, parameters, file_in, configuration=None):
+        """
+        Get cache key of a process.
+
+        Args:
+            accelerator (str): Accelerator name.
+            parameters (dict): Process parameters.
+            file_in (str or file-like object or bytes-like object): Input
+                file.
+            configuration (str): Accelerator configuration identifier, as
+                returned by "configuration".
+
+        Returns:
+            str or None: Key, None if process result can't be cached.
+        """
+        input_id = file_id(file_in, self._hash_content)
+        if input_id is None:
+            return None
+        return _sha256(_json.dumps(
+            [accelerator, configuration, parameters, input_id],
+            sort_keys=True).encode()).hexdigest()
+
+    def get(self, key, file_out=None):
+        """
+        Get cached result.
+
+        Args:
+            key (str): Cache key.
+            file_out (str or file-like object or bytes-like object): Output
+                file to write with cached output.
+
+        Returns:
+            dict or None: Cached process response, None if not cached.
+        """
+        response = bytearray()
+        try:
+            _srg.copy(self._entry_url(key, 'response.json'), response,
+                      checksum=False)
+            if file_out is not None:
+                _srg.copy(self._entry_url(key, 'output'), file_out)
+        except (IOError, OSError, _exc.StorageException):
+            return None
+        return _json.loads(bytes(response).decode())
+
+    def put(self, key, response, output=None):
+        """
+        Add result to cache.
+
+        Args:
+            key (str): Cache key.
+            response (dict): Process response.
+            output (str): Output file local path.
+        """
+        if self._local:
+            _utl.makedirs(self._entry_url(key), exist_ok=True)
+
+        # Output first: Entry is valid only once response is written
+        if output is not None:
+            _srg.copy(output, self._entry_url(key, 'output'))
+        _srg.copy(_json.dumps(response).encode(),
+                  self._entry_url(key, 'response.json'), checksum=False)
+
+    def _entry_url(self, key, name=None):
+        """
+        Get URL of a cache entry file.
+
+        Args:
+            key (str): Cache key.
+            name (str): File name. If None, returns entry directory.
+
+        Returns:
+            str: URL.
+        """
+        return '/'.join(
+            part for part in (self._url, key, name) if part is not None)
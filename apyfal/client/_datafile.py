@@ -0,0 +1,72 @@
+# coding=utf-8
+"""Content-addressed configuration data files.
+
+Hosts supporting it store configuration data files by content digest. The
+client first asks the host if it already stores the data file digest, and
+only uploads the data file content if missing. Configurations then refer to
+the data file by its digest.
+
+This module does not depend on the generated OpenAPI client."""
+
+from hashlib import sha256 as _sha256
+
+import apyfal._utilities as _utl
+import apyfal.exceptions as _exc
+import apyfal.storage as _srg
+
+#: Host REST API path of stored data files
+DATAFILE_PATH = '/v1.0/datafile/{digest}/'
+
+
+def digest(path):
+    """
+    Content digest of a data file.
+
+    Args:
+        path (str): Local data file path.
+
+    Returns:
+        str: SHA-256 hexadecimal digest.
+    """
+    checksum = _sha256()
+    buffer_size = _srg._get_buffer_size()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(buffer_size), b''):
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+
+def upload(url, path, file_digest, retry_policy=None):
+    """
+    Store a data file on host, only if not already stored.
+
+    Args:
+        url (str): Host URL.
+        path (str): Local data file path.
+        file_digest (str): Data file digest, as returned by "digest".
+        retry_policy (apyfal._utilities.retry.RetryPolicy): Retry and timeout
+            policy.
+
+    Returns:
+        bool: True if data file content was uploaded, False if host already
+            stored it.
+
+    Raises:
+        apyfal.exceptions.ClientRuntimeException: Host error.
+    """
+    datafile_url = url.rstrip('/') + DATAFILE_PATH.format(digest=file_digest)
+    session = _utl.http_session(https=False, retry_policy=retry_policy)
+
+    with _utl.handle_request_exceptions(_exc.ClientRuntimeException):
+        # Checks if host already stores data file
+        response = session.head(datafile_url)
+        if response.status_code != 404:
+            response.raise_for_status()
+            return False
+
+        # Uploads missing data file
+        with open(path, 'rb') as data:
+            response = session.put(datafile_url, data=data, headers={
+                'Content-Type': 'application/octet-stream'})
+        response.raise_for_status()
+    return True
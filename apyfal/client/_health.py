@@ -0,0 +1,223 @@
+# coding=utf-8
+"""Hosts health tracking and circuit breaker"""
+
+from collections import deque as _deque
+from threading import Lock as _Lock
+from time import time as _time
+
+import apyfal._utilities as _utl
+import apyfal.exceptions as _exc
+
+# Hosts health by URL, shared by all clients of this process
+_HEALTH = dict()
+_HEALTH_LOCK = _Lock()
+
+
+def get_health(url, **kwargs):
+    """
+    Get health of a host.
+
+    Args:
+        url (str): Host URL.
+        kwargs: "HostHealth" arguments, used only on first call for a host.
+
+    Returns:
+        HostHealth: Host health.
+    """
+    with _HEALTH_LOCK:
+        try:
+            return _HEALTH[url]
+        except KeyError:
+            health = _HEALTH[url] = HostHealth(url, **kwargs)
+            return health
+
+
+class HostHealth(object):
+    """Health of a host, based on recent calls outcomes.
+
+    Works as a circuit breaker:
+
+    - "closed": Calls are allowed.
+    - "open": Too many recent failures, calls fail fast. After
+      "reset_timeout", host is probed with a cheap request by a single
+      caller.
+    - "half_open": Probe succeeded, a single call is allowed on trial, other
+      calls fail fast. Circuit is closed on trial success, or opened again
+      on trial failure. If the trial call outcome is not recorded after
+      "reset_timeout", another call is allowed on trial.
+
+    Args:
+        url (str): Host URL.
+        max_failures (int): Consecutive failures opening the circuit.
+        max_error_rate (float): Error rate (0 to 1) on recent calls opening
+            the circuit.
+        reset_timeout (float): Time in seconds before probing an host with
+            circuit open.
+        history_size (int): Number of recent calls used to compute error
+            rate. Error rate is used only once history is full.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    #: Default consecutive failures opening the circuit
+    MAX_FAILURES = 3
+
+    #: Default error rate opening the circuit
+    MAX_ERROR_RATE = 0.5
+
+    #: Default time in seconds before probing an host with circuit open
+    RESET_TIMEOUT = 30.0
+
+    def __init__(self, url, max_failures=None, max_error_rate=None,
+                 reset_timeout=None, history_size=20):
+        self._url = url
+        self._max_failures = max_failures or self.MAX_FAILURES
+        self._max_error_rate = max_error_rate or self.MAX_ERROR_RATE
+        self._reset_timeout = (
+            self.RESET_TIMEOUT if reset_timeout is None else reset_timeout)
+        self._outcomes = _deque(maxlen=history_size)
+        self._lock = _Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._trial_at = None
+        self._latency = None
+
+    @property
+    def state(self):
+        """
+        Circuit state.
+
+        Returns:
+            str: "closed", "open" or "half_open".
+        """
+        return self._state
+
+    @property
+    def available(self):
+        """
+        Returns True if calls are allowed, or if host can be probed.
+
+        Returns:
+            bool: Availability.
+        """
+        return (self._state != self.OPEN or
+                _time() - self._opened_at >= self._reset_timeout)
+
+    @property
+    def error_rate(self):
+        """
+        Error rate on recent calls.
+
+        Returns:
+            float: Error rate (0 to 1).
+        """
+        outcomes = list(self._outcomes)
+        if not outcomes:
+            return 0.0
+        return outcomes.count(False) / float(len(outcomes))
+
+    @property
+    def consecutive_failures(self):
+        """
+        Number of consecutive failures.
+
+        Returns:
+            int: Failures.
+        """
+        return self._consecutive_failures
+
+    @property
+    def latency(self):
+        """
+        Recent calls latency (Exponentially weighted moving average).
+
+        Returns:
+            float or None: Latency in seconds. None if no successful call.
+        """
+        return self._latency
+
+    def before_call(self):
+        """
+        Check call is allowed.
+
+        If circuit is open since "reset_timeout", probes host.
+
+        Raises:
+            apyfal.exceptions.ClientRuntimeException: Circuit open.
+        """
+        probe = False
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+
+            # Allows a single trial call
+            if self._state == self.HALF_OPEN:
+                if (self._trial_at is None or
+                        _time() - self._trial_at >= self._reset_timeout):
+                    self._trial_at = _time()
+                    return
+
+            # Allows a single caller to probe host
+            elif (not self._probing and
+                  _time() - self._opened_at >= self._reset_timeout):
+                self._probing = probe = True
+
+            # Fails fast
+            if not probe:
+                raise _exc.ClientRuntimeException(
+                    'Host "%s" unavailable after repeated failures' %
+                    self._url)
+
+        # Probes host without blocking other callers, that fail fast
+        reachable = False
+        try:
+            reachable = _utl.check_url(self._url)
+        finally:
+            with self._lock:
+                self._probing = False
+                if reachable:
+                    # Prober performs the trial call
+                    self._state = self.HALF_OPEN
+                    self._trial_at = _time()
+                else:
+                    self._opened_at = _time()
+
+        if not reachable:
+            raise _exc.ClientRuntimeException(
+                gen_msg=('unable_reach_url', self._url))
+
+    def record_success(self, latency=None):
+        """
+        Record a successful call.
+
+        Args:
+            latency (float): Call duration in seconds.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._outcomes.clear()
+            self._state = self.CLOSED
+            self._trial_at = None
+            self._consecutive_failures = 0
+            self._outcomes.append(True)
+            if latency is not None:
+                self._latency = latency if self._latency is None else (
+                    0.8 * self._latency + 0.2 * latency)
+
+    def record_failure(self):
+        """
+        Record a failed call.
+        """
+        with self._lock:
+            self._trial_at = None
+            self._consecutive_failures += 1
+            self._outcomes.append(False)
+            if (self._state == self.HALF_OPEN or
+                    self._consecutive_failures >= self._max_failures or (
+                        len(self._outcomes) == self._outcomes.maxlen and
+                        self.error_rate >= self._max_error_rate)):
+                self._state = self.OPEN
+                self._opened_at = _time()
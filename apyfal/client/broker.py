@@ -0,0 +1,571 @@
+# coding=utf-8
+"""Local accelerator broker.
+
+The broker is a daemon that owns a configured accelerator (and its metering
+setup) and shares it between all processes of the node. Processes use the
+broker with the "Broker" thin client that sends requests over a local Unix
+socket. Process requests from all clients are queued and served in turn.
+
+The broker can be started from command line:
+
+    python -m apyfal.client.broker --accelerator my_accelerator
+"""
+from collections import deque as _deque, OrderedDict as _OrderedDict
+import json as _json
+from os import remove as _remove, umask as _umask
+import os.path as _os_path
+import socket as _socket
+from threading import Condition as _Condition, Event as _Event, \
+    Lock as _Lock, Thread as _Thread
+try:
+    # Python 3
+    from socketserver import (
+        ThreadingUnixStreamServer as _UnixServer,
+        StreamRequestHandler as _StreamRequestHandler)
+except ImportError:
+    # Python 2
+    from SocketServer import (
+        ThreadingUnixStreamServer as _UnixServer,
+        StreamRequestHandler as _StreamRequestHandler)
+
+import apyfal.configuration as _cfg
+import apyfal.exceptions as _exc
+from apyfal.client import AcceleratorClient as _Client
+
+
+def _get_socket_path(socket_path, config):
+    """
+    Get broker Unix socket path.
+
+    Args:
+        socket_path (str): Override result if not None.
+        config (apyfal.configuration.Configuration): Configuration.
+
+    Returns:
+        str: Path
+    """
+    return (socket_path or config['host']['broker_socket'] or
+            _cfg.BROKER_SOCKET)
+
+
+class BrokerClient(_Client):
+    """
+    Accelerator client using a local accelerator broker.
+
+    The broker must be running on the same node. Starting the accelerator
+    only configures it if its configuration changed. Stopping this client
+    does not stop the broker accelerator.
+
+    Args:
+        accelerator (str): Name of the accelerator to initialize,
+            to know the accelerator list please visit "https://accelstore.accelize.com".
+        accelize_client_id (str): Accelize Client ID.
+            Client ID is part of the access key generate from
+            "https:/accelstore.accelize.com/user/applications".
+        accelize_secret_id (str): Accelize Secret ID. Secret ID come with client_id.
+        socket_path (str): Broker Unix socket path. Default to "broker_socket"
+            value in "host" configuration section, or to
+            "apyfal.configuration.BROKER_SOCKET".
+        config (str or apyfal.configuration.Configuration or file-like object):
+            Can be Configuration instance, apyfal.storage URL, paths, file-like object.
+            If not set, will search it in current working directory, in current
+            user "home" folder. If none found, will use default configuration values.
+    """
+
+    #: Client type
+    NAME = 'Broker'
+
+    def __init__(self, accelerator=None, socket_path=None, *args, **kwargs):
+        _Client.__init__(self, accelerator=accelerator, *args, **kwargs)
+        self._socket_path = _get_socket_path(socket_path, self._config)
+
+        # Need broker to run
+        if not _os_path.exists(self._socket_path):
+            raise _exc.ClientConfigurationException(
+                'No accelerator broker running on "%s"' % self._socket_path)
+
+    def _start(self, datafile, parameters):
+        """
+        Client specific start implementation.
+
+        Args:
+            datafile (str): Input file.
+            parameters (dict): Parameters dict.
+
+        Returns:
+            dict: response.
+        """
+        return self._request(
+            'start', datafile=self._abspath(datafile), parameters=parameters)
+
+    def _process(self, file_in, file_out, parameters):
+        """
+        Client specific process implementation.
+
+        Args:
+            file_in (str): Input file.
+            file_out (str): Output file.
+            parameters (dict): Parameters dict.
+
+        Returns:
+            dict: response dict.
+        """
+        return self._request(
+            'process', file_in=self._abspath(file_in),
+            file_out=self._abspath(file_out), parameters=parameters)
+
+    def cancel(self):
+        """
+        Cancels the running process operation of this client.
+
+        The process is removed from the broker queue if not started yet,
+        else the broker accelerator client cancels it if supported.
+
+        Cancelled process operation raises
+        "apyfal.exceptions.ClientRuntimeException".
+        """
+        _Client.cancel(self)
+        self._request('cancel')
+
+    def _stop(self, info_dict):
+        """
+        Client specific stop implementation.
+
+        The broker accelerator is shared and is never stopped by clients.
+
+        Args:
+            info_dict (bool): Returns response dict.
+
+        Returns:
+            dict or None: response.
+        """
+
+    @staticmethod
+    def _abspath(path):
+        """
+        Absolute path, since broker does not share client working directory.
+
+        Args:
+            path (str): path or None.
+
+        Returns:
+            str: Absolute path or None.
+        """
+        return _os_path.abspath(path) if path else path
+
+    def _request(self, operation, **kwargs):
+        """
+        Send a request to the broker and wait its response.
+
+        Args:
+            operation (str): Operation.
+            kwargs: Operation arguments.
+
+        Returns:
+            dict: response.
+        """
+        kwargs.update(operation=operation, client=self._session_uuid)
+        sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+        try:
+            sock.connect(self._socket_path)
+            sock.sendall(_json.dumps(kwargs).encode() + b'\n')
+            stream = sock.makefile('rb')
+            try:
+                line = stream.readline()
+            finally:
+                stream.close()
+        except (_socket.error, IOError, OSError) as exception:
+            raise _exc.ClientRuntimeException(
+                'Unable to reach accelerator broker', exc=exception)
+        finally:
+            sock.close()
+
+        if not line:
+            raise _exc.ClientRuntimeException(
+                'Accelerator broker closed connection')
+        result = _json.loads(line.decode())
+
+        # Raises broker error
+        if 'error' in result:
+            exc_type = getattr(_exc, result.get('type', ''), None)
+            if not (isinstance(exc_type, type) and
+                    issubclass(exc_type, _exc.AcceleratorException)):
+                exc_type = _exc.ClientRuntimeException
+            raise exc_type(result['error'])
+
+        return result.get('response')
+
+
+class _FairQueue(object):
+    """Queue of jobs from many clients.
+
+    Clients are served in turn (round-robin), a client sending many jobs
+    does not delay jobs of other clients."""
+
+    def __init__(self):
+        self._queues = _OrderedDict()
+        self._condition = _Condition()
+
+    def __len__(self):
+        with self._condition:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def put(self, client, job):
+        """
+        Put a job in the queue.
+
+        Args:
+            client (str): Client ID.
+            job (object): Job.
+        """
+        with self._condition:
+            self._queues.setdefault(client, _deque()).append(job)
+            self._condition.notify()
+
+    def get(self, timeout=None):
+        """
+        Get the next job.
+
+        Args:
+            timeout (float): Maximum time to wait a job in seconds.
+
+        Returns:
+            object: Job, or None if no job after timeout.
+        """
+        with self._condition:
+            if not self._queues:
+                self._condition.wait(timeout)
+                if not self._queues:
+                    return None
+
+            # Gets job of the first client, and moves client at end of turn
+            client, queue = next(iter(self._queues.items()))
+            job = queue.popleft()
+            del self._queues[client]
+            if queue:
+                self._queues[client] = queue
+            return job
+
+    def remove(self, client, match):
+        """
+        Remove jobs of a client from the queue.
+
+        Args:
+            client (str): Client ID.
+            match (callable): Returns True if the job must be removed.
+
+        Returns:
+            list of object: Removed jobs.
+        """
+        with self._condition:
+            queue = self._queues.get(client)
+            if not queue:
+                return []
+            removed = [job for job in queue if match(job)]
+            for job in removed:
+                queue.remove(job)
+            if not queue:
+                del self._queues[client]
+            return removed
+
+
+class _Job(object):
+    """Broker request waiting to be executed.
+
+    Args:
+        request (dict): Request.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.response = None
+        self.done = _Event()
+
+
+class _RequestHandler(_StreamRequestHandler):
+    """Handle broker requests, one JSON request by line."""
+
+    def handle(self):
+        """Handle all requests of a connection."""
+        for line in iter(self.rfile.readline, b''):
+            job = self.server.broker.submit(_json.loads(line.decode()))
+            job.done.wait()
+            self.wfile.write(_json.dumps(job.response).encode() + b'\n')
+            self.wfile.flush()
+
+
+class Broker(object):
+    """
+    Local accelerator broker daemon.
+
+    Owns a configured accelerator and serves requests from "Broker" clients
+    of the node over a Unix socket. The socket is only accessible by the user
+    running the broker.
+
+    Args:
+        accelerator (str): Name of the accelerator to initialize,
+            to know the accelerator list please visit "https://accelstore.accelize.com".
+        socket_path (str): Broker Unix socket path. Default to "broker_socket"
+            value in "host" configuration section, or to
+            "apyfal.configuration.BROKER_SOCKET".
+        config (str or apyfal.configuration.Configuration or file-like object):
+            Can be Configuration instance, apyfal.storage URL, paths, file-like object.
+            If not set, will search it in current working directory, in current
+            user "home" folder. If none found, will use default configuration values.
+        client_kwargs: Accelerator client arguments. By default, uses
+            the local accelerator with the "SysCall" client.
+    """
+
+    def __init__(self, accelerator=None, socket_path=None, config=None,
+                 **client_kwargs):
+        self._config = _cfg.create_configuration(config)
+        self._socket_path = _get_socket_path(socket_path, self._config)
+        self._client = _Client(
+            accelerator=accelerator, config=self._config, **client_kwargs)
+        self._queue = _FairQueue()
+        self._running_job = None
+        self._jobs_lock = _Lock()
+        self._configured = None
+        self._server = None
+        self._worker = None
+        self._running = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.stop()
+
+    @property
+    def client(self):
+        """
+        Accelerator client used by broker.
+
+        Returns:
+            apyfal.client.AcceleratorClient: Accelerator client
+        """
+        return self._client
+
+    @property
+    def socket_path(self):
+        """
+        Broker Unix socket path.
+
+        Returns:
+            str: Path
+        """
+        return self._socket_path
+
+    def start(self):
+        """
+        Start serving requests in background threads.
+        """
+        if self._running:
+            return
+
+        # Removes socket left by a previous broker
+        if _os_path.exists(self._socket_path):
+            _remove(self._socket_path)
+
+        # Creates socket only accessible by current user
+        umask = _umask(0o177)
+        try:
+            self._server = _UnixServer(self._socket_path, _RequestHandler)
+        finally:
+            _umask(umask)
+        self._server.daemon_threads = True
+        self._server.broker = self
+
+        self._running = True
+        self._worker = _Thread(target=self._run_jobs)
+        self._worker.daemon = True
+        self._worker.start()
+
+        thread = _Thread(target=self._server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    def serve_forever(self):
+        """
+        Start serving requests until interrupted.
+        """
+        self.start()
+        try:
+            while self._running:
+                self._worker.join(1.0)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        """
+        Stop serving requests and stop accelerator.
+        """
+        if not self._running:
+            return
+        self._running = False
+
+        self._server.shutdown()
+        self._server.server_close()
+        try:
+            _remove(self._socket_path)
+        except OSError:
+            pass
+        self._worker.join()
+        self._client.stop()
+
+    def submit(self, request):
+        """
+        Queue a request.
+
+        Args:
+            request (dict): Request.
+
+        Returns:
+            _Job: Job.
+        """
+        job = _Job(request)
+
+        # Cancellation is not queued, it applies to queued or running jobs
+        if request.get('operation') == 'cancel':
+            self._cancel(request.get('client'))
+            job.response = {'response': None}
+            job.done.set()
+            return job
+
+        self._queue.put(request.get('client'), job)
+        return job
+
+    def _cancel(self, client):
+        """
+        Cancel process jobs of a client.
+
+        Args:
+            client (str): Client ID.
+        """
+        with self._jobs_lock:
+            # Removes jobs not started yet
+            for job in self._queue.remove(client, self._is_process):
+                job.response = {'error': 'Process cancelled',
+                                'type': 'ClientRuntimeException'}
+                job.done.set()
+
+            # Cancels running job
+            job = self._running_job
+            if (job is not None and job.request.get('client') == client and
+                    self._is_process(job)):
+                self._client.cancel()
+
+    @staticmethod
+    def _is_process(job):
+        """
+        Check if job is a process operation.
+
+        Args:
+            job (_Job): Job.
+
+        Returns:
+            bool: True if process operation.
+        """
+        return job.request.get('operation') == 'process'
+
+    def _run_jobs(self):
+        """
+        Run queued jobs, one at a time.
+        """
+        while self._running:
+            # Gets next job, cancellation of previous job is cleared
+            with self._jobs_lock:
+                job = self._queue.get(timeout=0.5)
+                if job is None:
+                    continue
+                self._running_job = job
+                self._client._cancelled = False
+            try:
+                job.response = {'response': self._run(**job.request)}
+            except Exception as exception:
+                job.response = {'error': str(exception),
+                                'type': exception.__class__.__name__}
+            finally:
+                with self._jobs_lock:
+                    self._running_job = None
+                job.done.set()
+
+    def _run(self, operation, parameters=None, datafile=None, file_in=None,
+             file_out=None, **_):
+        """
+        Run a request with accelerator.
+
+        Args:
+            operation (str): "start", "process" or "stop".
+            parameters (dict): Parameters dict.
+            datafile (str): Input file of "start" operation.
+            file_in (str): Input file of "process" operation.
+            file_out (str): Output file of "process" operation.
+
+        Returns:
+            dict: response.
+        """
+        if operation == 'start':
+            # Configures accelerator only if configuration changed
+            fingerprint = self._client._configuration_fingerprint(
+                datafile, parameters)
+            if (fingerprint is not None and self._configured is not None and
+                    self._configured[0] == fingerprint):
+                return self._configured[1]
+
+            # Configuration changes: Memorizes it only if successful
+            self._configured = None
+            response = self._client._start(datafile, parameters)
+            try:
+                succeeded = not response['app']['status']
+            except (KeyError, TypeError):
+                succeeded = False
+            if fingerprint is not None and succeeded:
+                self._configured = (fingerprint, response)
+            return response
+
+        elif operation == 'process':
+            # Opens files as streams if required by client
+            io_format = self._client.PARAMETER_IO_FORMAT
+            if file_out and io_format.get('file_out') == 'stream':
+                with open(file_out, 'wb') as stream:
+                    return self._client._process(file_in, stream, parameters)
+            return self._client._process(file_in, file_out, parameters)
+
+        elif operation == 'stop':
+            return None
+
+        raise _exc.ClientRuntimeException(
+            'Unsupported broker operation "%s"' % operation)
+
+
+def _main(argv=None):
+    """
+    Run broker from command line.
+
+    Args:
+        argv (list of str): Command line arguments.
+    """
+    from argparse import ArgumentParser
+    parser = ArgumentParser(
+        prog='python -m apyfal.client.broker',
+        description='Local accelerator broker daemon.')
+    parser.add_argument('--accelerator', help='Accelerator name.')
+    parser.add_argument('--socket', help='Unix socket path.')
+    parser.add_argument('--config', help='Configuration file.')
+    parser.add_argument(
+        '--host-ip', help='URL of a remote accelerator host to share. '
+                          'If not specified, uses local accelerator.')
+    args = parser.parse_args(argv)
+
+    client_kwargs = dict(host_ip=args.host_ip, client_type='REST') \
+        if args.host_ip else dict()
+    Broker(accelerator=args.accelerator, socket_path=args.socket,
+           config=args.config, **client_kwargs).serve_forever()
+
+
+if __name__ == '__main__':
+    _main()
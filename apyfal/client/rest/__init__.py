@@ -4,28 +4,37 @@
 This client allow remote accelerator control."""
 import json as _json
 import os as _os
-import shutil as _shutil
 from ast import literal_eval as _literal_eval
+from contextlib import contextmanager as _contextmanager
+from copy import deepcopy as _deepcopy
+from io import BytesIO as _BytesIO, open as _io_open
+from time import time as _time
+from uuid import uuid4 as _uuid
+
+import requests as _requests
+from requests.packages.urllib3.exceptions import HTTPError as _HTTPError
 
 try:
     import pycurl as _pycurl
     _USE_PYCURL = True
 
-    try:
-        # Python 2
-        from StringIO import StringIO as _BytesIO
-    except ImportError:
-        # Python 3
-        from io import BytesIO as _BytesIO
+    # cURL errors raised before request is sent
+    _CURL_CONNECT_ERRORS = (
+        _pycurl.E_COULDNT_RESOLVE_PROXY, _pycurl.E_COULDNT_RESOLVE_HOST,
+        _pycurl.E_COULDNT_CONNECT)
 
 except ImportError:
     _USE_PYCURL = False
     _pycurl = None
-    _BytesIO = None
 
 import apyfal._utilities as _utl
+import apyfal._utilities.compression as _compression
 import apyfal.exceptions as _exc
-from apyfal.client import AcceleratorClient as _Client
+import apyfal.storage as _srg
+import apyfal.client._datafile as _datafile
+from apyfal.client import (
+    AcceleratorClient as _Client, AcceleratorHandle as _AcceleratorHandle)
+from apyfal.client._health import get_health as _get_health
 
 try:
     from apyfal.client.rest import _openapi as _api
@@ -38,6 +47,11 @@ except ImportError:  # OpenAPI client need to be generated first
     raise
 
 
+# Current configuration of hosts:
+# {host URL: (fingerprint, configuration URL, start response)}
+_CONFIGURATIONS = dict()
+
+
 class RESTClient(_Client):
     """
     Remote Accelerator OpenAPI REST client.
@@ -50,6 +64,9 @@ class RESTClient(_Client):
             "https:/accelstore.accelize.com/user/applications".
         accelize_secret_id (str): Accelize Secret ID. Secret ID come with client_id.
         host_ip (str): IP or URL address of the accelerator host.
+        configuration_url (str): URL of an existing accelerator configuration
+            on host to use. If not specified, uses the last configuration
+            of host, if any.
         config (str or apyfal.configuration.Configuration or file-like object):
             Can be Configuration instance, apyfal.storage URL, paths, file-like object.
             If not set, will search it in current working directory, in current
@@ -65,7 +82,8 @@ class RESTClient(_Client):
     # Format required for parameter: 'file' (default) or 'stream'
     PARAMETER_IO_FORMAT = {'file_out': 'stream'}
 
-    def __init__(self, accelerator=None, host_ip=None, *args, **kwargs):
+    def __init__(self, accelerator=None, host_ip=None, configuration_url=None,
+                 *args, **kwargs):
         # Initialize client
         _Client.__init__(self, accelerator=accelerator, *args, **kwargs)
 
@@ -73,13 +91,43 @@ class RESTClient(_Client):
         self._configuration_url = None
         self._api_client = _api.ApiClient()
 
+        # Pre-signed URL forwarding to host
+        compiled = self._config.compiled
+        section = compiled['storage']
+        self._presigned_urls = section.get_literal('presigned_urls')
+        self._presigned_urls_expires = section.get_literal(
+            'presigned_urls_expires')
+
+        # Client/host transfers compression
+        self._compression = section['compression']
+        self._compression_level = section.get_literal('compression_level')
+        if self._compression:
+            # Checks encoding is supported
+            _compression.compressor(
+                self._compression, self._compression_level)
+        self._host_encodings = None
+        self._host_schema = None
+        self._transfer_stats = dict()
+
+        # Host health tracking, retries and timeouts
+        section = compiled['host']
+        self._retry_policy = self._config.get_retry_policy('host')
+        self._health_settings = dict(
+            max_failures=section.get_literal('health_max_failures'),
+            max_error_rate=section.get_literal('health_max_error_rate'),
+            reset_timeout=section.get_literal('health_reset_timeout'))
+
         # Mandatory parameters
         if not accelerator:
             raise _exc.ClientConfigurationException(
                 "'accelerator' argument is mandatory.")
 
         # Pass host URL if already defined.
-        if host_ip:
+        if host_ip and configuration_url:
+            # Attach to a known configuration without requesting host
+            self._set_url(host_ip)
+            self._configuration_url = configuration_url
+        elif host_ip:
             self.url = host_ip
 
     @property
@@ -94,17 +142,89 @@ class RESTClient(_Client):
 
     @url.setter
     def url(self, url):
+        self._set_url(url)
+
+        # If possible use the last accelerator configuration (it can still be overwritten later)
+        self._use_last_configuration()
+
+    def _set_url(self, url):
+        """
+        Set URL of the accelerator host.
+
+        Args:
+            url (str): URL
+        """
         # Check URL
         if not url:
             raise _exc.ClientConfigurationException("Host URL is not valid.")
 
         self._url = _utl.format_url(url)
+        self._host_encodings = None
+        self._host_schema = None
 
         # Configure REST API host
         self._api_client.configuration.host = self._url
 
-        # If possible use the last accelerator configuration (it can still be overwritten later)
-        self._use_last_configuration()
+    @property
+    def handle(self):
+        """
+        Serializable handle that other processes can use to attach to this
+        accelerator.
+
+        Returns:
+            apyfal.client.AcceleratorHandle: Handle.
+
+        Raises:
+            apyfal.exceptions.ClientRuntimeException: Accelerator not
+                configured.
+        """
+        if self._url is None or self._configuration_url is None:
+            raise _exc.ClientRuntimeException(
+                'Only configured remote accelerators can be shared')
+        return _AcceleratorHandle(
+            accelerator=self._name, url=self._url,
+            configuration_url=self._configuration_url,
+            session_uuid=self._session_uuid, config=self._config)
+
+    @property
+    def health(self):
+        """
+        Health of the accelerator host.
+
+        Health is shared by all clients of this process using the same host.
+
+        Returns:
+            apyfal.client._health.HostHealth: Host health, None if no host.
+        """
+        if self._url is None:
+            return None
+        return _get_health(self._url, **self._health_settings)
+
+    @_contextmanager
+    def _track_health(self):
+        """
+        Tracks host health of a call.
+
+        Fails fast if host circuit is open. Only host connection errors are
+        recorded as failures.
+
+        Raises:
+            apyfal.exceptions.ClientRuntimeException: Host circuit open.
+        """
+        health = self.health
+        if health is None:
+            yield
+            return
+
+        health.before_call()
+        start = _time()
+        try:
+            yield
+        except (_api.rest.ApiException, _HTTPError,
+                _requests.RequestException):
+            health.record_failure()
+            raise
+        health.record_success(_time() - start)
 
     def _is_alive(self):
         """
@@ -115,7 +235,8 @@ class RESTClient(_Client):
         """
         if self.url is None:
             raise _exc.ClientRuntimeException("No accelerator running")
-        if not _utl.check_url(self.url, max_retries=2):
+        if not _utl.check_url(self.url, max_retries=2,
+                              retry_policy=self._retry_policy):
             raise _exc.ClientRuntimeException(
                 gen_msg=('unable_reach_url', self._url))
 
@@ -139,6 +260,124 @@ class RESTClient(_Client):
         # The last configuration URL should be keep in order to not request it to user.
         self._configuration_url = last_config.url
 
+        # Fingerprints host configuration, if not already known.
+        # The host only provides parameters, not data file content: A data
+        # file sent to host can't be identified, a data file URL forwarded
+        # to host is identified like in "_start".
+        configuration = _CONFIGURATIONS.get(self._url)
+        if configuration is not None and configuration[1] == last_config.url:
+            return
+        try:
+            response = _literal_eval(last_config.parametersresult)
+            response.update(url_config=last_config.url, url_instance=self._url)
+            fingerprint = None if last_config.datafile else \
+                self._configuration_fingerprint(
+                    None, _json.loads(last_config.parameters))
+        except (ValueError, TypeError, SyntaxError, AttributeError):
+            return
+        _CONFIGURATIONS[self._url] = (fingerprint, last_config.url, response)
+
+    def _forward_url(self, url, mode):
+        """
+        Returns URL to forward to host.
+
+        If "presigned_urls" is enabled, storage URL are converted to
+        pre-signed HTTP URL to allow host to access them without credentials.
+
+        Args:
+            url (str): apyfal.storage URL.
+            mode (str): Access mode. 'r' or 'w'.
+
+        Returns:
+            str: URL.
+        """
+        if self._presigned_urls:
+            return _srg.presigned_url(
+                url, mode, self._presigned_urls_expires) or url
+        return url
+
+    def _get_schema(self):
+        """
+        Returns host REST API schema.
+
+        Returns:
+            dict: OpenAPI schema, empty if host does not provide it.
+        """
+        if self._host_schema is None:
+            try:
+                with _utl.handle_request_exceptions(
+                        _exc.ClientRuntimeException):
+                    response = _utl.http_session(
+                        https=False, retry_policy=self._retry_policy).get(
+                        '%s/v1.0/schema/' % self.url, headers={
+                            'Accept': 'application/openapi+json, '
+                                      'application/json'})
+                    response.raise_for_status()
+                self._host_schema = response.json()
+                if not isinstance(self._host_schema, dict):
+                    raise ValueError
+            except (_exc.ClientRuntimeException, ValueError):
+                # Host does not provide its API schema
+                self._host_schema = dict()
+        return self._host_schema
+
+    def _datafile_encoding(self):
+        """
+        Returns encoding to use to compress process data file upload.
+
+        Compression is used only if host REST API supports it (API schema
+        "process_create" operation has a "datafile_encoding" parameter).
+
+        Returns:
+            str or None: Encoding, None if not compressed.
+        """
+        if not self._compression:
+            return None
+
+        # Gets host supported encodings
+        if self._host_encodings is None:
+            try:
+                parameters = self._get_schema()['paths']['/v1.0/process/'][
+                    'post']['parameters']
+            except (KeyError, TypeError):
+                parameters = ()
+
+            self._host_encodings = ()
+            for parameter in parameters:
+                if parameter.get('name') == 'datafile_encoding':
+                    self._host_encodings = tuple(parameter.get(
+                        'enum', _compression.ENCODINGS))
+                    break
+
+        if self._compression in self._host_encodings:
+            return self._compression
+        return None
+
+    def _store_datafile(self, datafile, datafile_digest):
+        """
+        Stores configuration data file on host by content digest.
+
+        Only data file content missing on host is uploaded. This requires
+        host REST API supports it (API schema has a "datafile" path).
+
+        Args:
+            datafile (str or file-like object): Input file.
+            datafile_digest (str): Data file digest.
+
+        Returns:
+            bool: True if data file is stored on host, False if host does not
+                support it and data file must be sent with configuration.
+        """
+        if (datafile_digest is None or
+                _datafile.DATAFILE_PATH not in self._get_schema().get(
+                    'paths', ())):
+            return False
+
+        with self._track_health():
+            _datafile.upload(self.url, datafile, datafile_digest,
+                             retry_policy=self._retry_policy)
+        return True
+
     def start(self, datafile=None, info_dict=False, host_env=None, **parameters):
         """
         Configures accelerator.
@@ -180,10 +419,31 @@ class RESTClient(_Client):
         Returns:
             dict: response.
         """
-        # Configures  accelerator
+        # Reuses host configuration if unchanged
+        try:
+            datafile_digest = _datafile.digest(datafile) if (
+                datafile and not hasattr(datafile, 'read')) else None
+            fingerprint = self._configuration_fingerprint(
+                datafile, parameters, datafile_digest)
+        except (IOError, OSError):
+            datafile_digest = fingerprint = None
+        configuration = _CONFIGURATIONS.get(self._url)
+        if (fingerprint is not None and configuration is not None and
+                configuration[:2] == (fingerprint, self._configuration_url)):
+            response = _deepcopy(configuration[2])
+            response.setdefault('app', dict())['reused'] = True
+            return response
+
+        # Configures  accelerator, referring to data file by digest if stored
+        # on host
         api_instance = self._rest_api_configuration()
-        api_response = api_instance.configuration_create(
-            parameters=_json.dumps(parameters), datafile=datafile or '')
+        if self._store_datafile(datafile, datafile_digest):
+            datafile_kwargs = dict(datafile_digest=datafile_digest)
+        else:
+            datafile_kwargs = dict(datafile=datafile or '')
+        with self._track_health():
+            api_response = api_instance.configuration_create(
+                parameters=_json.dumps(parameters), **datafile_kwargs)
 
         # Checks operation success
         config_result = _literal_eval(api_response.parametersresult)
@@ -199,6 +459,13 @@ class RESTClient(_Client):
         # Returns response
         config_result['url_config'] = self._configuration_url
         config_result['url_instance'] = self.url
+
+        # Memorizes successful configuration fingerprint
+        if fingerprint is not None and not config_result.get(
+                'app', dict()).get('status'):
+            _CONFIGURATIONS[self._url] = (
+                fingerprint, self._configuration_url,
+                _deepcopy(config_result))
         return config_result
 
     def _process_openapi(self, json_parameters, datafile):
@@ -234,33 +501,60 @@ class RESTClient(_Client):
 
         post = [("parameters", json_parameters),
                 ("configuration", self._configuration_url)]
-        if datafile is not None:
-            post.append(("datafile", (_pycurl.FORM_FILE, datafile)))
+        encoding = self._datafile_encoding() if datafile is not None else None
+        if encoding:
+            # Data file compressed while uploaded
+            post.append(("datafile_encoding", encoding))
+            boundary = _uuid().hex
+            body_opts = (
+                (_pycurl.HTTPHEADER, [
+                    'Content-Type: multipart/form-data; boundary=%s' %
+                    boundary, 'Transfer-Encoding: chunked']),)
+        else:
+            if datafile is not None:
+                post.append(("datafile", (_pycurl.FORM_FILE, datafile)))
+            body_opts = (
+                (_pycurl.HTTPPOST, post),
+                (_pycurl.HTTPHEADER, ['Content-Type: multipart/form-data']))
 
+        policy = self._retry_policy
         for curl_opt in (
                 (_pycurl.URL, str("%s/v1.0/process/" % self.url)),
                 (_pycurl.POST, 1),
-                (_pycurl.TIMEOUT, 1200),
-                (_pycurl.HTTPPOST, post),
-                (_pycurl.HTTPHEADER, ['Content-Type: multipart/form-data'])):
+                (_pycurl.CONNECTTIMEOUT, int(policy.connect_timeout)),
+                (_pycurl.LOW_SPEED_LIMIT, 1),
+                (_pycurl.LOW_SPEED_TIME, int(policy.read_timeout))) + body_opts:
             curl.setopt(*curl_opt)
 
         # Process with cURL
-        retries_max = 3
-        retries_done = 1
+        policy.record_call()
+        retry = 0
         while True:
             write_buffer = _BytesIO()
             curl.setopt(_pycurl.WRITEDATA, write_buffer)
 
             try:
-                curl.perform()
+                if encoding:
+                    with _io_open(datafile, 'rb') as file:
+                        body = _compression.CompressReader(
+                            file, encoding, self._compression_level)
+                        curl.setopt(_pycurl.READFUNCTION, self._multipart_body(
+                            boundary, post, datafile, body))
+                        curl.perform()
+                    self._transfer_stats['datafile'] = body.stats
+                else:
+                    curl.perform()
                 break
 
             except _pycurl.error as exception:
-                if retries_done > retries_max:
+                # Process request is not idempotent: Retries only if not sent
+                code = exception.args[0] if exception.args else None
+                if (code not in _CURL_CONNECT_ERRORS or
+                        not policy.next_retry(retry)):
+                    self.health.record_failure()
                     raise _exc.ClientRuntimeException(
                         'Failed to post process request', exc=exception)
-                retries_done += 1
+                retry += 1
 
         curl.close()
 
@@ -279,6 +573,51 @@ class RESTClient(_Client):
 
         return api_response['id'], api_response['processed']
 
+    @staticmethod
+    def _multipart_body(boundary, fields, datafile, stream):
+        """
+        Returns a cURL read function streaming a "multipart/form-data" body.
+
+        Args:
+            boundary (str): Multipart boundary.
+            fields (list of tuple): Form fields as (name, value).
+            datafile (str): Data file path.
+            stream (file-like object): Data file content binary stream.
+
+        Returns:
+            function: Function with size argument returning up to size
+                bytes of body.
+        """
+        # Form fields and data file part header
+        head = ''.join(
+            '--%s\r\nContent-Disposition: form-data; name="%s"\r\n\r\n'
+            '%s\r\n' % (boundary, name, value) for name, value in fields)
+        head += (
+            '--%s\r\nContent-Disposition: form-data; name="datafile"; '
+            'filename="%s"\r\nContent-Type: application/octet-stream'
+            '\r\n\r\n' % (boundary, _os.path.basename(datafile)))
+        parts = [_BytesIO(head.encode('utf-8')), stream,
+                 _BytesIO(('\r\n--%s--\r\n' % boundary).encode())]
+
+        def read_function(size):
+            """
+            Reads body.
+
+            Args:
+                size (int): Maximum size to read.
+
+            Returns:
+                bytes: Body part.
+            """
+            while parts:
+                data = parts[0].read(size)
+                if data:
+                    return data
+                del parts[0]
+            return b''
+
+        return read_function
+
     def _process(self, file_in, file_out, parameters):
         """
         Client specific process implementation.
@@ -298,13 +637,32 @@ class RESTClient(_Client):
 
         # Use cURL to improve performance and avoid issue with big file (https://bugs.python.org/issue8450)
         # If not available, use REST API (with limitations)
+        self._transfer_stats = dict()
         process_function = self._process_curl if _USE_PYCURL else self._process_openapi
-        api_resp_id, processed = process_function(_json.dumps(parameters), file_in)
+        with self._track_health():
+            api_resp_id, _ = process_function(
+                _json.dumps(parameters), file_in)
 
-        # Get result
+            # Get result
+            return self._read_result(api_resp_id, file_out)
+
+    def _read_result(self, api_resp_id, file_out):
+        """
+        Waits for process completion, get result and deletes process.
+
+        Args:
+            api_resp_id (str): Process ID.
+            file_out (file-like object): Output file.
+
+        Returns:
+            dict: response dict.
+        """
         api_instance = self._rest_api_process()
         try:
             while True:
+                # Cancelled: Process record is deleted on exit
+                self._check_cancelled()
+
                 api_response = api_instance.process_read(api_resp_id)
                 processed = api_response.processed
                 if processed is True:
@@ -318,17 +676,39 @@ class RESTClient(_Client):
 
             # Write result file
             if file_out:
-                response = _utl.http_session(https=False).get(
-                    api_response.datafileresult, stream=True)
-                _shutil.copyfileobj(response.raw, file_out)
+                response = _utl.http_session(
+                    https=False, retry_policy=self._retry_policy).get(
+                    api_response.datafileresult, stream=True, headers={
+                        'Accept-Encoding': self._compression or 'identity'})
+                self._write_result(response, file_out)
 
             # Get response
-            return _literal_eval(api_response.parametersresult)
+            result = _literal_eval(api_response.parametersresult)
+            if self._transfer_stats and 'app' in result:
+                result['app']['compression'] = self._transfer_stats
+            return result
 
         finally:
             # Process_delete api_response
             api_instance.process_delete(api_resp_id)
 
+    def _write_result(self, response, file_out):
+        """
+        Write result file, decompress it if compressed by host.
+
+        Args:
+            response (requests.Response): Result file streamed response.
+            file_out (file-like object): Output file.
+        """
+        encoding = response.headers.get('Content-Encoding', 'identity')
+        if encoding == 'identity':
+            _srg.copy(response.raw, file_out)
+            return
+
+        with _compression.DecompressWriter(file_out, encoding) as stream:
+            _srg.copy(response.raw, stream)
+        self._transfer_stats['result'] = stream.stats
+
     def _stop(self, info_dict):
         """
         Client specific stop implementation.
@@ -366,7 +746,9 @@ class RESTClient(_Client):
             Configured instance of API class.
         """
         api_instance = api(api_client=self._api_client)
-        api_instance.api_client.rest_client.pool_manager.connection_pool_kw['retries'] = 3
+        pool_kw = api_instance.api_client.rest_client.pool_manager.connection_pool_kw
+        pool_kw['retries'] = self._retry_policy.urllib3_retry()
+        pool_kw['timeout'] = self._retry_policy.urllib3_timeout()
         return api_instance
 
     def _rest_api_process(self):
@@ -28,6 +28,7 @@ except ImportError:
     CONFIG_PARSER_READ = 'readfp'
 
 import json as _json
+import os as _os
 import os.path as _os_path
 
 from apyfal import exceptions as _exc
@@ -51,12 +52,23 @@ METERING_TMP = '/tmp/meteringServer'
 #: Metering Client configuration
 METERING_CLIENT_CONFIG = '/etc/sysconfig/meteringclient'
 
-__all__ = ['create_configuration', 'Configuration',
+#: Default local accelerator broker Unix socket
+BROKER_SOCKET = '/tmp/apyfal_broker.sock'
+
+__all__ = ['create_configuration', 'Configuration', 'CompiledConfiguration',
+           'CompiledSection',
            'accelerator_executable_available',
            'ACCELERATOR_EXECUTABLE', 'ACCELERATOR_TMP_ROOT',
            'METERING_SERVER', 'METERING_TMP',
            'METERING_CLIENT_CONFIG',
-           'METERING_CREDENTIALS']
+           'METERING_CREDENTIALS', 'BROKER_SOCKET']
+
+# Parsed configuration files cache: {real path: (file stat key, sections)}
+_FILES_CACHE = dict()
+
+# Retry policies shared by configurations:
+# {(section name, policy parameters): RetryPolicy}
+_RETRY_POLICIES = dict()
 
 
 def create_configuration(configuration_file):
@@ -83,6 +95,52 @@ def accelerator_executable_available():
     return _os_path.isfile(ACCELERATOR_EXECUTABLE)
 
 
+def _read_configuration_file(configuration_file):
+    """
+    Read and parse configuration file.
+
+    Local files are parsed only once and cached until modified.
+
+    Args:
+        configuration_file (str or file-like object): Configuration file
+            path. Can be apyfal.storage URL, paths, file-like object.
+
+    Returns:
+        dict: Sections as {section name: tuple of (parameter, value)}.
+    """
+    # Checks if local file already parsed
+    try:
+        path = _os_path.realpath(configuration_file)
+        stat = _os.stat(path)
+    except (TypeError, AttributeError, OSError):
+        # File-like object or storage URL: Not cached
+        path = stat_key = None
+    else:
+        stat_key = (
+            getattr(stat, 'st_mtime_ns', stat.st_mtime), stat.st_size)
+        try:
+            cached_key, sections = _FILES_CACHE[path]
+            if cached_key == stat_key:
+                return sections
+        except KeyError:
+            pass
+
+    # Initialize configuration parser
+    ini_file = ConfigParser(allow_no_value=True)
+
+    # Read from file with apyfal.storage support
+    from apyfal.storage import open as srg_open
+    with srg_open(configuration_file, 'rt', encoding='utf-8') as file:
+        getattr(ini_file, CONFIG_PARSER_READ)(file)
+
+    # Retrieve parameters from configuration parser
+    sections = {section: tuple(ini_file.items(section))
+                for section in ini_file.sections()}
+    if path is not None:
+        _FILES_CACHE[path] = (stat_key, sections)
+    return sections
+
+
 class _Section(dict):
     """Configuration section
 
@@ -113,6 +171,11 @@ class _Section(dict):
         if value is None:
             return
         dict.__setitem__(self, parameter, value)
+        self._section_parent._compiled = None
+
+    def __delitem__(self, parameter):
+        dict.__delitem__(self, parameter)
+        self._section_parent._compiled = None
 
     def __getitem__(self, parameter):
         # Try to get value directly in this section
@@ -155,11 +218,7 @@ class _Section(dict):
         Returns:
             object: evaluated parameter
         """
-        value = self[parameter]
-        try:
-            return _literal_eval(value)
-        except (ValueError, TypeError, SyntaxError):
-            return value
+        return _literal(self[parameter])
 
     def get_list(self, parameter, sep='\n'):
         """
@@ -214,6 +273,8 @@ class Configuration(_Mapping):
         # Initialize values Dictionaries
         self._sections = dict()
         self._cache = dict()
+        self._compiled = None
+        self._file = None
 
         # Finds configuration file
         if configuration_file is None:
@@ -232,18 +293,16 @@ class Configuration(_Mapping):
         # If not, return empty Configuration file, this will force
         # host and accelerator classes to uses defaults values
         if configuration_file:
-            # Initialize configuration parser
-            ini_file = ConfigParser(allow_no_value=True)
-
-            # Read from file with apyfal.storage support
-            from apyfal.storage import open as srg_open
-            with srg_open(configuration_file, 'rt', encoding='utf-8') as file:
-                getattr(ini_file, CONFIG_PARSER_READ)(file)
+            # Memorizes path or URL, file-like objects can't be read again
+            if not hasattr(configuration_file, 'read'):
+                self._file = configuration_file
 
-            # Retrieve parameters from configuration parser
+            # Retrieve parameters from parsed file, each configuration
+            # has its own sections copy and can modify it
             self._sections = {
-                section: _Section(section, self, ini_file.items(section))
-                for section in ini_file.sections()}
+                section: _Section(section, self, parameters)
+                for section, parameters in _read_configuration_file(
+                    configuration_file).items()}
 
             # AcceleratorAPI backward compatibility
             self._legacy_backward_compatibility()
@@ -266,12 +325,39 @@ class Configuration(_Mapping):
     def __len__(self):
         return self._sections.__len__()
 
+    def __getstate__(self):
+        # Pickle only parameters
+        return {section_name: dict(section)
+                for section_name, section in self._sections.items()}
+
+    def __setstate__(self, state):
+        self._sections = {
+            section_name: _Section(section_name, self, parameters)
+            for section_name, parameters in state.items()}
+        self._cache = dict()
+        self._compiled = None
+        self._file = None
+
     def __str__(self):
         return dict(self).__str__()
 
     def __repr__(self):
         return '%s(%s)' % (object.__repr__(self), self.__str__())
 
+    @property
+    def compiled(self):
+        """
+        Compiled read-only view of this configuration.
+
+        The view is updated when configuration is modified.
+
+        Returns:
+            CompiledConfiguration: Compiled configuration.
+        """
+        if self._compiled is None:
+            self._compiled = CompiledConfiguration(self)
+        return self._compiled
+
     @property
     def access_token(self):
         """
@@ -294,7 +380,8 @@ class Configuration(_Mapping):
                 raise _exc.ClientAuthenticationException(gen_msg='no_credentials')
 
             # Check access and get token from server
-            response = _utl.http_session().post(
+            response = _utl.http_session(
+                retry_policy=self.get_retry_policy('accelize')).post(
                 METERING_SERVER + '/o/token/',
                 data={"grant_type": "client_credentials"},
                 auth=(client_id, secret_id))
@@ -307,6 +394,31 @@ class Configuration(_Mapping):
 
         return self._cache['metering_access_token']
 
+    def get_retry_policy(self, section):
+        """
+        Gets retry and timeout policy of network calls related to a section.
+
+        Policy is shared by all calls using configurations with the same
+        section parameters.
+
+        Args:
+            section (str): Section name. Policy parameters not specified
+                in a subsection are read from its parent section.
+
+        Returns:
+            apyfal._utilities.retry.RetryPolicy: Policy.
+        """
+        section = self.compiled[section]
+        key = (section.name, tuple(
+            section.get_literal(name) for name, _ in
+            _utl.RetryPolicy.CONFIG_KEYS))
+        try:
+            return _RETRY_POLICIES[key]
+        except KeyError:
+            policy = _RETRY_POLICIES.setdefault(
+                key, _utl.RetryPolicy.from_section(section))
+            return policy
+
     def get_host_requirements(self, host_type, accelerator):
         """
         Gets accelerators requirements to use with host.
@@ -322,7 +434,8 @@ class Configuration(_Mapping):
                    "Content-Type": "application/json",
                    "Accept": "application/vnd.accelize.v1+json"}
 
-        response = _utl.http_session().get(
+        response = _utl.http_session(
+            retry_policy=self.get_retry_policy('accelize')).get(
             METERING_SERVER + '/auth/getlastcspconfiguration/',
             headers=headers)
         response.raise_for_status()
@@ -434,3 +547,180 @@ class Configuration(_Mapping):
             '"%s%s" is deprecated in "accelerator.conf"' %
             (section, ':%s' % parameter if parameter else ''),
             DeprecationWarning)
+
+
+def _literal(value):
+    """
+    Evaluate str value to Python object.
+
+    Args:
+        value (str): Value.
+
+    Returns:
+        object: evaluated value, or value if not a Python literal.
+    """
+    try:
+        return _literal_eval(value)
+    except (ValueError, TypeError, SyntaxError):
+        return value
+
+
+def _freeze(value):
+    """
+    Convert value to a hashable value.
+
+    Args:
+        value (object): Value.
+
+    Returns:
+        object: Hashable value. Lists and tuples are converted to tuples,
+            dicts to frozensets of items and sets to frozensets, recursively.
+            Other not hashable values are converted to their representation.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    elif isinstance(value, dict):
+        return frozenset(
+            (_freeze(key), _freeze(item)) for key, item in value.items())
+    elif isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+class CompiledSection(_Mapping):
+    """Compiled configuration section.
+
+    Read-only section with parameters inherited from parent section
+    already resolved and values already evaluated to Python objects
+    (Like "get_literal"). Returns None for missing parameters.
+
+    Hashable, compiled sections with same name and parameters are equals.
+
+    Args:
+        section_name (str): Section name.
+        parameters (dict): Section parameters values, including
+            parameters inherited from parent section.
+    """
+
+    def __init__(self, section_name, parameters):
+        self._name = section_name
+        self._values = {parameter: _literal(value)
+                        for parameter, value in parameters.items()}
+        self._key = (section_name, _freeze(parameters))
+        self._hash = hash(self._key)
+
+    def __getitem__(self, parameter):
+        return self._values.get(parameter)
+
+    def __contains__(self, parameter):
+        return parameter in self._values
+
+    def __iter__(self):
+        return self._values.__iter__()
+
+    def __len__(self):
+        return self._values.__len__()
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return isinstance(other, CompiledSection) and self._key == other._key
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        return '%s(%s)' % (object.__repr__(self), self._values)
+
+    @property
+    def name(self):
+        """
+        Section name.
+
+        Returns:
+            str: Name.
+        """
+        return self._name
+
+    def get(self, parameter, default=None):
+        """
+        Get parameter value.
+
+        Args:
+            parameter (str): Parameter to get.
+            default (object): Value to return if parameter value is None.
+
+        Returns:
+            object: evaluated parameter
+        """
+        value = self._values.get(parameter)
+        return default if value is None else value
+
+    # Compatibility with "_Section"
+    get_literal = __getitem__
+
+
+class CompiledConfiguration(_Mapping):
+    """Compiled configuration.
+
+    Read-only snapshot of a configuration, mapping of "CompiledSection".
+    Never raises KeyError but returns at least an empty section.
+
+    Hashable, compiled configurations with same parameters are equals.
+
+    Args:
+        configuration (Configuration): Configuration to compile.
+    """
+
+    def __init__(self, configuration):
+        self._parameters = {
+            section_name: dict(section)
+            for section_name, section in configuration._sections.items()}
+        self._sections = dict()
+        self._key = _freeze(self._parameters)
+        self._hash = hash(self._key)
+
+    def __getitem__(self, section_name):
+        try:
+            return self._sections[section_name]
+        except KeyError:
+            pass
+
+        # Resolves parameters inherited from parent section
+        if '.' in section_name:
+            parameters = dict(self._parameters.get(
+                section_name.split('.', 1)[0], ()))
+        else:
+            parameters = dict()
+        for parameter, value in self._parameters.get(
+                section_name, dict()).items():
+            if value is not None or parameter not in parameters:
+                parameters[parameter] = value
+
+        section = self._sections[section_name] = CompiledSection(
+            section_name, parameters)
+        return section
+
+    def __contains__(self, section_name):
+        return section_name in self._parameters
+
+    def __iter__(self):
+        return self._parameters.__iter__()
+
+    def __len__(self):
+        return self._parameters.__len__()
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return (isinstance(other, CompiledConfiguration) and
+                self._key == other._key)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
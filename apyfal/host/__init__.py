@@ -1,12 +1,14 @@
 # coding=utf-8
 """FPGA Host"""
 
+from os import getpid as _getpid
+
 import apyfal.configuration as _cfg
 import apyfal.exceptions as _exc
 import apyfal._utilities as _utl
 
 
-class Host(_utl.ABC):
+class Host(_utl.FactoryABC):
     """This is base class for all host classes.
 
     This is also a factory which instantiate host subclass related to
@@ -55,8 +57,12 @@ class Host(_utl.ABC):
         return _utl.factory(
             cls, host_type, 'host_type', _exc.HostConfigurationException)
 
+    # Process that created the host
+    _pid = None
+
     def __init__(self, host_type=None, config=None, host_ip=None,
                  stop_mode=None, **_):
+        self._pid = _getpid()
 
         # Default some attributes
         self._accelerator = None
@@ -67,6 +73,8 @@ class Host(_utl.ABC):
         # Read configuration from file
         self._config = _cfg.create_configuration(config)
         section = self._config[self._config_section]
+        self._retry_policy = self._config.get_retry_policy(
+            self._config_section)
 
         self._host_type = self._host_type_from_config(host_type, self._config)
 
@@ -83,7 +91,9 @@ class Host(_utl.ABC):
         self.stop()
 
     def __del__(self):
-        self.stop()
+        # Copies of host in forked processes do not stop host
+        if self._pid == _getpid():
+            self.stop()
 
     @property
     def host_type(self):
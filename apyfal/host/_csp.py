@@ -58,6 +58,9 @@ class CSPHost(_Host):
     #: Allowed ports for instance access
     ALLOW_PORTS = [22, 80]
 
+    #: Stop modes keeping instance available for reuse, preferred first
+    STANDBY_MODES = ('stop', 'keep')
+
     # Attributes returned as dict by "info" property
     _INFO_NAMES = _Host._INFO_NAMES.copy()
     _INFO_NAMES.update({
@@ -329,7 +332,7 @@ class CSPHost(_Host):
             _get_logger().info("Instance ready")
 
         # If URL exists, checks if reachable
-        elif not _utl.check_url(self._url):
+        elif not _utl.check_url(self._url, retry_policy=self._retry_policy):
             raise _exc.HostRuntimeException(
                 gen_msg=('unable_reach_url', self._url))
 
@@ -379,7 +382,8 @@ class CSPHost(_Host):
         Raises:
             apyfal.exceptions.HostRuntimeException:
                 Timeout while booting."""
-        if not _utl.check_url(self._url, timeout=self.TIMEOUT):
+        if not _utl.check_url(self._url, timeout=self.TIMEOUT,
+                              retry_policy=self._retry_policy):
             raise _exc.HostRuntimeException(
                 gen_msg=('timeout', "boot"))
 
@@ -441,6 +445,32 @@ class CSPHost(_Host):
             self._instance = None
             _get_logger().info("Instance '%s' has been stopped", self._instance_id)
 
+    def _release(self, stop_mode):
+        """
+        Releases instance to let another host object reuse it. This object
+        does not control the instance anymore.
+
+        Args:
+            stop_mode (str): "stop" to pause instance, "keep" to let it
+                running.
+
+        Returns:
+            str: Instance ID.
+        """
+        if stop_mode != 'keep':
+            self.stop(stop_mode)
+        self._instance = None
+        self._url = None
+        return self._instance_id
+
+    def _tag_instance(self, tags):
+        """
+        Tags current instance. Does nothing if not supported by CSP.
+
+        Args:
+            tags (dict): Tags names and values.
+        """
+
     @_abstractmethod
     def _terminate_instance(self):
         """
@@ -6,6 +6,7 @@ from json import dumps as _json_dumps
 import time as _time
 
 import boto3 as _boto3
+from botocore.config import Config as _Config
 
 from apyfal.host._csp import CSPHost as _CSPHost
 import apyfal.exceptions as _exc
@@ -79,6 +80,8 @@ class AWSHost(_CSPHost):
             aws_secret_access_key=self._secret_id,
             region_name=self._region
         )
+        self._client_config = _Config(
+            **self._retry_policy.botocore_kwargs())
 
     def _check_credential(self):
         """
@@ -88,7 +91,7 @@ class AWSHost(_CSPHost):
             apyfal.exceptions.HostAuthenticationException:
                 Authentication failed.
         """
-        ec2_client = self._session.client('ec2')
+        ec2_client = self._session.client('ec2', config=self._client_config)
         with _ExceptionHandler.catch(
                 to_raise=_exc.HostAuthenticationException):
             ec2_client.describe_key_pairs()
@@ -100,7 +103,7 @@ class AWSHost(_CSPHost):
         Returns:
             bool: True if reuses existing key
         """
-        ec2_client = self._session.client('ec2')
+        ec2_client = self._session.client('ec2', config=self._client_config)
 
         # Checks if Key pairs exists, needs to get the full pairs list
         # and compare in lower case because Boto perform its checks case sensitive
@@ -116,7 +119,7 @@ class AWSHost(_CSPHost):
                 return True
 
         # Key does not exist on the CSP, create it
-        ec2_resource = self._session.resource('ec2')
+        ec2_resource = self._session.resource('ec2', config=self._client_config)
         with _ExceptionHandler.catch():
             key_pair = ec2_resource.create_key_pair(KeyName=self._key_pair)
 
@@ -158,7 +161,7 @@ class AWSHost(_CSPHost):
                  "Resource": ["arn:aws:s3:::*"]}
             ]})
 
-        iam_client = self._session.client('iam')
+        iam_client = self._session.client('iam', config=self._client_config)
         with _ExceptionHandler.catch(filter_error_codes='EntityAlreadyExists'):
             iam_client.create_policy(
                 PolicyName=policy, PolicyDocument=policy_document)
@@ -166,7 +169,7 @@ class AWSHost(_CSPHost):
             _get_logger().info(
                 _utl.gen_msg('created_named', 'policy', policy))
 
-        iam_client = self._session.client('iam')
+        iam_client = self._session.client('iam', config=self._client_config)
         response = iam_client.list_policies(
             Scope='Local', OnlyAttached=False, MaxItems=100)
         for policy_item in response['Policies']:
@@ -189,7 +192,7 @@ class AWSHost(_CSPHost):
                 "Principal": {"Service": "ec2.amazonaws.com"},
                 "Action": "sts:AssumeRole"}})
 
-        iam_resource = self._session.resource('iam')
+        iam_resource = self._session.resource('iam', config=self._client_config)
         with _ExceptionHandler.catch(filter_error_codes='EntityAlreadyExists'):
             role = iam_resource.create_role(
                 RoleName=self._role,
@@ -199,7 +202,7 @@ class AWSHost(_CSPHost):
             _get_logger().info(
                 _utl.gen_msg('created_named', 'IAM role', role))
 
-        iam_client = self._session.client('iam')
+        iam_client = self._session.client('iam', config=self._client_config)
         arn = iam_client.get_role(RoleName=self._role)['Role']['Arn']
 
         return arn
@@ -211,7 +214,7 @@ class AWSHost(_CSPHost):
         Args:
             policy_arn (str): Policy ARN
         """
-        iam_client = self._session.client('iam')
+        iam_client = self._session.client('iam', config=self._client_config)
 
         with _ExceptionHandler.catch(filter_error_codes='EntityAlreadyExists'):
             iam_client.attach_role_policy(
@@ -227,7 +230,7 @@ class AWSHost(_CSPHost):
 
         This instance_profile allow to perform actions defined by role.
         """
-        iam_client = self._session.client('iam')
+        iam_client = self._session.client('iam', config=self._client_config)
 
         # Create instance profile
         instance_profile_name = 'AccelizeLoadFPGA'
@@ -257,7 +260,7 @@ class AWSHost(_CSPHost):
         # Get list of security groups
         # Checks if Key pairs exists, like for key pairs
         # needs  case insensitive names check
-        ec2_client = self._session.client('ec2')
+        ec2_client = self._session.client('ec2', config=self._client_config)
         with _ExceptionHandler.catch():
             security_groups = ec2_client.describe_security_groups()
 
@@ -323,7 +326,8 @@ class AWSHost(_CSPHost):
         """
         with _ExceptionHandler.catch(
                 gen_msg=('no_instance_id', self._instance_id)):
-            return self._session.resource('ec2').Instance(self._instance_id)
+            return self._session.resource(
+                'ec2', config=self._client_config).Instance(self._instance_id)
 
     def _get_public_ip(self):
         """
@@ -442,8 +446,8 @@ class AWSHost(_CSPHost):
             kwargs['UserData'] = user_data
 
         # Create instance
-        instance = self._session.resource('ec2').create_instances(
-            **kwargs)[0]
+        instance = self._session.resource(
+            'ec2', config=self._client_config).create_instances(**kwargs)[0]
 
         return instance, instance.id
 
@@ -475,6 +479,17 @@ class AWSHost(_CSPHost):
             raise _exc.HostRuntimeException(
                 gen_msg=('unable_to_status', 'start', status))
 
+    def _tag_instance(self, tags):
+        """
+        Tags current instance.
+
+        Args:
+            tags (dict): Tags names and values.
+        """
+        with _ExceptionHandler.catch():
+            self._instance.create_tags(Tags=[
+                {'Key': key, 'Value': value} for key, value in tags.items()])
+
     def _terminate_instance(self):
         """
         Terminate and delete instance.
@@ -57,6 +57,9 @@ class OpenStackHost(_CSPHost):
     # Default Interface to use (str)
     OPENSTACK_INTERFACE = None
 
+    #: Stopping instance deletes it, standby instances are kept running
+    STANDBY_MODES = ('keep',)
+
     _INFO_NAMES = _CSPHost._INFO_NAMES.copy()
     _INFO_NAMES.update({'_project_id', '_auth_url', '_interface'})
 
@@ -82,7 +85,8 @@ class OpenStackHost(_CSPHost):
         self._session = _utl_openstack.connect(
             region=self._region, auth_url=self._auth_url,
             client_id=self._client_id, secret_id=self._secret_id,
-            project_id=self._project_id, interface=self._interface)
+            project_id=self._project_id, interface=self._interface,
+            retry_policy=self._retry_policy)
 
     def _check_credential(self):
         """
@@ -299,6 +303,16 @@ class OpenStackHost(_CSPHost):
                     gen_msg=('unable_to', "start")):
                 self._session.start_server(self._instance)
 
+    def _tag_instance(self, tags):
+        """
+        Tags current instance with server metadata.
+
+        Args:
+            tags (dict): Tags names and values.
+        """
+        with _ExceptionHandler.catch(gen_msg=('unable_to', "tag")):
+            self._session.set_server_metadata(self._instance, tags)
+
     def _terminate_instance(self):
         """
         Terminate and delete instance.
@@ -0,0 +1,313 @@
+# coding=utf-8
+"""Warm pool of standby host instances.
+
+Creating and booting a CSP instance takes minutes. The standby pool keeps
+instances ready (stopped, or running idle) and hands them out to new
+accelerators, hiding this latency for bursty workloads. Instances are
+replenished in background.
+
+    pool = StandbyPool('my_accelerator', size=2, host_type='AWS')
+    with pool:
+        accelerator = pool.get()
+        try:
+            accelerator.start()
+            accelerator.process(file_in, file_out)
+        finally:
+            pool.release(accelerator)
+"""
+from collections import deque as _deque
+from threading import Condition as _Condition, Thread as _Thread
+
+import apyfal.configuration as _cfg
+import apyfal.exceptions as _exc
+from apyfal import Accelerator as _Accelerator
+from apyfal.host import Host as _Host
+from apyfal.host._csp import CSPHost as _CSPHost
+from apyfal._utilities import get_logger as _get_logger
+
+#: Tag of standby instances, value is the accelerator name
+STANDBY_TAG = 'AccelizeStandby'
+
+
+class StandbyPool(object):
+    """
+    Warm pool of standby CSP host instances.
+
+    Instances are tagged with "STANDBY_TAG" and kept stopped, or running idle
+    if host does not support stopping instances without deleting them.
+
+    Args:
+        accelerator (str): Name of the accelerator instances are started
+            for.
+        size (int): Number of standby instances to keep ready. Default to
+            "standby_size" value in "host" configuration section, or 1.
+        standby_mode (str): "stop" to keep instances stopped, "keep" to keep
+            them running. Default to "standby_mode" value in "host"
+            configuration section, or to first mode supported by host.
+        instance_ids (iterable of str): IDs of existing standby instances to
+            add to pool. Like instances kept by a previous pool stopped with
+            "stop_mode='keep'".
+        host_type (str): Type of host to use.
+        config (str or apyfal.configuration.Configuration or file-like object):
+            Can be Configuration instance, apyfal.storage URL, paths, file-like object.
+            If not set, will search it in current working directory, in current
+            user "home" folder. If none found, will use default configuration values.
+        host_kwargs: Keyword arguments related to specific host. See targeted host class
+            to see full list of arguments.
+    """
+
+    def __init__(self, accelerator, size=None, standby_mode=None,
+                 instance_ids=None, host_type=None, config=None,
+                 **host_kwargs):
+        self._accelerator = accelerator
+        self._config = _cfg.create_configuration(config)
+        self._host_type = host_type or self._config['host']['host_type']
+        self._host_kwargs = host_kwargs
+
+        # Only CSP hosts instances can be created on demand
+        host_class = type(_Host.__new__(
+            _Host, host_type=self._host_type, config=self._config))
+        if not issubclass(host_class, _CSPHost):
+            raise _exc.HostConfigurationException(
+                "Standby pool requires a cloud host, got host_type '%s'" %
+                self._host_type)
+
+        # Read configuration
+        section = self._config.compiled['host.%s' % host_class.NAME]
+        self._size = int(size if size is not None else (
+            section.get_literal('standby_size') or 1))
+        standby_mode = standby_mode or section['standby_mode']
+        self._standby_mode = (
+            standby_mode if standby_mode in host_class.STANDBY_MODES else
+            host_class.STANDBY_MODES[0])
+
+        # Standby instances IDs, number of instances being created and being
+        # put in standby
+        self._standby = _deque(instance_ids or ())
+        self._pending = 0
+        self._parking = 0
+        self._threads = []
+        self._condition = _Condition()
+        self._running = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.stop()
+
+    @property
+    def size(self):
+        """
+        Number of standby instances to keep ready.
+
+        Returns:
+            int: Size
+        """
+        return self._size
+
+    @property
+    def standby_mode(self):
+        """
+        Stop mode of standby instances.
+
+        Returns:
+            str: "stop" or "keep".
+        """
+        return self._standby_mode
+
+    @property
+    def instance_ids(self):
+        """
+        IDs of standby instances currently ready.
+
+        Returns:
+            list of str: Instances IDs.
+        """
+        with self._condition:
+            return list(self._standby)
+
+    def start(self):
+        """
+        Start replenishing the pool in background.
+        """
+        with self._condition:
+            self._running = True
+        self._replenish()
+
+    def stop(self, stop_mode='term'):
+        """
+        Stop replenishing the pool and stop standby instances.
+
+        Waits instances being created.
+
+        Args:
+            stop_mode (str): Stop mode of standby instances. "keep"
+                keeps them as standby, their IDs can be passed to another pool
+                with "instance_ids".
+        """
+        with self._condition:
+            self._running = False
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join()
+
+        if stop_mode == 'keep':
+            return
+
+        with self._condition:
+            instance_ids, self._standby = list(self._standby), _deque()
+        for instance_id in instance_ids:
+            try:
+                host = self._new_host(instance_id=instance_id)
+                host._status()
+                host.stop(stop_mode)
+            except _exc.HostException:
+                continue
+
+    def get(self, timeout=0.0, **accelerator_kwargs):
+        """
+        Get an accelerator using a standby instance.
+
+        Stopping the accelerator stops its instance, or terminates it if
+        standby instances are kept running. Use "release" instead to return
+        its instance to the pool.
+
+        Args:
+            timeout (float): Time in seconds to wait for a standby instance
+                being created if none is ready. If no instance is ready after
+                this time, the accelerator creates a new instance.
+            accelerator_kwargs: "apyfal.Accelerator" arguments.
+
+        Returns:
+            apyfal.Accelerator: Accelerator, not started.
+        """
+        # Gets a standby instance, and replaces it in background
+        with self._condition:
+            if not self._standby and self._pending and timeout:
+                self._condition.wait(timeout)
+            instance_id = self._standby.popleft() if self._standby else None
+        self._replenish()
+
+        kwargs = self._host_kwargs.copy()
+        kwargs.update(accelerator_kwargs)
+        return _Accelerator(
+            accelerator=self._accelerator, config=self._config,
+            host_type=self._host_type, instance_id=instance_id,
+            stop_mode='stop' if self._standby_mode == 'stop' else 'term',
+            **kwargs)
+
+    def release(self, accelerator):
+        """
+        Return an accelerator instance to the pool.
+
+        The instance is terminated if the pool is already full or stopped.
+
+        Args:
+            accelerator (apyfal.Accelerator): Accelerator.
+        """
+        try:
+            accelerator.client.stop()
+        except _exc.ClientException:
+            pass
+
+        host = accelerator.host
+        if host is None or host.instance_id is None:
+            accelerator.stop('term')
+            return
+        self._park(host)
+
+    def _new_host(self, **kwargs):
+        """
+        Instantiate a pool host.
+
+        Args:
+            kwargs: Host arguments.
+
+        Returns:
+            apyfal.host._csp.CSPHost subclass: Host.
+        """
+        host_kwargs = self._host_kwargs.copy()
+        host_kwargs.update(kwargs)
+        return _Host(host_type=self._host_type, config=self._config,
+                     stop_mode='term', **host_kwargs)
+
+    def _replenish(self):
+        """
+        Create missing standby instances in background.
+        """
+        with self._condition:
+            missing = (self._size - len(self._standby) - self._pending -
+                       self._parking)
+            if not self._running or missing <= 0:
+                return
+            self._pending += missing
+
+            self._threads = [
+                thread for thread in self._threads if thread.is_alive()]
+            for _ in range(missing):
+                thread = _Thread(target=self._add_instance)
+                thread.daemon = True
+                thread.start()
+                self._threads.append(thread)
+
+    def _add_instance(self):
+        """
+        Create a standby instance.
+        """
+        try:
+            host = self._new_host()
+            host.start(accelerator=self._accelerator)
+        except _exc.HostException as exception:
+            _get_logger().warning(
+                "Unable to create standby instance: %s", exception)
+            with self._condition:
+                self._pending -= 1
+                self._condition.notify_all()
+            return
+        self._park(host, pending=True)
+
+    def _park(self, host, pending=False):
+        """
+        Put an instance in standby, or terminates it if pool is stopped or
+        already full.
+
+        Args:
+            host (apyfal.host._csp.CSPHost subclass): Host with started
+                instance.
+            pending (bool): True if instance was created by pool.
+        """
+        with self._condition:
+            if pending:
+                self._pending -= 1
+            full = (not self._running or
+                    len(self._standby) + self._parking >= self._size)
+            if not full:
+                self._parking += 1
+
+        if full:
+            try:
+                host.stop('term')
+            except _exc.HostException:
+                pass
+            with self._condition:
+                self._condition.notify_all()
+            return
+
+        instance_id = None
+        try:
+            host._tag_instance({STANDBY_TAG: self._accelerator})
+            instance_id = host._release(self._standby_mode)
+
+        except _exc.HostException as exception:
+            _get_logger().warning(
+                "Unable to put instance in standby: %s", exception)
+            host._stop_silently(None)
+
+        finally:
+            with self._condition:
+                self._parking -= 1
+                if instance_id is not None:
+                    self._standby.append(instance_id)
+                self._condition.notify_all()
@@ -0,0 +1,678 @@
+# coding=utf-8
+"""Pool of accelerators processing concurrently.
+
+Large record-oriented inputs can be split in shards processed in parallel
+by accelerators of the pool, outputs being merged in input order."""
+
+from abc import abstractmethod as _abstractmethod
+from collections import deque as _deque
+from math import ceil as _ceil
+from multiprocessing.pool import ThreadPool as _ThreadPool
+from tempfile import SpooledTemporaryFile as _SpooledTemporaryFile
+from threading import Lock as _Lock, Thread as _Thread
+from time import time as _time
+
+try:
+    # Python 3
+    from queue import Queue as _Queue, Empty as _Empty
+except ImportError:
+    # Python 2
+    from Queue import Queue as _Queue, Empty as _Empty
+
+import apyfal.exceptions as _exc
+import apyfal.storage as _srg
+import apyfal._utilities as _utl
+
+
+class Splitter(_utl.ABC):
+    """Base class for input splitters.
+
+    Splitter reads input stream and yields shards content.
+
+    Args:
+        chunk_size (int): Size in bytes of chunks read from input stream.
+    """
+
+    #: Default size in bytes of chunks read from input stream
+    CHUNK_SIZE = 1024 ** 2
+
+    def __init__(self, chunk_size=None):
+        self._chunk_size = chunk_size or self.CHUNK_SIZE
+
+    @_abstractmethod
+    def split(self, stream):
+        """
+        Split input.
+
+        Args:
+            stream (file-like object): Input binary stream.
+
+        Returns:
+            generator of bytes: Shards content.
+        """
+
+
+class RecordSplitter(Splitter):
+    """Splits input in shards of about "shard_size" bytes, shards ending on
+    a record delimiter.
+
+    Args:
+        shard_size (int): Shard size in bytes. Shards are extended up to the
+            next delimiter.
+        delimiter (bytes): Record delimiter. Default to new line.
+        chunk_size (int): Size in bytes of chunks read from input stream.
+    """
+
+    def __init__(self, shard_size, delimiter=b'\n', chunk_size=None):
+        Splitter.__init__(self, chunk_size=chunk_size)
+        self._shard_size = int(shard_size)
+        if self._shard_size <= 0:
+            raise ValueError('"shard_size" must be greater than 0')
+        self._delimiter = delimiter
+
+    def split(self, stream):
+        """
+        Split input.
+
+        Args:
+            stream (file-like object): Input binary stream.
+
+        Returns:
+            generator of bytes: Shards content.
+        """
+        buffer = bytearray()
+        delimiter_size = len(self._delimiter)
+        searched = 0
+        while True:
+            chunk = stream.read(self._chunk_size)
+            buffer += chunk
+
+            # Yields shards ending on first delimiter after shard size
+            while len(buffer) >= self._shard_size:
+                start = max(self._shard_size, searched) - delimiter_size
+                end = buffer.find(self._delimiter, start)
+                if end == -1:
+                    searched = len(buffer)
+                    break
+                end += delimiter_size
+                yield bytes(buffer[:end])
+                del buffer[:end]
+                searched = 0
+
+            if not chunk:
+                break
+
+        if buffer:
+            yield bytes(buffer)
+
+
+class LineSplitter(Splitter):
+    """Splits input in shards of a fixed number of lines.
+
+    Args:
+        lines (int): Number of lines by shard.
+        chunk_size (int): Size in bytes of chunks read from input stream.
+    """
+
+    def __init__(self, lines, chunk_size=None):
+        Splitter.__init__(self, chunk_size=chunk_size)
+        self._lines = int(lines)
+        if self._lines <= 0:
+            raise ValueError('"lines" must be greater than 0')
+
+    def split(self, stream):
+        """
+        Split input.
+
+        Args:
+            stream (file-like object): Input binary stream.
+
+        Returns:
+            generator of bytes: Shards content.
+        """
+        buffer = bytearray()
+        lines = 0
+        position = 0
+        while True:
+            chunk = stream.read(self._chunk_size)
+            buffer += chunk
+
+            # Yields shards as soon as they contain enough lines
+            while True:
+                end, lines = self._find_lines_end(
+                    buffer, position, self._lines - lines)
+                if end is None:
+                    position = len(buffer)
+                    lines = self._lines - lines
+                    break
+                yield bytes(buffer[:end])
+                del buffer[:end]
+                lines = position = 0
+
+            if not chunk:
+                break
+
+        if buffer:
+            yield bytes(buffer)
+
+    @staticmethod
+    def _find_lines_end(buffer, start, lines, block_size=65536):
+        """
+        Find end of a number of lines.
+
+        Args:
+            buffer (bytearray): Buffer.
+            start (int): Search start position.
+            lines (int): Number of lines to find.
+            block_size (int): Size of blocks in which lines are counted.
+
+        Returns:
+            tuple: Position after last line end, or None if not enough lines;
+                Number of lines still missing.
+        """
+        # Counts lines by blocks to skip blocks without the last line end
+        size = len(buffer)
+        while start < size:
+            stop = min(start + block_size, size)
+            count = buffer.count(b'\n', start, stop)
+            if count < lines:
+                lines -= count
+                start = stop
+                continue
+
+            # Finds last line end in block
+            for _ in range(lines):
+                start = buffer.find(b'\n', start) + 1
+            return start, 0
+
+        return None, lines
+
+
+class Merger(_utl.ABC):
+    """Base class for output mergers.
+
+    Merger writes shards outputs in output stream, in input order.
+    """
+
+    @_abstractmethod
+    def write(self, output, stream):
+        """
+        Write a shard output.
+
+        Args:
+            output (bytes-like object): Shard output.
+            stream (file-like object): Output binary stream.
+        """
+
+    def close(self, stream):
+        """
+        Called after last shard output was written.
+
+        Args:
+            stream (file-like object): Output binary stream.
+        """
+
+
+class ConcatMerger(Merger):
+    """Concatenates shards outputs."""
+
+    def write(self, output, stream):
+        """
+        Write a shard output.
+
+        Args:
+            output (bytes-like object): Shard output.
+            stream (file-like object): Output binary stream.
+        """
+        stream.write(output)
+
+
+class AcceleratorPool(object):
+    """
+    Pool of accelerators processing concurrently.
+
+    Accelerators must be already started and configured. Each accelerator
+    processes one job at a time.
+
+    Accelerators with unavailable host (See "apyfal.client.rest.RESTClient.health")
+    are skipped while other accelerators are idle.
+
+    Jobs can be hedged to reduce tail latency: If a job takes longer than a
+    percentile of recent jobs latencies, it is dispatched again to another
+    idle accelerator. The first result is used, and the other job is
+    cancelled.
+
+    Args:
+        accelerators (iterable of apyfal.Accelerator or
+            apyfal.client.AcceleratorClient): Accelerators.
+        hedge_percentile (float): Latency percentile (0 to 100) after which
+            a job is hedged. If not specified, jobs are not hedged.
+        hedge_min_samples (int): Minimum number of latencies samples
+            required before hedging jobs.
+        history_size (int): Number of recent jobs latencies kept.
+    """
+
+    #: Time to wait in seconds before retrying hedging if no accelerator idle
+    HEDGE_RETRY_DELAY = 0.1
+
+    def __init__(self, accelerators, hedge_percentile=None,
+                 hedge_min_samples=10, history_size=100):
+        self._accelerators = list(accelerators)
+        if not self._accelerators:
+            raise _exc.ClientConfigurationException(
+                'At least one accelerator is required.')
+
+        # Jobs latencies
+        self._hedge_percentile = hedge_percentile
+        self._hedge_min_samples = hedge_min_samples
+        self._latencies = _deque(maxlen=history_size)
+        self._latencies_lock = _Lock()
+
+        # Idle accelerators
+        self._idle = _Queue()
+        for accelerator in self._accelerators:
+            self._idle.put(accelerator)
+
+        self._workers = _ThreadPool(len(self._accelerators))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.stop()
+
+    @property
+    def accelerators(self):
+        """
+        Accelerators of the pool.
+
+        Returns:
+            list: Accelerators.
+        """
+        return list(self._accelerators)
+
+    def process(self, file_in=None, file_out=None, info_dict=False,
+                **parameters):
+        """
+        Processes with the first available accelerator.
+
+        Args:
+            file_in (str or file-like object or bytes-like object): Input
+                file to process.
+            file_out (str or file-like object or bytes-like object): Output
+                processed file.
+            info_dict (bool): If True, returns a dict containing information
+                on process operation.
+            parameters (str or dict): Accelerator process specific parameters.
+
+        Returns:
+            dict: Result from process operation, depending used accelerator.
+            dict: Optional, only if "info_dict" is True.
+                AcceleratorClient response. "app" section contains "hedged"
+                set to True if job was hedged.
+
+        See "apyfal.Accelerator.process" for more information.
+        """
+        delay = self.hedge_delay
+        if delay is None or _srg.parse_url(file_in)[0] == 'stream':
+            # Not hedged: Not enough latencies samples or input stream
+            # that can't be read twice
+            accelerator = self._acquire()
+            try:
+                result, response = self._process_job(
+                    accelerator, file_in, file_out, parameters)
+            finally:
+                self._idle.put(accelerator)
+        else:
+            result, response = self._process_hedged(
+                file_in, file_out, parameters, delay)
+
+        return (result, response) if info_dict else result
+
+    def _acquire(self, block=True):
+        """
+        Get an idle accelerator.
+
+        Accelerators with an unavailable host are put back in idle
+        accelerators and are used only if no other accelerator is idle. In
+        this case, process fails fast or probes the host.
+
+        Args:
+            block (bool): If True, waits for an idle accelerator.
+
+        Returns:
+            apyfal.Accelerator or apyfal.client.AcceleratorClient: Accelerator.
+
+        Raises:
+            queue.Empty: No idle accelerator and "block" is False.
+        """
+        accelerator = self._idle.get(block)
+        skipped = []
+        try:
+            while not self._available(accelerator):
+                skipped.append(accelerator)
+                try:
+                    accelerator = self._idle.get_nowait()
+                except _Empty:
+                    # No available accelerator: Uses first one anyway
+                    accelerator = skipped.pop(0)
+                    break
+        finally:
+            for other in skipped:
+                self._idle.put(other)
+        return accelerator
+
+    @staticmethod
+    def _available(accelerator):
+        """
+        Returns True if accelerator host is not known as unavailable.
+
+        Args:
+            accelerator (apyfal.Accelerator or apyfal.client.AcceleratorClient):
+                Accelerator.
+
+        Returns:
+            bool: Availability.
+        """
+        health = getattr(
+            getattr(accelerator, 'client', accelerator), 'health', None)
+        return health is None or health.available
+
+    @property
+    def hedge_delay(self):
+        """
+        Time after which a job is hedged.
+
+        Returns:
+            float or None: Time in seconds. None if jobs are not hedged.
+        """
+        with self._latencies_lock:
+            latencies = sorted(self._latencies)
+        if (self._hedge_percentile is None or
+                len(latencies) < max(self._hedge_min_samples, 1)):
+            return None
+        index = int(_ceil(self._hedge_percentile / 100.0 * len(latencies)))
+        return latencies[min(max(index, 1), len(latencies)) - 1]
+
+    def _process_job(self, accelerator, file_in, file_out, parameters):
+        """
+        Processes a job with an accelerator and records its latency.
+
+        Latency is the wall clock time from process profiling if available,
+        else the process call duration.
+
+        Args:
+            accelerator (apyfal.Accelerator or apyfal.client.AcceleratorClient):
+                Accelerator.
+            file_in (str or file-like object or bytes-like object): Input
+                file to process.
+            file_out (str or file-like object or bytes-like object): Output
+                processed file.
+            parameters (dict): Accelerator process specific parameters.
+
+        Returns:
+            tuple: result, response.
+        """
+        start = _time()
+        result, response = accelerator.process(
+            file_in=file_in, file_out=file_out, info_dict=True, **parameters)
+        try:
+            latency = float(
+                response['app']['profiling']['wall-clock-time'])
+        except (KeyError, TypeError, ValueError):
+            latency = _time() - start
+        with self._latencies_lock:
+            self._latencies.append(latency)
+        return result, response
+
+    def _process_hedged(self, file_in, file_out, parameters, delay):
+        """
+        Processes a job, and hedges it if it takes longer than delay.
+
+        Args:
+            file_in (str or bytes-like object): Input file to process.
+            file_out (str or file-like object or bytes-like object): Output
+                processed file.
+            parameters (dict): Accelerator process specific parameters.
+            delay (float): Time in seconds after which job is hedged.
+
+        Returns:
+            tuple: result, response.
+        """
+        done = _Queue()
+        lock = _Lock()
+
+        # Running jobs tokens, with their accelerators. A job can only be
+        # cancelled while its token is in "running".
+        running = dict()
+        finished = []
+
+        def release(accelerator, output):
+            """Closes job output and puts accelerator back in idle"""
+            if output is not None:
+                output.close()
+            self._idle.put(accelerator)
+
+        def run_job(token, accelerator, output):
+            """Processes job and put outcome in "done" queue"""
+            try:
+                outcome = self._process_job(
+                    accelerator, file_in, output, parameters)
+                error = None
+            except Exception as exception:
+                outcome = None
+                error = exception
+
+            # Job not running anymore, its outcome is discarded if another
+            # job already completed
+            with lock:
+                del running[token]
+                discarded = bool(finished)
+            if discarded:
+                release(accelerator, output)
+            else:
+                done.put((accelerator, output, outcome, error))
+
+        def start_job(accelerator):
+            """Starts job in a new thread with its own output"""
+            output = (None if file_out is None else
+                      _SpooledTemporaryFile(max_size=64 * 1024 ** 2))
+            token = object()
+            running[token] = accelerator
+            thread = _Thread(
+                target=run_job, args=(token, accelerator, output))
+            thread.daemon = True
+            thread.start()
+
+        with lock:
+            start_job(self._acquire())
+        pending = 1
+        deadline = _time() + delay
+        hedged = False
+        while True:
+            # Waits for a job to complete, hedges job after delay
+            try:
+                accelerator, output, outcome, error = done.get(
+                    timeout=None if hedged else max(deadline - _time(), 0))
+            except _Empty:
+                try:
+                    other = self._acquire(block=False)
+                except _Empty:
+                    deadline = _time() + self.HEDGE_RETRY_DELAY
+                    continue
+                with lock:
+                    start_job(other)
+                pending += 1
+                hedged = True
+                continue
+            pending -= 1
+
+            # Job failed: Waits for other job if any
+            if error is not None:
+                release(accelerator, output)
+                if pending:
+                    continue
+                raise error
+
+            # Job succeeded: Cancels other jobs still running
+            with lock:
+                finished.append(accelerator)
+                for other in running.values():
+                    self._cancel(other)
+
+            # Returns result, then puts accelerator back in idle
+            try:
+                if output is not None:
+                    output.seek(0)
+                    _srg.copy(output, file_out)
+            finally:
+                release(accelerator, output)
+            result, response = outcome
+            if hedged:
+                response['app']['hedged'] = True
+            return result, response
+
+    @staticmethod
+    def _cancel(accelerator):
+        """
+        Cancels running process of an accelerator, if supported.
+
+        Args:
+            accelerator (apyfal.Accelerator or apyfal.client.AcceleratorClient):
+                Accelerator.
+        """
+        client = getattr(accelerator, 'client', accelerator)
+        try:
+            client.cancel()
+        except AttributeError:
+            pass
+
+    def process_sharded(self, file_in, file_out=None, splitter=None,
+                        merger=None, info_dict=False, max_pending=None,
+                        **parameters):
+        """
+        Splits input in shards processed in parallel by accelerators of the
+        pool, and merges outputs in input order.
+
+        Input is split and outputs are merged while processing: Only
+        "max_pending" shards are in memory at a time. Input and output
+        files on storage are streamed while processing, without local copy.
+
+        Accelerator must process records independently.
+
+        Args:
+            file_in (str or file-like object or bytes-like object): Input
+                file to process. Can be apyfal.storage URL, paths, file-like
+                object, object supporting the buffer protocol.
+            file_out (str or file-like object or bytes-like object): Output
+                processed file. Can be apyfal.storage URL, paths, file-like
+                object, writable object supporting the buffer protocol.
+            splitter (Splitter): Input splitter. Default to "RecordSplitter"
+                with 64 MB shards and new line delimiter.
+            merger (Merger): Output merger. Default to "ConcatMerger".
+            info_dict (bool): If True, returns information on each shard
+                process operation.
+            max_pending (int): Maximum number of shards split and not merged.
+                Default to twice the number of accelerators.
+            parameters (str or dict): Accelerator process specific parameters.
+
+        Returns:
+            list: Result from process operation of each shard, in input order.
+                Items are (result, response) tuples if "info_dict" is True.
+        """
+        splitter = splitter or RecordSplitter(64 * 1024 ** 2)
+        merger = merger or ConcatMerger()
+        max_pending = max_pending or 2 * len(self._accelerators)
+
+        with _srg._open_pipe(file_in, 'rb') as src:
+            if file_out is None:
+                return self._process_shards(
+                    splitter.split(src), None, merger, info_dict,
+                    max_pending, parameters)
+
+            with _srg._open_pipe(file_out, 'wb') as dst:
+                results = self._process_shards(
+                    splitter.split(src), dst, merger, info_dict,
+                    max_pending, parameters)
+                merger.close(dst)
+        return results
+
+    def _process_shards(self, shards, stream, merger, info_dict, max_pending,
+                        parameters):
+        """
+        Processes shards and merges outputs.
+
+        Args:
+            shards (iterable of bytes): Shards content.
+            stream (file-like object): Output binary stream. None if no
+                output.
+            merger (Merger): Output merger.
+            info_dict (bool): If True, returns information on each shard
+                process operation.
+            max_pending (int): Maximum number of shards split and not merged.
+            parameters (dict): Accelerator process specific parameters.
+
+        Returns:
+            list: Result from process operation of each shard.
+        """
+        results = []
+        pending = _deque()
+
+        def merge_next():
+            """Waits for oldest shard and merges its output"""
+            output, result = pending.popleft().get()
+            if stream is not None:
+                merger.write(output, stream)
+            results.append(result)
+
+        try:
+            for shard in shards:
+                if len(pending) >= max_pending:
+                    merge_next()
+                pending.append(self._workers.apply_async(
+                    self._process_shard, (shard, stream is not None,
+                                          info_dict, parameters)))
+            while pending:
+                merge_next()
+
+        finally:
+            # On error, waits for running shards before exiting
+            for result in pending:
+                result.wait()
+
+        return results
+
+    def _process_shard(self, shard, output, info_dict, parameters):
+        """
+        Processes a shard.
+
+        Args:
+            shard (bytes): Shard content.
+            output (bool): If True, returns output.
+            info_dict (bool): If True, returns information on process
+                operation.
+            parameters (dict): Accelerator process specific parameters.
+
+        Returns:
+            tuple: Shard output (bytearray or None), process result.
+        """
+        file_out = bytearray() if output else None
+        result = self.process(file_in=shard, file_out=file_out,
+                              info_dict=info_dict, **parameters)
+        return file_out, result
+
+    def stop(self, stop_mode=None):
+        """
+        Stops all accelerators of the pool.
+
+        Args:
+            stop_mode (str or int): Host stop mode. If not None, override
+                current "stop_mode" value. Only with "apyfal.Accelerator".
+        """
+        self._workers.terminate()
+        kwargs = dict(stop_mode=stop_mode) if stop_mode else dict()
+        for accelerator in self._accelerators:
+            try:
+                accelerator.stop(**kwargs)
+            except (AttributeError, _exc.AcceleratorException):
+                continue
@@ -17,27 +17,46 @@ Storage URL format:
     - "file://" or no scheme: Client local file.
     - "host://": Host local file (Available only on REST client).
     - "http://" or "https://": File access over HTTP.
+    - "memory://": In memory file of current process.
+
+    Objects supporting the buffer protocol (bytearray, memoryview,
+    NumPy arrays, ...) can also be used directly in place of URL. They are
+    read and written without intermediate copy. A bytearray destination is
+    resized to the content size.
 
     Some storage use advanced same, basic form is
     "StorageType://path" with StorageType the storage type
     defining this storage.
 
+Local cache:
+    Files copied from storage to local can be cached locally, repeated copies
+    of a same unmodified file are then served from the cache. Cache is
+    disabled by default, it can be enabled with "cache_dir" and "cache_size"
+    parameters of the "storage" configuration section or with the
+    "configure_cache" function.
+
 See target storage class documentation for more information.
 """
 
 from abc import abstractmethod as _abstractmethod
 from contextlib import contextmanager as _contextmanager
-from io import TextIOWrapper as _TextIOWrapper, open as _io_open
-from shutil import copy as _copy, copyfileobj as _copyfileobj
+from io import (
+    TextIOWrapper as _TextIOWrapper, open as _io_open,
+    RawIOBase as _RawIOBase, UnsupportedOperation as _UnsupportedOperation)
+from shutil import copyfileobj as _copyfileobj
+from os import getpid as _getpid, pipe as _pipe
 import tempfile as _tempfile
-
-from psutil import virtual_memory as _virtual_memory
+from threading import RLock as _RLock, Thread as _Thread
 
 import apyfal.configuration as _cfg
 import apyfal.exceptions as _exc
 import apyfal._utilities as _utl
+import apyfal.storage._checksum as _checksum
+import apyfal.storage._transfer as _transfer
+from apyfal.storage._transfer import byte_view as _byte_view
 
-__all__ = ['open', 'copy', 'parse_url', 'Storage']
+__all__ = ['open', 'copy', 'parse_url', 'configure_cache', 'presigned_url',
+           'Storage']
 
 # Storage name aliases
 _ALIASES = {
@@ -48,18 +67,73 @@ _ALIASES = {
 # Needs full URL as path
 _NEED_FULL_URL = ['http']
 
+# Local files and streams schemes
+_LOCAL_SCHEMES = ('file', 'stream', 'buffer')
+
+# Default pre-signed URL expiration in seconds
+_PRESIGNED_URL_EXPIRES = 3600
+
+# Default local cache maximum size in bytes
+_CACHE_MAX_SIZE = 10 * 1024 ** 3
+
+# Default number of threads concurrently using a storage
+_MAX_WORKERS = 10
+
+# Local storage files cache
+_LOCAL_CACHE = dict()
+
+# Local transfers settings
+_TRANSFER = dict()
+
 
 # Registered storage
 class _StorageHook(dict):
     """Hook of available storage
 
-    Storage are by default lazy instantiated on needs"""
+    Storage are by default lazy instantiated on needs.
+
+    Storage are instantiated only once, even if first used concurrently by
+    many threads. Storage instances and their connections are not shared
+    with forked processes: In a child process, storage are instantiated again
+    on first use with their registration parameters."""
+
+    def __init__(self):
+        dict.__init__(self)
+        self._parameters = dict()
+        self._reset()
+
+    def _reset(self):
+        """Clear storage instances, but keep registration parameters."""
+        dict.clear(self)
+        self._lock = _RLock()
+        self._pid = _getpid()
+
+    def __getitem__(self, storage_type):
+        # Forked process: Do not use parent storage
+        if self._pid != _getpid():
+            self._reset()
+        return dict.__getitem__(self, storage_type)
 
     def __missing__(self, storage_type):
         # Try to register if not already exists
-        if storage_type in ('file', 'host', 'stream'):
+        if storage_type in ('file', 'host', 'stream', 'buffer'):
             raise ValueError('Invalid storage_type "%s"' % storage_type)
-        return self.register(storage_type)
+
+        with self._lock:
+            # Already registered by another thread
+            storage = self.get(storage_type)
+            if storage is not None:
+                return storage
+
+            storage_type, parameters = self._parameters.get(
+                storage_type, (storage_type, dict()))
+            return self.register(storage_type, **parameters)
+
+    def clear(self):
+        """Clear all storage and registration parameters."""
+        with self._lock:
+            self._parameters.clear()
+            dict.clear(self)
 
     def register(self, storage_type, **parameters):
         """Register a new storage.
@@ -68,9 +142,13 @@ class _StorageHook(dict):
             storage_type (str): storage type
             parameters: storage parameters
         """
-        storage = Storage(storage_type=storage_type, **parameters)
-        self[storage.storage_id] = storage
-        return storage
+        with self._lock:
+            storage = Storage(storage_type=storage_type, **parameters)
+            self[storage.storage_id] = storage
+            if parameters:
+                self._parameters[storage.storage_id] = (
+                    storage_type, parameters)
+            return storage
 
 
 _STORAGE = _StorageHook()
@@ -87,6 +165,85 @@ def register(storage_type, **parameters):
     return _STORAGE.register(storage_type, **parameters)
 
 
+def configure_cache(directory=None, max_size=None):
+    """Configure local cache of storage files.
+
+    Args:
+        directory (str): Cache directory. If None, disable cache.
+        max_size (int): Maximum cache size in bytes. Default to 10 GB.
+    """
+    if directory:
+        from apyfal.storage._cache import StorageCache
+        _LOCAL_CACHE['cache'] = StorageCache(
+            directory, int(max_size or _CACHE_MAX_SIZE))
+    else:
+        _LOCAL_CACHE['cache'] = None
+
+
+def _get_local_cache():
+    """
+    Get local cache, configure it from configuration file on first call.
+
+    Returns:
+        apyfal.storage._cache.StorageCache or None: Cache, None if disabled.
+    """
+    try:
+        return _LOCAL_CACHE['cache']
+    except KeyError:
+        section = _cfg.create_configuration(None)['storage']
+        configure_cache(section['cache_dir'], section.get_literal('cache_size'))
+        return _LOCAL_CACHE['cache']
+
+
+def _get_transfer_settings():
+    """
+    Get local transfers settings, read them from configuration file on
+    first call.
+
+    Returns:
+        dict: Settings.
+    """
+    if not _TRANSFER:
+        section = _cfg.create_configuration(None)['storage']
+        _TRANSFER['buffer_size'] = int(
+            section.get_literal('buffer_size') or _transfer.BUFFER_SIZE)
+        _TRANSFER['checksum'] = section['checksum']
+    return _TRANSFER
+
+
+def _get_buffer_size():
+    """
+    Get size of buffers used for buffered copies.
+
+    Returns:
+        int: Buffer size in bytes.
+    """
+    return _get_transfer_settings()['buffer_size']
+
+
+def _get_checksum(checksum, local=False):
+    """
+    Get checksum object.
+
+    Args:
+        checksum (str or object or bool): Checksum algorithm name,
+            checksum object, None or False.
+        local (bool): If True, transfer is only between local files and
+            streams. In this case, the default checksum from configuration
+            is not used.
+
+    Returns:
+        object or None: Checksum object, None if no checksum.
+    """
+    if checksum is None and not local:
+        checksum = _get_transfer_settings()['checksum']
+    if not checksum:
+        return None
+    elif isinstance(checksum, str):
+        return _checksum.new(checksum)
+    return checksum
+
+
 def parse_url(url, host=True):
     """Return storage_type and path from URL.
 
@@ -94,8 +251,11 @@ def parse_url(url, host=True):
 
     If URL is a file-like object, returns "stream" as storage_type.
 
+    If URL is an object supporting the buffer protocol, returns "buffer" as
+    storage_type.
+
     Args:
-        url (str or file-like object): URL to parse
+        url (str or file-like object or bytes-like object): URL to parse
         host (bool): If True, Scheme is returned from
             host point of view: "host" scheme is converted
             to "file" scheme.
@@ -104,7 +264,12 @@ def parse_url(url, host=True):
         tuple of str: (storage_type, path)
     """
     if not isinstance(url, str):
-        return 'stream', url
+        # Objects supporting the buffer protocol
+        try:
+            memoryview(url)
+        except TypeError:
+            return 'stream', url
+        return 'buffer', url
 
     split_url = url.split('://', 1)
     try:
@@ -166,8 +331,10 @@ class _SpooledTemporaryFile(_tempfile.SpooledTemporaryFile):
 
     def __init__(self, *args, **kwargs):
         # Set max_size to 90% of available memory by default
-        kwargs.setdefault(
-            'max_size', int(_virtual_memory().available * 0.90))
+        if 'max_size' not in kwargs:
+            # Lazy import since "psutil" is slow to import
+            from psutil import virtual_memory
+            kwargs['max_size'] = int(virtual_memory().available * 0.90)
         _tempfile.SpooledTemporaryFile.__init__(self, *args, **kwargs)
 
     # Python 3.8 back port:
@@ -219,18 +386,231 @@ class _SpooledTemporaryFile(_tempfile.SpooledTemporaryFile):
             return True
 
 
+class _BufferIO(_RawIOBase):
+    """Binary stream over an object supporting the buffer protocol.
+
+    Data is read and written directly from and to the buffer. A bytearray is
+    resized on write, other buffers have a fixed size.
+
+    Args:
+        buffer (bytes-like object): Object supporting the buffer protocol.
+        mode (str): Access mode. 'r' or 'w'. In 'w' mode, a bytearray is
+            cleared.
+    """
+
+    def __init__(self, buffer, mode='rb'):
+        _RawIOBase.__init__(self)
+        self._buffer = buffer
+        self._resizable = isinstance(buffer, bytearray)
+        self._position = 0
+        if 'w' in mode and self._resizable:
+            del buffer[:]
+
+    def getbuffer(self):
+        """
+        Returns a view of the buffer content.
+
+        Returns:
+            memoryview: View.
+        """
+        return _byte_view(self._buffer)
+
+    def readable(self):
+        """
+        Returns True if the stream can be read from.
+
+        Returns:
+            bool: readable.
+        """
+        return True
+
+    def seekable(self):
+        """
+        Return True if the stream supports random access.
+
+        Returns:
+            bool: Seekable
+        """
+        return True
+
+    def writable(self):
+        """
+        Return True if the stream supports writing.
+
+        Returns:
+            bool: Writable
+        """
+        return self._resizable or not memoryview(self._buffer).readonly
+
+    def seek(self, offset, whence=0):
+        """
+        Change the stream position to the given byte offset.
+
+        Args:
+            offset (int): Offset relative to position indicated by whence.
+            whence (int): 0: start of stream, 1: current position,
+                2: end of stream.
+
+        Returns:
+            int: New position.
+        """
+        if whence == 1:
+            offset += self._position
+        elif whence == 2:
+            offset += len(self.getbuffer())
+        if offset < 0:
+            raise ValueError('Negative seek position %d' % offset)
+        self._position = offset
+        return offset
+
+    def tell(self):
+        """
+        Return the current stream position.
+
+        Returns:
+            int: Position.
+        """
+        return self._position
+
+    def truncate(self, size=None):
+        """
+        Resize the bytearray to the given size in bytes.
+
+        Args:
+            size (int): Size. Default to current position.
+
+        Returns:
+            int: New size.
+        """
+        if not self._resizable:
+            raise _UnsupportedOperation('Buffer can not be resized')
+        if size is None:
+            size = self._position
+        del self._buffer[size:]
+        return len(self._buffer)
+
+    def readinto(self, b):
+        """
+        Read bytes into a pre-allocated, writable bytes-like object b.
+
+        Args:
+            b (bytes-like object): buffer.
+
+        Returns:
+            int: number of bytes read
+        """
+        data = self.getbuffer()[self._position:]
+        size = min(len(b), len(data))
+        _byte_view(b)[:size] = data[:size]
+        self._position += size
+        return size
+
+    def readall(self):
+        """
+        Read until end of buffer.
+
+        Returns:
+            bytes: Data.
+        """
+        data = self.getbuffer()[self._position:].tobytes()
+        self._position += len(data)
+        return data
+
+    def write(self, b):
+        """
+        Write the given bytes-like object, b, to the buffer.
+
+        Args:
+            b (bytes-like object): Bytes to write.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        data = _byte_view(b)
+        start = self._position
+        end = start + len(data)
+
+        if self._resizable:
+            self._buffer[start:end] = data
+        else:
+            view = self.getbuffer()
+            if end > len(view):
+                raise _exc.StorageRuntimeException(
+                    'Buffer too small: %d bytes required, %d available' % (
+                        end, len(view)))
+            view[start:end] = data
+
+        self._position = end
+        return len(data)
+
+    def readfrom(self, stream):
+        """
+        Read stream content into the buffer, at current position.
+
+        Args:
+            stream (file-like object): Source binary stream.
+        """
+        # Resizable buffer: Appends by chunks, faster than pre-allocating
+        # buffer because memory is not initialized first.
+        readinto = getattr(stream, 'readinto', None)
+        if self._resizable or readinto is None:
+            _copyfileobj(stream, self, _get_buffer_size())
+            return
+
+        # Fixed size buffer: Reads directly in buffer
+        view = self.getbuffer()[self._position:]
+        read = 0
+        while read < len(view):
+            read_size = readinto(view[read:])
+            if not read_size:
+                break
+            read += read_size
+        self._position += read
+
+        # Checks all stream content was read
+        if read == len(view) and stream.read(1):
+            raise _exc.StorageRuntimeException(
+                'Buffer too small: %d bytes available' % len(view))
+
+
+def _copy_stream(src, dst):
+    """
+    Copy a stream to another stream.
+
+    Buffers are read and written without intermediate copy, copies between
+    files are performed in kernel space if possible.
+
+    Args:
+        src (file-like object): Source binary stream.
+        dst (file-like object): Destination binary stream.
+    """
+    if isinstance(src, _BufferIO):
+        # Writes buffer in one call
+        dst.write(src.getbuffer()[src.tell():])
+        src.seek(0, 2)
+
+    elif isinstance(dst, _BufferIO):
+        # Reads stream directly in buffer
+        dst.readfrom(src)
+
+    else:
+        _transfer.copy_stream(src, dst, _get_buffer_size())
+
+
 # Create apyfal.storage.open function, but keep reference to builtin open
 _stdlib_open = open
 
 
 @_contextmanager
-def open(url, mode="rb", encoding=None, errors=None, newline=None):
+def open(url, mode="rb", encoding=None, errors=None, newline=None,
+         checksum=None):
     """
     Open file and return a corresponding file object.
 
     Args:
-        url (str or file-like object): URL or file object to open.
-            Can be apyfal.storage URL, paths, file-like object.
+        url (str or file-like object or bytes-like object): URL or file
+            object to open. Can be apyfal.storage URL, paths, file-like
+            object, object supporting the buffer protocol.
         mode (str): Mode in which the file is opened
             (Works like standard library open mode).
             Support at least 'r' (read), 'w' (write), 'b' (binary),
@@ -240,6 +620,9 @@ def open(url, mode="rb", encoding=None, errors=None, newline=None):
         errors (str): with text mode, specifies how encoding and
             decoding errors are to be handled
         newline (str): Controls how universal newlines mode works.
+        checksum (str or object or bool): Computes checksum of read or
+            written data on the fly, see "copy" for more information.
+            To get the checksum value, a checksum object must be passed.
 
     Returns:
         file-like object: Opened object handle
@@ -250,23 +633,49 @@ def open(url, mode="rb", encoding=None, errors=None, newline=None):
         storage = _STORAGE[scheme]
 
     except ValueError:
+        checksum = _get_checksum(checksum, local=True)
+
         # Open file as stream
-        if scheme == 'file':
+        if scheme == 'file' and checksum is None:
             with _io_open(path, mode=mode, encoding=encoding,
                           errors=errors, newline=newline) as stream:
                 yield stream
+            return
 
-        # Open Stream
-        elif scheme == 'stream':
-            with _io_wrapper(path, mode, encoding,
+        # Open file, stream or buffer as binary stream
+        if scheme == 'file':
+            stream = _io_open(path, mode=mode.replace('t', '').replace(
+                'b', '') + 'b')
+        elif scheme == 'buffer':
+            stream = _BufferIO(path, mode)
+        else:
+            stream = path
+
+        # Computes checksum on the fly
+        if checksum is not None:
+            wrapper = (_checksum.ChecksumReader if 'r' in mode else
+                       _checksum.ChecksumWriter)(stream, checksum)
+        else:
+            wrapper = stream
+
+        try:
+            with _io_wrapper(wrapper, mode, encoding,
                              errors, newline) as wrapped:
                 yield wrapped
+        finally:
+            if scheme == 'file':
+                stream.close()
 
     # Open storage as stream
     else:
+        checksum = _get_checksum(checksum)
         with _SpooledTemporaryFile() as stream:
             if 'r' in mode:
-                storage.copy_to_stream(path, stream)
+                if checksum is None:
+                    storage.copy_to_stream(path, stream)
+                else:
+                    _copy_from_storage_checksum(
+                        storage, path, stream, checksum, url)
                 stream.seek(0)
 
             with _io_wrapper(stream, mode, encoding,
@@ -275,42 +684,137 @@ def open(url, mode="rb", encoding=None, errors=None, newline=None):
 
             if 'w' in mode:
                 stream.seek(0)
-                storage.copy_from_stream(stream, path)
+                if checksum is None:
+                    storage.copy_from_stream(stream, path)
+                else:
+                    _copy_to_storage_checksum(
+                        stream, storage, path, checksum, url)
+
+
+@_contextmanager
+def _open_pipe(url, mode="rb"):
+    """
+    Open file as a binary stream, without local copy of storage files.
 
+    Unlike "open", storage files content is streamed from or to storage by
+    a background thread through a pipe while the stream is read or written.
+    The stream is not seekable. Other files are opened with "open".
 
-def copy(source, destination):
+    Args:
+        url (str or file-like object or bytes-like object): URL or file
+            object to open. Can be apyfal.storage URL, paths, file-like
+            object, object supporting the buffer protocol.
+        mode (str): "rb" or "wb".
+
+    Returns:
+        file-like object: Opened object handle
+    """
+    scheme, path = parse_url(url)
+    try:
+        storage = _STORAGE[scheme]
+    except ValueError:
+        with open(url, mode) as stream:
+            yield stream
+        return
+
+    read_fd, write_fd = _pipe()
+    reader = _io_open(read_fd, 'rb')
+    writer = _io_open(write_fd, 'wb')
+    local, remote = (reader, writer) if 'r' in mode else (writer, reader)
+    errors = []
+
+    def transfer():
+        """Transfers content between storage and pipe"""
+        try:
+            if 'r' in mode:
+                storage.copy_to_stream(path, remote)
+            else:
+                storage.copy_from_stream(remote, path)
+        except Exception as exception:
+            errors.append(exception)
+        finally:
+            remote.close()
+
+    thread = _Thread(target=transfer)
+    thread.daemon = True
+    thread.start()
+
+    try:
+        try:
+            yield local
+        finally:
+            local.close()
+            thread.join()
+
+    # Broken pipe: Raises storage error instead
+    except (IOError, OSError):
+        if errors:
+            raise errors[0]
+        raise
+
+    if errors:
+        raise errors[0]
+
+
+def copy(source, destination, checksum=None):
     """
     Copy a file from source to destination.
 
     Args:
-        source (str or file-like object): Source URL.
-            Can be apyfal.storage URL, paths, file-like object.
-        destination (str or file-like object): Destination URL.
-            Can be apyfal.storage URL, paths, file-like object.
+        source (str or file-like object or bytes-like object): Source URL.
+            Can be apyfal.storage URL, paths, file-like object, object
+            supporting the buffer protocol.
+        destination (str or file-like object or bytes-like object):
+            Destination URL. Can be apyfal.storage URL, paths, file-like
+            object, object supporting the buffer protocol.
+        checksum (str or object or bool): Computes checksum of copied data
+            on the fly. Can be an algorithm name ("md5", "sha256", "crc32",
+            "crc32c", "xxh64", ...) or a "hashlib" like object. MD5 is
+            verified against the MD5 provided by storage if available.
+            If None, use the "checksum" value of the "storage" configuration
+            section for copies involving a storage. If False, no checksum.
+            Copies between storage are performed through this machine
+            when a checksum is computed.
+
+    Returns:
+        str or None: Checksum hexadecimal digest if computed.
     """
 
     # Parses URLs
     src_scheme, src_path = parse_url(source)
     dst_scheme, dst_path = parse_url(destination)
 
+    # Computes checksum on the fly
+    checksum = _get_checksum(checksum, local=(
+        src_scheme in _LOCAL_SCHEMES and dst_scheme in _LOCAL_SCHEMES))
+    if checksum is not None:
+        _copy_checksum(source, destination, checksum)
+        return checksum.hexdigest()
+
+    # Buffers are accessed as streams
+    if src_scheme == 'buffer':
+        src_scheme, src_path = 'stream', _BufferIO(src_path)
+    if dst_scheme == 'buffer':
+        dst_scheme, dst_path = 'stream', _BufferIO(dst_path, 'wb')
+
     # Performs operation
     if src_scheme == 'file' and dst_scheme == 'file':
         # Local to local
-        _copy(src_path, dst_path)
+        _transfer.copy_file(src_path, dst_path, _get_buffer_size())
 
     elif src_scheme == 'stream' and dst_scheme == 'stream':
         # Stream to stream
-        _copyfileobj(src_path, dst_path)
+        _copy_stream(src_path, dst_path)
 
     elif src_scheme == 'stream' and dst_scheme == 'file':
         # Stream to local
         with _stdlib_open(dst_path, 'wb') as dst_file:
-            _copyfileobj(src_path, dst_file)
+            _copy_stream(src_path, dst_file)
 
     elif src_scheme == 'file' and dst_scheme == 'stream':
         # Local to stream
         with _stdlib_open(src_path, 'rb') as src_file:
-            _copyfileobj(src_file, dst_path)
+            _copy_stream(src_file, dst_path)
 
     elif src_scheme == 'stream':
         # Stream to storage
@@ -326,7 +830,11 @@ def copy(source, destination):
 
     elif dst_scheme == 'file':
         # Storage to local
-        _STORAGE[src_scheme].copy_to_local(src_path, dst_path)
+        cache = _get_local_cache()
+        if cache is None:
+            _STORAGE[src_scheme].copy_to_local(src_path, dst_path)
+        else:
+            cache.copy_to_local(_STORAGE[src_scheme], src_path, dst_path)
 
     else:
         # Storage to storage
@@ -334,7 +842,119 @@ def copy(source, destination):
             _STORAGE[src_scheme], src_path, dst_path)
 
 
-class Storage(_utl.ABC):
+def _copy_to_tmp(source, local_path, checksum=None):
+    """
+    Copy a file to a local temporary file that is only read, then removed.
+
+    If source is in local cache, the cached file may be hard linked to
+    the temporary file instead of being copied.
+
+    Args:
+        source (str): Source URL.
+        local_path (str): Local temporary file path.
+        checksum (str or object or bool): Computes checksum of copied data
+            on the fly. See "copy".
+    """
+    src_scheme, src_path = parse_url(source)
+    cache = None if src_scheme in _LOCAL_SCHEMES else _get_local_cache()
+    checksum = _get_checksum(checksum, local=src_scheme in _LOCAL_SCHEMES)
+    if cache is None or checksum is not None:
+        copy(source, local_path, checksum=checksum or False)
+    else:
+        cache.copy_to_local(
+            _STORAGE[src_scheme], src_path, local_path, link=True)
+
+
+def _copy_checksum(source, destination, checksum):
+    """
+    Copy a file from source to destination and computes checksum on the fly.
+
+    Args:
+        source (str or file-like object or bytes-like object): Source URL.
+        destination (str or file-like object or bytes-like object):
+            Destination URL.
+        checksum (object): Checksum object.
+    """
+    src_scheme, src_path = parse_url(source)
+    dst_scheme, dst_path = parse_url(destination)
+
+    # To storage: Computes checksum of data read
+    if dst_scheme not in _LOCAL_SCHEMES:
+        with open(source, 'rb', checksum=False) as stream:
+            _copy_to_storage_checksum(
+                stream, _STORAGE[dst_scheme], dst_path, checksum,
+                destination)
+
+    # From storage: Computes checksum of data written
+    elif src_scheme not in _LOCAL_SCHEMES:
+        with open(destination, 'wb', checksum=False) as stream:
+            _copy_from_storage_checksum(
+                _STORAGE[src_scheme], src_path, stream, checksum, source)
+
+    # Local: Computes checksum of data read
+    else:
+        with open(source, 'rb', checksum=False) as stream:
+            copy(_checksum.ChecksumReader(stream, checksum), destination,
+                 checksum=False)
+
+
+def _copy_from_storage_checksum(storage, path, stream, checksum, url):
+    """
+    Copy a file from storage to binary stream, computes checksum on the fly
+    and verifies it.
+
+    Args:
+        storage (Storage): Source storage.
+        path (str): Source path.
+        stream (file-like object): Destination binary stream.
+        checksum (object): Checksum object.
+        url (str): Source URL.
+    """
+    metadata = storage.get_metadata(path)
+    storage.copy_to_stream(path, _checksum.ChecksumWriter(stream, checksum))
+    _checksum.verify(checksum, metadata, url)
+
+
+def _copy_to_storage_checksum(stream, storage, path, checksum, url):
+    """
+    Copy a file to storage from binary stream, computes checksum on the fly
+    and verifies it.
+
+    Args:
+        stream (file-like object): Source binary stream.
+        storage (Storage): Destination storage.
+        path (str): Destination path.
+        checksum (object): Checksum object.
+        url (str): Destination URL.
+    """
+    storage.copy_from_stream(
+        _checksum.ChecksumReader(stream, checksum), path)
+    if storage.SUPPORTS_CHECKSUM_METADATA:
+        _checksum.verify(checksum, storage.get_metadata(path), url)
+
+
+def presigned_url(url, mode='rb', expires=None):
+    """
+    Get a pre-signed HTTP URL giving temporary access to a file
+    without storage credentials.
+
+    Args:
+        url (str): apyfal.storage URL of the file.
+        mode (str): Access mode. 'r' or 'w'.
+        expires (int): Pre-signed URL validity duration in seconds.
+            Default to 3600.
+
+    Returns:
+        str or None: Pre-signed URL. None if not supported by storage.
+    """
+    scheme, path = parse_url(url)
+    if scheme in ('file', 'stream', 'buffer', 'host', 'http', 'memory'):
+        return None
+    return _STORAGE[scheme].get_presigned_url(
+        path, mode, int(expires or _PRESIGNED_URL_EXPIRES))
+
+
+class Storage(_utl.FactoryABC):
     """Base storage class
 
     This is also a factory which instantiate host subclass related to
@@ -346,6 +966,8 @@ class Storage(_utl.ABC):
             Can be Configuration instance, apyfal.storage URL, paths, file-like object.
             If not set, will search it in current working directory, in current
             user "home" folder. If none found, will use default configuration values.
+        max_workers (int): Number of threads that may use the storage
+            concurrently. Storage connection pools are sized from this value.
     """
     #: Storage type name (str), must be the same as expected "storage_type" argument value
     NAME = None
@@ -353,6 +975,10 @@ class Storage(_utl.ABC):
     #: Link to Storage documentation or website
     DOC_URL = ''
 
+    #: If True, "get_metadata" of a written file provides its MD5, used to
+    #: verify checksum of uploaded data
+    SUPPORTS_CHECKSUM_METADATA = False
+
     def __new__(cls, *args, **kwargs):
         # If call from a subclass, instantiate this subclass directly
         if cls is not Storage:
@@ -366,9 +992,13 @@ class Storage(_utl.ABC):
         return _utl.factory(
             cls, storage_type, 'storage_type', _exc.StorageConfigurationException)
 
-    def __init__(self, storage_type=None, config=None, **_):
+    def __init__(self, storage_type=None, config=None, max_workers=None,
+                 **_):
         self._storage_type = storage_type or self.NAME
         self._config = _cfg.create_configuration(config)
+        self._max_workers = int(
+            max_workers or self._config.compiled['storage.%s' % (
+                self.NAME or '').lower()]['max_workers'] or _MAX_WORKERS)
 
     @property
     def storage_id(self):
@@ -378,6 +1008,33 @@ class Storage(_utl.ABC):
             str: Storage ID."""
         return self.NAME.lower()
 
+    def get_metadata(self, path):
+        """
+        Get file metadata used to check if file was modified.
+
+        Args:
+            path (str): File path.
+
+        Returns:
+            dict or None: Metadata with "etag", "last_modified", "size",
+                "md5" keys (None values if unknown). None if not supported by
+                storage.
+        """
+
+    def get_presigned_url(self, path, mode, expires):
+        """
+        Get a pre-signed HTTP URL giving temporary access to a file
+        without storage credentials.
+
+        Args:
+            path (str): File path.
+            mode (str): Access mode. 'r' or 'w'.
+            expires (int): Pre-signed URL validity duration in seconds.
+
+        Returns:
+            str or None: Pre-signed URL. None if not supported by storage.
+        """
+
     def copy_to_local(self, source, local_path):
         """
         Copy a file from storage to local.
@@ -441,6 +1098,18 @@ class Storage(_utl.ABC):
         # Performs copy
         return copy_from_storage(storage, source, destination)
 
+    def _copy_from_memory(self, storage, source, destination):
+        """
+        Copy from memory storage to this one without temporary file.
+
+        Args:
+            storage (apyfal.storage.memory.MemoryStorage): Storage from where
+                copy.
+            source (str): Source path
+            destination (str): Destination path
+        """
+        self.copy_from_stream(_BufferIO(storage.get(source)), destination)
+
     def _copy_from_temporary(self, storage, source, destination):
         """
         Copy from another storage to this one using spooled temporary file on
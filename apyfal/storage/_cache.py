@@ -0,0 +1,141 @@
+# coding=utf-8
+"""Local cache of storage files"""
+
+from hashlib import sha256 as _sha256
+import os as _os
+import os.path as _os_path
+from threading import Lock as _Lock
+from uuid import uuid4 as _uuid
+
+import apyfal._utilities as _utl
+import apyfal.storage as _srg
+from apyfal.storage._transfer import (
+    link_or_copy as _link_or_copy, copy_file as _copy_file)
+
+
+class StorageCache(object):
+    """Local read-through cache of storage files.
+
+    Files are stored by a key computed from their URL and their
+    metadata (ETag, Last-Modified, size). A modified remote file
+    gets a new key and is downloaded again, the outdated entry is
+    evicted later. Least recently used files are evicted once
+    the cache size exceed "max_size".
+
+    Cached files are read-only. Destination files are writable copies,
+    cached files are only hard linked to temporary files that are never
+    modified (See "link" argument of "copy_to_local").
+
+    Args:
+        directory (str): Cache directory.
+        max_size (int): Maximum cache size in bytes.
+    """
+
+    def __init__(self, directory, max_size):
+        self._directory = _os_path.abspath(_os_path.expanduser(directory))
+        self._max_size = max_size
+        self._lock = _Lock()
+        _utl.makedirs(self._directory, exist_ok=True)
+
+    @property
+    def directory(self):
+        """
+        Cache directory.
+
+        Returns:
+            str: path.
+        """
+        return self._directory
+
+    def copy_to_local(self, storage, source, local_path, link=False):
+        """
+        Copy a file from storage to local using cache.
+
+        Args:
+            storage (apyfal.storage.Storage): Storage containing source.
+            source (str): Source path on storage.
+            local_path (str): Local destination path.
+            link (bool): If True, hard link cached file to destination when
+                possible. Destination shares the cache entry, and must never
+                be modified or have its permissions changed.
+        """
+        # Get cache entry
+        metadata = storage.get_metadata(source)
+        if not metadata or (metadata.get('size') or 0) > self._max_size:
+            # Not cacheable file
+            return storage.copy_to_local(source, local_path)
+
+        cached_path = _os_path.join(
+            self._directory, self._get_key(storage, source, metadata))
+
+        # Cache miss: Download file in cache
+        if not _os_path.isfile(cached_path):
+            tmp_path = '%s.%s' % (cached_path, _uuid())
+            try:
+                storage.copy_to_local(source, tmp_path)
+                _os.chmod(tmp_path, 0o444)
+                _os.rename(tmp_path, cached_path)
+            finally:
+                if _os_path.exists(tmp_path):
+                    _os.remove(tmp_path)
+            self._evict()
+
+        # Cache hit: Mark file as recently used
+        else:
+            _os.utime(cached_path, None)
+
+        # Link cached file to destination, or copy it as a new writable file
+        if link:
+            _link_or_copy(cached_path, local_path)
+        else:
+            _copy_file(cached_path, local_path, _srg._get_buffer_size(),
+                       copy_mode=False)
+
+    @staticmethod
+    def _get_key(storage, source, metadata):
+        """
+        Get cache key of a file.
+
+        Args:
+            storage (apyfal.storage.Storage): Storage containing source.
+            source (str): Source path on storage.
+            metadata (dict): File metadata.
+
+        Returns:
+            str: key
+        """
+        return _sha256(repr((
+            storage.storage_id, source, metadata.get('etag'),
+            metadata.get('last_modified'), metadata.get('size'),
+            metadata.get('md5'))
+        ).encode()).hexdigest()
+
+    def _evict(self):
+        """
+        Remove least recently used files until cache size
+        is lower than "max_size".
+        """
+        with self._lock:
+            # List cached files, older first
+            entries = []
+            for name in _os.listdir(self._directory):
+                # Skip temporary files
+                if '.' in name:
+                    continue
+                try:
+                    stat = _os.stat(_os_path.join(self._directory, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+            entries.sort()
+
+            # Evict older files
+            size = sum(entry[1] for entry in entries)
+            for _, file_size, name in entries:
+                if size <= self._max_size:
+                    break
+                try:
+                    _os.remove(_os_path.join(self._directory, name))
+                except OSError:
+                    continue
+                size -= file_size
@@ -0,0 +1,338 @@
+# coding=utf-8
+"""Checksums computed on the fly on transferred data"""
+
+from base64 import b64decode as _b64decode
+from binascii import hexlify as _hexlify
+import hashlib as _hashlib
+from io import RawIOBase as _RawIOBase
+from re import compile as _compile
+from struct import pack as _pack
+from zlib import crc32 as _crc32
+
+try:
+    from crc32c import crc32c as _crc32c
+except ImportError:
+    _crc32c = None
+
+try:
+    import xxhash as _xxhash
+except ImportError:
+    _xxhash = None
+
+import apyfal.exceptions as _exc
+from apyfal.storage._transfer import byte_view as _byte_view
+
+# MD5 hexadecimal digest
+_MD5_HEX = _compile('^[0-9a-f]{32}$')
+
+
+class _CRC(object):
+    """CRC with "hashlib" like interface.
+
+    Args:
+        name (str): Algorithm name.
+        function (callable): CRC function with (data, value) arguments.
+    """
+
+    def __init__(self, name, function):
+        self.name = name
+        self._function = function
+        self._value = 0
+
+    def update(self, data):
+        """
+        Update CRC with data.
+
+        Args:
+            data (bytes-like object): Data.
+        """
+        self._value = self._function(data, self._value) & 0xffffffff
+
+    def digest(self):
+        """
+        Return CRC.
+
+        Returns:
+            bytes: CRC as big-endian 32 bits integer.
+        """
+        return _pack('>I', self._value)
+
+    def hexdigest(self):
+        """
+        Return CRC as hexadecimal string.
+
+        Returns:
+            str: CRC.
+        """
+        return '%08x' % self._value
+
+
+def new(name):
+    """
+    Create a checksum object.
+
+    Args:
+        name (str): Algorithm name: "md5", "sha256" (Or any "hashlib"
+            algorithm), "crc32", "crc32c" (Requires "crc32c" package),
+            "xxh64" (Or any "xxhash" package algorithm).
+
+    Returns:
+        object: Checksum with "hashlib" like "update", "digest" and
+            "hexdigest" methods.
+    """
+    name = name.lower()
+    if name == 'crc32':
+        return _CRC(name, _crc32)
+
+    elif name == 'crc32c':
+        if _crc32c is None:
+            raise _exc.StorageConfigurationException(
+                '"crc32c" package is required for "crc32c" checksum')
+        return _CRC(name, _crc32c)
+
+    elif name.startswith('xxh'):
+        if _xxhash is None:
+            raise _exc.StorageConfigurationException(
+                '"xxhash" package is required for "%s" checksum' % name)
+        try:
+            return getattr(_xxhash, name)()
+        except AttributeError:
+            pass
+
+    else:
+        try:
+            return _hashlib.new(name)
+        except ValueError:
+            pass
+
+    raise _exc.StorageConfigurationException(
+        gen_msg=('no_find_named', 'checksum algorithm', name))
+
+
+def md5_from_etag(etag):
+    """
+    Get MD5 from an ETag, if ETag is an MD5 hexadecimal digest.
+
+    Args:
+        etag (str): ETag.
+
+    Returns:
+        str or None: MD5 hexadecimal digest.
+    """
+    etag = (etag or '').strip('"').lower()
+    return etag if _MD5_HEX.match(etag) else None
+
+
+def md5_from_content_md5(content_md5):
+    """
+    Get MD5 from a "Content-MD5" HTTP header.
+
+    Args:
+        content_md5 (str): Base64 encoded MD5.
+
+    Returns:
+        str or None: MD5 hexadecimal digest.
+    """
+    try:
+        return md5_from_etag(_hexlify(_b64decode(content_md5)).decode())
+    except (TypeError, ValueError):
+        return None
+
+
+def verify(checksum, metadata, url):
+    """
+    Verify a MD5 checksum against the MD5 provided by storage.
+
+    Args:
+        checksum (object): Checksum object.
+        metadata (dict): Storage file metadata. If it does not contain a
+            "md5" value, or checksum is not MD5, nothing is verified.
+        url (str): File URL.
+
+    Raises:
+        apyfal.exceptions.StorageRuntimeException: Checksum mismatch.
+    """
+    expected = (metadata or dict()).get('md5')
+    if (expected and getattr(checksum, 'name', None) == 'md5' and
+            checksum.hexdigest() != expected):
+        raise _exc.StorageRuntimeException(
+            'Checksum mismatch for "%s": MD5 is %s, %s expected' % (
+                url, checksum.hexdigest(), expected))
+
+
+class ChecksumReader(_RawIOBase):
+    """Readable stream wrapper updating a checksum with read data.
+
+    Data read again after a backward seek is not added again to the checksum.
+
+    Args:
+        stream (file-like object): Binary stream.
+        checksum (object): Checksum object.
+    """
+
+    def __init__(self, stream, checksum):
+        _RawIOBase.__init__(self)
+        self._stream = stream
+        self._checksum = checksum
+        try:
+            self._position = stream.tell() or 0
+        except (AttributeError, IOError, OSError, ValueError):
+            self._position = 0
+        self._hashed = self._position
+
+    def readable(self):
+        """
+        Returns True if the stream can be read from.
+
+        Returns:
+            bool: readable.
+        """
+        return True
+
+    def seekable(self):
+        """
+        Return True if the stream supports random access.
+
+        Returns:
+            bool: Seekable
+        """
+        try:
+            return self._stream.seekable()
+        except AttributeError:
+            return hasattr(self._stream, 'seek')
+
+    def seek(self, offset, whence=0):
+        """
+        Change the stream position to the given byte offset.
+
+        Args:
+            offset (int): Offset relative to position indicated by whence.
+            whence (int): 0: start of stream, 1: current position,
+                2: end of stream.
+
+        Returns:
+            int: New position.
+        """
+        self._stream.seek(offset, whence)
+        self._position = self._stream.tell()
+        return self._position
+
+    def tell(self):
+        """
+        Return the current stream position.
+
+        Returns:
+            int: Position.
+        """
+        return self._position
+
+    def fileno(self):
+        """
+        Return the underlying file descriptor.
+
+        Returns:
+            int: File descriptor.
+        """
+        return self._stream.fileno()
+
+    def read(self, size=-1):
+        """
+        Read and return up to size bytes.
+
+        Args:
+            size (int): Number of bytes to read. -1 to read until end of
+                stream.
+
+        Returns:
+            bytes: Data.
+        """
+        data = (self._stream.read(size) if size is not None and size >= 0
+                else self._stream.read())
+        self._update(data)
+        return data
+
+    def readinto(self, b):
+        """
+        Read bytes into a pre-allocated, writable bytes-like object b.
+
+        Args:
+            b (bytes-like object): buffer.
+
+        Returns:
+            int: number of bytes read
+        """
+        try:
+            size = self._stream.readinto(b)
+        except AttributeError:
+            data = self._stream.read(len(b))
+            size = len(data)
+            _byte_view(b)[:size] = data
+        self._update(_byte_view(b)[:size])
+        return size
+
+    def _update(self, data):
+        """
+        Update checksum with read data.
+
+        Args:
+            data (bytes-like object): Data read at current position.
+        """
+        start = self._position
+        end = start + len(data)
+        if start > self._hashed:
+            raise _exc.StorageRuntimeException(
+                'Unable to compute checksum: Stream not read sequentially')
+        elif end > self._hashed:
+            self._checksum.update(
+                data if start == self._hashed else
+                _byte_view(data)[self._hashed - start:])
+            self._hashed = end
+        self._position = end
+
+
+class ChecksumWriter(_RawIOBase):
+    """Writable stream wrapper updating a checksum with written data.
+
+    Stream is not seekable to ensure data is written sequentially.
+
+    Args:
+        stream (file-like object): Binary stream.
+        checksum (object): Checksum object.
+    """
+
+    def __init__(self, stream, checksum):
+        _RawIOBase.__init__(self)
+        self._stream = stream
+        self._checksum = checksum
+
+    def writable(self):
+        """
+        Return True if the stream supports writing.
+
+        Returns:
+            bool: Writable
+        """
+        return True
+
+    def write(self, b):
+        """
+        Write the given bytes-like object, b.
+
+        Args:
+            b (bytes-like object): Bytes to write.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        view = _byte_view(b)
+        size = self._stream.write(b)
+        if size is None:
+            size = len(view)
+        self._checksum.update(view if size == len(view) else view[:size])
+        return size
+
+    def flush(self):
+        """
+        Flush the write buffers of the stream.
+        """
+        self._stream.flush()
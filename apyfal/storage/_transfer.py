@@ -0,0 +1,221 @@
+# coding=utf-8
+"""Local files and streams transfers with minimal copies"""
+
+from io import (
+    FileIO as _FileIO, BufferedReader as _BufferedReader,
+    BufferedWriter as _BufferedWriter, BufferedRandom as _BufferedRandom)
+import os as _os
+import os.path as _os_path
+from shutil import copyfileobj as _copyfileobj, copymode as _copymode
+from stat import S_ISREG as _S_ISREG
+
+try:
+    from fcntl import ioctl as _ioctl
+except ImportError:
+    # Not available on Windows
+    _ioctl = None
+
+#: Default size in bytes of buffer used for buffered copies
+BUFFER_SIZE = 1024 ** 2
+
+# Linux "FICLONE" ioctl request: Copy-on-write clone of a file
+_FICLONE = 0x40049409
+
+# Maximum size in bytes copied by a single in kernel copy call
+_MAX_KERNEL_COPY = 1024 ** 3
+
+# Streams backed by an OS file descriptor
+_FD_STREAMS = (_FileIO, _BufferedReader, _BufferedWriter, _BufferedRandom)
+
+
+def byte_view(buffer):
+    """
+    Returns a view of a buffer as a flat sequence of bytes.
+
+    Args:
+        buffer (bytes-like object): Object supporting the buffer protocol.
+
+    Returns:
+        memoryview: View.
+    """
+    view = memoryview(buffer)
+    try:
+        return view.cast('B')
+    except AttributeError:
+        # Python 2: "memoryview.cast" not available
+        return view
+
+
+def _copy_file_range(src_fd, dst_fd, offset, count):
+    """
+    In kernel copy with "os.copy_file_range".
+
+    Args:
+        src_fd (int): Source file descriptor.
+        dst_fd (int): Destination file descriptor.
+        offset (int): Source offset.
+        count (int): Number of bytes to copy.
+
+    Returns:
+        int: Number of bytes copied.
+    """
+    return _os.copy_file_range(src_fd, dst_fd, count, offset)
+
+
+def _sendfile(src_fd, dst_fd, offset, count):
+    """
+    In kernel copy with "os.sendfile".
+
+    Args:
+        src_fd (int): Source file descriptor.
+        dst_fd (int): Destination file descriptor.
+        offset (int): Source offset.
+        count (int): Number of bytes to copy.
+
+    Returns:
+        int: Number of bytes copied.
+    """
+    return _os.sendfile(dst_fd, src_fd, offset, count)
+
+
+# In kernel copy functions available on this platform, in preference order
+_KERNEL_COPY = tuple(function for name, function in (
+    ('copy_file_range', _copy_file_range), ('sendfile', _sendfile))
+    if hasattr(_os, name))
+
+
+def link_or_copy(src, dst, buffer_size=BUFFER_SIZE):
+    """
+    Hard link a file, or copy it if not possible (Like if source and
+    destination are not on the same file system).
+
+    Destination may share source content, and must not be modified in place.
+
+    Args:
+        src (str): Source path.
+        dst (str): Destination path.
+        buffer_size (int): Buffer size in bytes if buffered copy is required.
+    """
+    try:
+        _os.link(src, dst)
+    except (OSError, AttributeError):
+        copy_file(src, dst, buffer_size)
+
+
+def copy_file(src, dst, buffer_size=BUFFER_SIZE, copy_mode=True):
+    """
+    Copy a file and its permission bits, like "shutil.copy".
+
+    Uses, by order of preference: Copy-on-write clone ("reflink") if
+    supported by file system, in kernel copy ("copy_file_range", "sendfile"),
+    buffered copy.
+
+    Args:
+        src (str): Source path.
+        dst (str): Destination path or directory.
+        buffer_size (int): Buffer size in bytes if buffered copy is required.
+        copy_mode (bool): If False, does not copy permission bits, a new
+            destination file gets default permissions.
+
+    Returns:
+        str: Destination path.
+    """
+    if _os_path.isdir(dst):
+        dst = _os_path.join(dst, _os_path.basename(src))
+
+    with open(src, 'rb') as src_file:
+        with open(dst, 'wb') as dst_file:
+            if not _reflink(src_file, dst_file):
+                copy_stream(src_file, dst_file, buffer_size)
+
+    if copy_mode:
+        _copymode(src, dst)
+    return dst
+
+
+def _reflink(src, dst):
+    """
+    Copy-on-write clone of a file.
+
+    Args:
+        src (file-like object): Source file.
+        dst (file-like object): Destination empty file.
+
+    Returns:
+        bool: True if cloned, False if not supported.
+    """
+    if _ioctl is None:
+        return False
+    try:
+        _ioctl(dst.fileno(), _FICLONE, src.fileno())
+    except (OSError, IOError):
+        return False
+    return True
+
+
+def copy_stream(src, dst, buffer_size=BUFFER_SIZE):
+    """
+    Copy a stream remaining content to another stream.
+
+    Uses in kernel copy between streams backed by OS files, else buffered
+    copy.
+
+    Args:
+        src (file-like object): Source binary stream.
+        dst (file-like object): Destination binary stream.
+        buffer_size (int): Buffer size in bytes if buffered copy is required.
+    """
+    if isinstance(src, _FD_STREAMS) and isinstance(dst, _FD_STREAMS):
+        _kernel_copy(src, dst)
+
+    # Copies anything remaining
+    _copyfileobj(src, dst, buffer_size)
+
+
+def _kernel_copy(src, dst):
+    """
+    Copy a regular file remaining content to another file descriptor in
+    kernel space.
+
+    Copy stops on first error, stream positions are updated to allow
+    remaining content to be copied with another method.
+
+    Args:
+        src (file-like object): Source binary stream.
+        dst (file-like object): Destination binary stream.
+    """
+    # Source must be a regular file
+    src_fd = src.fileno()
+    src_stat = _os.fstat(src_fd)
+    if not _S_ISREG(src_stat.st_mode) or not _KERNEL_COPY:
+        return
+
+    # Synchronizes Python buffers with OS files positions
+    offset = src.tell()
+    size = src_stat.st_size - offset
+    dst.flush()
+    dst_seekable = dst.seekable()
+    if dst_seekable:
+        dst_offset = dst.seek(dst.tell())
+    dst_fd = dst.fileno()
+
+    # Copies
+    copied = 0
+    for copy_function in _KERNEL_COPY:
+        try:
+            while copied < size:
+                count = copy_function(src_fd, dst_fd, offset + copied, min(
+                    size - copied, _MAX_KERNEL_COPY))
+                if not count:
+                    break
+                copied += count
+            break
+
+        # Not supported: Tries next function from current offset
+        except OSError:
+            continue
+
+    # Updates streams positions
+    src.seek(offset + copied)
+    if dst_seekable:
+        dst.seek(dst_offset + copied)
@@ -1,10 +1,22 @@
 # coding=utf-8
 """Access files over HTTP"""
 
-from shutil import copyfileobj as _copyfileobj
+try:
+    # Python 3
+    from urllib.parse import urlparse as _urlparse, parse_qs as _parse_qs
+except ImportError:
+    # Python 2
+    from urlparse import urlparse as _urlparse, parse_qs as _parse_qs
+
+from threading import Lock as _Lock
+
+import requests as _requests
+from requests.packages.urllib3.exceptions import HTTPError as _HTTPError
 
 import apyfal.exceptions as _exc
 from apyfal.storage import Storage as _Storage
+from apyfal.storage._checksum import (
+    md5_from_content_md5 as _md5_from_content_md5)
 import apyfal._utilities as _utl
 
 
@@ -19,31 +31,199 @@ class HTTPStorage(_Storage):
             Can be Configuration instance, apyfal.storage URL, paths, file-like object.
             If not set, will search it in current working directory, in current
             user "home" folder. If none found, will use default configuration values.
+        chunk_size (int): Size in bytes of chunks used to download files.
+            Default to "CHUNK_SIZE".
+        max_resumes (int): Maximum number of time an interrupted download is
+            resumed. Default to "MAX_RESUMES".
+        decode_content (bool): If True, allows server to send compressed
+            content and decodes it transparently. Download can't be resumed
+            from last written offset in this case. If False (Default),
+            requests uncompressed content.
     """
     #: Storage type
     NAME = 'HTTP'
 
-    def copy_to_stream(self, source, stream):
+    #: Default size in bytes of download chunks
+    CHUNK_SIZE = 1024 ** 2
+
+    #: Default maximum number of download resumes
+    MAX_RESUMES = 5
+
+    #: URL query parameters identifying pre-signed URL, uploaded with PUT
+    PRESIGNED_QUERY_KEYS = ('X-Amz-Signature', 'Signature', 'temp_url_sig')
+
+    def __init__(self, storage_type=None, config=None, chunk_size=None,
+                 max_resumes=None, decode_content=None, **kwargs):
+        _Storage.__init__(
+            self, storage_type=storage_type, config=config, **kwargs)
+
+        # Read configuration
+        section = self._config.compiled['storage.%s' % self.storage_id]
+        self._chunk_size = int(
+            chunk_size or section['chunk_size'] or self.CHUNK_SIZE)
+        self._max_resumes = int(
+            max_resumes if max_resumes is not None else
+            section.get_literal('max_resumes') or self.MAX_RESUMES)
+        self._decode_content = bool(
+            decode_content if decode_content is not None else
+            section.get_literal('decode_content'))
+        self._retry_policy = self._config.get_retry_policy(
+            'storage.%s' % self.storage_id)
+        self._session = None
+        self._session_lock = _Lock()
+
+    def _get_session(self):
+        """
+        Get HTTP session. Created once by storage, on first call.
+
+        The session connection pool is shared by all threads using this
+        storage.
+
+        Returns:
+            requests.Session: Http session
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = _utl.http_session(
+                        retry_policy=self._retry_policy,
+                        pool_size=self._max_workers)
+        return self._session
+
+    def get_metadata(self, path):
+        """
+        Get file metadata used to check if file was modified.
+
+        Args:
+            path (str): File URL.
+
+        Returns:
+            dict or None: Metadata with "etag", "last_modified", "size", "md5"
+                keys. "md5" is read from "Content-MD5" header. None if server
+                does not provide "ETag", "Last-Modified" or "Content-MD5".
+        """
+        with _utl.handle_request_exceptions(_exc.StorageRuntimeException):
+            response = self._get_session().head(
+                path, allow_redirects=True)
+            response.raise_for_status()
+
+        headers = response.headers
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        content_md5 = headers.get('Content-MD5')
+        if not (etag or last_modified or content_md5):
+            return None
+
+        size = headers.get('Content-Length')
+        return {'etag': etag, 'last_modified': last_modified,
+                'size': int(size) if size is not None else None,
+                'md5': _md5_from_content_md5(content_md5)
+                if content_md5 else None}
+
+    def copy_to_stream(self, source, stream, etag=None, last_modified=None):
         """
         Copy a file from storage to binary stream.
 
+        If download is interrupted, it is resumed from the last written
+        offset using a range request.
+
         Args:
             source (str): Source URL.
             stream (file-like object): Destination binary stream.
+            etag (str): If specified, download only if file ETag
+                does not match (Using "If-None-Match").
+            last_modified (str): If specified, download only if file was
+                modified after this HTTP date (Using "If-Modified-Since").
+
+        Returns:
+            bool: False if file not modified and not downloaded, else True.
         """
-        with _utl.handle_request_exceptions(_exc.StorageRuntimeException):
-            response = _utl.http_session().get(source, stream=True)
-            response.raise_for_status()
-        _copyfileobj(response.raw, stream)
+        session = self._get_session()
+        headers = {'Accept-Encoding': 'gzip, deflate'
+                   if self._decode_content else 'identity'}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        seekable = getattr(stream, 'seekable', lambda: False)()
+        start = stream.tell() if seekable else 0
+        written = 0
+        size = None
+        resumes = 0
+        while True:
+            with _utl.handle_request_exceptions(_exc.StorageRuntimeException):
+                response = session.get(source, stream=True, headers=headers)
+
+                # Nothing to resume, download was already complete
+                if (response.status_code == 416 and 'Range' in headers and
+                        written == size):
+                    response.close()
+                    return True
+
+                response.raise_for_status()
+
+            # File not modified
+            if response.status_code == 304:
+                return False
+
+            # Server does not resume download, restarts from start
+            if written and response.status_code != 206:
+                if not seekable:
+                    raise _exc.StorageRuntimeException(
+                        'Unable to resume download of "%s"' % source)
+                stream.seek(start)
+                stream.truncate()
+                written = 0
+
+            # Gets file size to check completion on resume
+            if response.status_code == 200 and not self._decode_content:
+                size = response.headers.get('Content-Length')
+                size = int(size) if size is not None else None
+
+            # Downloads
+            try:
+                for chunk in response.raw.stream(
+                        self._chunk_size, decode_content=self._decode_content):
+                    stream.write(chunk)
+                    written += len(chunk)
+                return True
+
+            # Download interrupted, tries to resume
+            except (_requests.RequestException, _HTTPError) as exception:
+                resumes += 1
+                if resumes > self._max_resumes:
+                    raise _exc.StorageRuntimeException(exc=exception)
+
+            finally:
+                response.close()
+
+            # Resume only the same file from last written offset
+            headers.pop('If-None-Match', None)
+            headers.pop('If-Modified-Since', None)
+            if not self._decode_content:
+                validator = (response.headers.get('ETag') or
+                             response.headers.get('Last-Modified'))
+                if validator:
+                    headers['If-Range'] = validator
+                    headers['Range'] = 'bytes=%d-' % written
 
     def copy_from_stream(self, stream, destination):
         """
         Copy a file to storage from binary stream.
 
+        Uses PUT method with pre-signed URL (AWS S3 or Swift TempURL),
+        else uses POST method.
+
         Args:
             stream (file-like object): Source binary stream.
             destination (str): Destination URL.
         """
+        query = _parse_qs(_urlparse(destination).query)
+        method = 'put' if any(
+            key in query for key in self.PRESIGNED_QUERY_KEYS) else 'post'
+
         with _utl.handle_request_exceptions(_exc.StorageRuntimeException):
-            response = _utl.http_session().post(destination, data=stream)
+            response = getattr(self._get_session(), method)(
+                destination, data=stream)
             response.raise_for_status()
@@ -0,0 +1,136 @@
+# coding=utf-8
+"""In memory files"""
+
+from mmap import mmap as _mmap, ACCESS_COPY as _ACCESS_COPY
+import os.path as _os_path
+
+import apyfal.configuration as _cfg
+import apyfal.exceptions as _exc
+from apyfal.storage import (
+    Storage as _Storage, _BufferIO, _byte_view, _copy_stream)
+
+# In memory files, shared by all memory storage of the process
+_FILES = dict()
+
+
+class MemoryStorage(_Storage):
+    """In memory files of current process
+
+    apyfal.storage URL: "memory://name"
+
+    Files are stored as objects supporting the buffer protocol. They can be
+    stored and retrieved without copy with "put" and "get".
+
+    Local files from the accelerator temporary directory (in "/dev/shm" if
+    available) are memory mapped instead of copied.
+
+    Files are only available on client side and can't be processed remotely
+    on host.
+
+    Args:
+        storage_type (str): Type of storage. Default to "Memory".
+        config (str or apyfal.configuration.Configuration or file-like object):
+            Can be Configuration instance, apyfal.storage URL, paths, file-like object.
+            If not set, will search it in current working directory, in current
+            user "home" folder. If none found, will use default configuration values.
+    """
+    #: Storage type
+    NAME = 'Memory'
+
+    @staticmethod
+    def put(path, data):
+        """
+        Store a buffer as file without copying it.
+
+        Args:
+            path (str): File path.
+            data (bytes-like object): Object supporting the buffer protocol.
+                Must not be modified while stored.
+        """
+        _FILES[path] = data
+
+    @staticmethod
+    def get(path):
+        """
+        Get a file without copying it.
+
+        Args:
+            path (str): File path.
+
+        Returns:
+            memoryview: File content.
+        """
+        try:
+            return _byte_view(_FILES[path])
+        except KeyError:
+            raise _exc.StorageResourceNotExistsException(
+                gen_msg=('not_found_named', 'File', path))
+
+    @staticmethod
+    def remove(path):
+        """
+        Remove a file.
+
+        Args:
+            path (str): File path.
+        """
+        _FILES.pop(path, None)
+
+    def copy_to_stream(self, source, stream):
+        """
+        Copy a file from storage to binary stream.
+
+        Args:
+            source (str): Source path.
+            stream (file-like object): Destination binary stream.
+        """
+        _copy_stream(_BufferIO(self.get(source)), stream)
+
+    def copy_from_stream(self, stream, destination):
+        """
+        Copy a file to storage from binary stream.
+
+        Args:
+            stream (file-like object): Source binary stream.
+            destination (str): Destination path.
+        """
+        buffer = bytearray()
+        _copy_stream(stream, _BufferIO(buffer))
+        _FILES[destination] = buffer
+
+    def copy_from_local(self, local_path, destination):
+        """
+        Copy a file to storage from local.
+
+        Args:
+            local_path (str): Local source path.
+            destination (str): Destination path.
+        """
+        # Maps files from accelerator temporary directory, already in memory
+        tmp_root = _cfg.ACCELERATOR_TMP_ROOT
+        if tmp_root and _os_path.abspath(local_path).startswith(
+                _os_path.join(_os_path.abspath(tmp_root), '')):
+            with open(local_path, 'rb') as file:
+                try:
+                    # Private copy-on-write mapping, file can be removed
+                    _FILES[destination] = _mmap(
+                        file.fileno(), 0, access=_ACCESS_COPY)
+                    return
+                except ValueError:
+                    # Empty file can't be mapped
+                    pass
+
+        _Storage.copy_from_local(self, local_path, destination)
+
+    def _copy_from_temporary(self, storage, source, destination):
+        """
+        Copy from another storage to this one directly in memory.
+
+        Args:
+            storage (Storage): Storage from where copy.
+            source (str): Source path
+            destination (str): Destination path
+        """
+        buffer = bytearray()
+        storage.copy_to_stream(source, _BufferIO(buffer))
+        _FILES[destination] = buffer
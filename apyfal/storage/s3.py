@@ -1,9 +1,14 @@
 # coding=utf-8
 """Amazon Web Services S3"""
 
+from threading import Lock as _Lock
+
 import boto3 as _boto3
+from boto3.s3.transfer import TransferConfig as _TransferConfig
+from botocore.config import Config as _Config
 
 from apyfal.storage._bucket import BucketStorage as _BucketStorage
+from apyfal.storage._checksum import md5_from_etag as _md5_from_etag
 import apyfal.exceptions as _exc
 import apyfal._utilities.aws as _utl_aws
 
@@ -34,6 +39,14 @@ class S3Storage(_BucketStorage):
             user "home" folder. If none found, will use default configuration values.
         client_id (str): AWS Access Key ID.
         secret_id (str): AWS Secret Access Key.
+        max_pool_connections (int): Maximum number of connections to keep in
+            connection pool. Default to "max_workers".
+        multipart_threshold (int): Size in bytes from which multipart
+            transfers are used. Default to boto3 default value.
+        multipart_chunksize (int): Size in bytes of each part of
+            multipart transfers. Default to boto3 default value.
+        max_concurrency (int): Maximum number of threads used to perform
+            multipart transfers. Default to boto3 default value.
     """
     #: Service name
     NAME = 'S3'
@@ -44,15 +57,69 @@ class S3Storage(_BucketStorage):
     #: AWS Website
     DOC_URL = "https://aws.amazon.com"
 
-    def __init__(self, **kwargs):
+    #: Uploaded objects MD5 is provided by their ETag
+    SUPPORTS_CHECKSUM_METADATA = True
+
+    def __init__(self, max_pool_connections=None, multipart_threshold=None,
+                 multipart_chunksize=None, max_concurrency=None, **kwargs):
         _BucketStorage.__init__(self, **kwargs)
 
+        # Default some attributes
+        self._resource = None
+        self._buckets = dict()
+        self._lock = _Lock()
+
         # Load session
         self._session = _boto3.session.Session(
             aws_access_key_id=self._client_id,
             aws_secret_access_key=self._secret_id,
         )
 
+        # Connection pool, retries and timeouts configuration
+        client_config = self._config.get_retry_policy(
+            'storage.%s' % self.NAME).botocore_kwargs()
+        client_config['max_pool_connections'] = int(self._from_config(
+            'max_pool_connections', max_pool_connections) or
+            self._max_workers)
+        self._client_config = _Config(**client_config)
+
+        # Multipart transfers configuration
+        transfer_config = dict()
+        for key, value in (('multipart_threshold', multipart_threshold),
+                           ('multipart_chunksize', multipart_chunksize),
+                           ('max_concurrency', max_concurrency)):
+            value = self._from_config(key, value)
+            if value:
+                transfer_config[key] = int(value)
+        self._transfer_config = _TransferConfig(**transfer_config)
+
+    @property
+    def _client(self):
+        """
+        S3 client shared by all operations on this storage.
+
+        boto3 clients are thread safe.
+
+        Returns:
+            botocore.client.S3: client
+        """
+        return self._get_resource().meta.client
+
+    def _get_resource(self):
+        """
+        Get S3 resource. Created once by storage, on first call.
+
+        Returns:
+            boto3.resources.factory.s3.ServiceResource: resource
+        """
+        if self._resource is None:
+            with self._lock:
+                if self._resource is None:
+                    with _ExceptionHandler.catch():
+                        self._resource = self._session.resource(
+                            's3', config=self._client_config)
+        return self._resource
+
     def _get_bucket(self, path):
         """
         Get bucket and file path from global path.
@@ -64,9 +131,54 @@ class S3Storage(_BucketStorage):
             tuple: bucket, file path
         """
         bucket_name, path = path.split('/', 1)
+        try:
+            return self._buckets[bucket_name], path
+
+        # Creates bucket object on first call
+        except KeyError:
+            bucket = self._get_resource().Bucket(bucket_name)
+            return self._buckets.setdefault(bucket_name, bucket), path
+
+    def get_metadata(self, path):
+        """
+        Get file metadata used to check if file was modified.
+
+        Args:
+            path (str): File path.
+
+        Returns:
+            dict: Metadata with "etag", "last_modified", "size", "md5" keys.
+                "md5" is None if ETag is not the object MD5 (Multipart
+                upload, KMS or customer key encryption).
+        """
+        bucket, path = self._get_bucket(path)
         with _ExceptionHandler.catch():
-            bucket = self._session.resource('s3').Bucket(bucket_name)
-        return bucket, path
+            response = self._client.head_object(Bucket=bucket.name, Key=path)
+        etag = response.get('ETag')
+        md5 = (None if response.get('ServerSideEncryption') == 'aws:kms' or
+               response.get('SSECustomerAlgorithm') else _md5_from_etag(etag))
+        return {'etag': etag,
+                'last_modified': str(response.get('LastModified')),
+                'size': response.get('ContentLength'), 'md5': md5}
+
+    def get_presigned_url(self, path, mode, expires):
+        """
+        Get a pre-signed HTTP URL giving temporary access to a file
+        without storage credentials.
+
+        Args:
+            path (str): File path.
+            mode (str): Access mode. 'r' (GET URL) or 'w' (PUT URL).
+            expires (int): Pre-signed URL validity duration in seconds.
+
+        Returns:
+            str: Pre-signed URL.
+        """
+        bucket, path = self._get_bucket(path)
+        with _ExceptionHandler.catch():
+            return self._client.generate_presigned_url(
+                'put_object' if 'w' in mode else 'get_object',
+                Params={'Bucket': bucket.name, 'Key': path}, ExpiresIn=expires)
 
     def copy_to_local(self, source, local_path):
         """
@@ -78,7 +190,8 @@ class S3Storage(_BucketStorage):
         """
         bucket, path = self._get_bucket(source)
         with _ExceptionHandler.catch():
-            bucket.download_file(path, local_path)
+            bucket.download_file(
+                path, local_path, Config=self._transfer_config)
 
     def copy_from_local(self, local_path, destination):
         """
@@ -90,7 +203,8 @@ class S3Storage(_BucketStorage):
         """
         bucket, path = self._get_bucket(destination)
         with _ExceptionHandler.catch():
-            bucket.upload_file(local_path, path)
+            bucket.upload_file(
+                local_path, path, Config=self._transfer_config)
 
     def copy_to_stream(self, source, stream):
         """
@@ -102,7 +216,8 @@ class S3Storage(_BucketStorage):
         """
         bucket, path = self._get_bucket(source)
         with _ExceptionHandler.catch():
-            bucket.download_fileobj(path, stream)
+            bucket.download_fileobj(
+                path, stream, Config=self._transfer_config)
 
     def copy_from_stream(self, stream, destination):
         """
@@ -114,18 +229,24 @@ class S3Storage(_BucketStorage):
         """
         bucket, path = self._get_bucket(destination)
         with _ExceptionHandler.catch():
-            bucket.upload_fileobj(stream, path)
+            bucket.upload_fileobj(
+                stream, path, Config=self._transfer_config)
 
-    def _copy_from_aws(self, source, destination):
+    def _copy_from_s3(self, storage, source, destination):
         """
-        Copy from another AWS S3 bucket to this other.
+        Copy from another AWS S3 bucket to this one.
+
+        Copy is performed server side using managed multipart copy,
+        data does not transit by this machine.
 
         Args:
-            source (str): Source key in other bucket.
-            destination (str): Destination key in this bucket.
+            storage (S3Storage): Storage from where copy.
+            source (str): Source path in other storage.
+            destination (str): Destination path in this storage.
         """
         dst_bucket, dst_path = self._get_bucket(destination)
         src_bucket, src_path = source.split('/', 1)
         with _ExceptionHandler.catch():
             dst_bucket.copy(
-                {'Bucket': src_bucket, 'Key': src_path}, dst_path)
+                {'Bucket': src_bucket, 'Key': src_path}, dst_path,
+                SourceClient=storage._client, Config=self._transfer_config)
@@ -4,9 +4,25 @@
 # of this module with openstack-sdk package
 from __future__ import absolute_import as _absolute_import
 
+from hashlib import sha256 as _sha256
+import hmac as _hmac
+from json import dumps as _json_dumps
+from math import ceil as _ceil
+from multiprocessing.pool import ThreadPool as _ThreadPool
+from time import time as _time
+from uuid import uuid4 as _uuid
+try:
+    # Python 3
+    from urllib.parse import quote as _quote, urlparse as _urlparse
+except ImportError:
+    # Python 2
+    from urllib import quote as _quote
+    from urlparse import urlparse as _urlparse
+
 import openstack as _openstack
 
 from apyfal.storage._bucket import BucketStorage as _BucketStorage
+from apyfal.storage._checksum import md5_from_etag as _md5_from_etag
 import apyfal.exceptions as _exc
 import apyfal._utilities.openstack as _utl_openstack
 
@@ -34,20 +50,49 @@ class SwiftStorage(_BucketStorage):
         project_id (str): OpenStack Project
         auth_url (str): OpenStack auth-URL
         interface (str): OpenStack interface
+        segment_size (int): Size in bytes of segments used to upload large
+            objects. Objects bigger than this size are uploaded as Static
+            Large Object, with segments stored in the "<container>_segments"
+            container. Default to "SEGMENT_SIZE". Increased if required to
+            not exceed "MAX_SEGMENTS" segments when the stream size is
+            known.
+        max_concurrency (int): Maximum number of segments uploaded in
+            parallel. Default to "MAX_CONCURRENCY".
+        chunk_size (int): Size in bytes of chunks used to download objects.
+            Default to "CHUNK_SIZE".
+        temp_url_key (str): Account "Temp-URL-Key" used to generate
+            pre-signed URL. If not specified, pre-signed URL are not supported.
     """
     #: Service name
     NAME = 'Swift'
 
+    #: Default size in bytes of large objects segments
+    SEGMENT_SIZE = 128 * 1024 ** 2
+
+    #: Maximum number of segments of a Static Large Object
+    MAX_SEGMENTS = 1000
+
+    #: Default number of segments uploaded in parallel
+    MAX_CONCURRENCY = 4
+
+    #: Default size in bytes of download chunks
+    CHUNK_SIZE = 1024 ** 2
+
     #: Provider name
     HOST_NAME = 'OpenStack'
 
+    #: Uploaded objects MD5 is provided by their ETag
+    SUPPORTS_CHECKSUM_METADATA = True
+
     # Default OpenStack auth-URL to use (str)
     OPENSTACK_AUTH_URL = None
 
     # Default Interface to use (str)
     OPENSTACK_INTERFACE = None
 
-    def __init__(self, region=None, project_id=None, auth_url=None, interface=None, **kwargs):
+    def __init__(self, region=None, project_id=None, auth_url=None, interface=None,
+                 segment_size=None, max_concurrency=None, chunk_size=None,
+                 temp_url_key=None, **kwargs):
         _BucketStorage.__init__(self, **kwargs)
 
         # Read configuration
@@ -59,12 +104,83 @@ class SwiftStorage(_BucketStorage):
         self._interface = (
             self._from_config('interface', interface) or
             self.OPENSTACK_INTERFACE)
+        self._segment_size = int(
+            self._from_config('segment_size', segment_size) or
+            self.SEGMENT_SIZE)
+        self._max_concurrency = int(
+            self._from_config('max_concurrency', max_concurrency) or
+            self.MAX_CONCURRENCY)
+        self._chunk_size = int(
+            self._from_config('chunk_size', chunk_size) or
+            self.CHUNK_SIZE)
+        self._temp_url_key = self._from_config('temp_url_key', temp_url_key)
 
         # Load session
         self._session = _utl_openstack.connect(
             region=self._region, auth_url=self._auth_url,
             client_id=self._client_id, secret_id=self._secret_id,
-            project_id=self._project_id, interface=self._interface)
+            project_id=self._project_id, interface=self._interface,
+            retry_policy=self._config.get_retry_policy(
+                'storage.%s' % self.NAME),
+            pool_size=max(self._max_workers, self._max_concurrency))
+
+    def get_metadata(self, path):
+        """
+        Get file metadata used to check if file was modified.
+
+        Args:
+            path (str): File path.
+
+        Returns:
+            dict: Metadata with "etag", "last_modified", "size", "md5" keys.
+                "md5" is None for large objects manifests.
+        """
+        container, path = self._get_bucket(path)
+        with _ExceptionHandler.catch():
+            with _ExceptionHandler.catch(
+                    to_catch=_openstack.exceptions.NotFoundException,
+                    to_raise=_exc.StorageResourceNotExistsException):
+                obj = self._session.object_store.get_object_metadata(
+                    path, container=container)
+        md5 = (None if obj.is_static_large_object or obj.object_manifest
+               else _md5_from_etag(obj.etag))
+        return {'etag': obj.etag, 'last_modified': obj.last_modified_at,
+                'size': int(obj.content_length)
+                if obj.content_length is not None else None, 'md5': md5}
+
+    def get_presigned_url(self, path, mode, expires):
+        """
+        Get a pre-signed HTTP URL giving temporary access to a file
+        without storage credentials.
+
+        Swift "TempURL" middleware must be enabled and account "Temp-URL-Key"
+        must be specified with "temp_url_key" argument.
+
+        Args:
+            path (str): File path.
+            mode (str): Access mode. 'r' (GET URL) or 'w' (PUT URL).
+            expires (int): Pre-signed URL validity duration in seconds.
+
+        Returns:
+            str or None: Pre-signed URL. None if no "temp_url_key".
+        """
+        if not self._temp_url_key:
+            return None
+
+        container, path = self._get_bucket(path)
+        with _ExceptionHandler.catch():
+            endpoint = self._session.object_store.get_endpoint().rstrip('/')
+
+        # Signs URL
+        expires = int(_time() + expires)
+        signature = _hmac.new(
+            self._temp_url_key.encode(), ('%s\n%d\n%s/%s/%s' % (
+                'PUT' if 'w' in mode else 'GET', expires,
+                _urlparse(endpoint).path, container, path)).encode(),
+            _sha256).hexdigest()
+
+        return '%s%s?temp_url_sig=%s&temp_url_expires=%d' % (
+            endpoint, self._object_url(container, path), signature, expires)
 
     def copy_to_stream(self, source, stream):
         """
@@ -75,12 +191,13 @@ class SwiftStorage(_BucketStorage):
             stream (file-like object): Destination binary stream.
         """
         container, path = self._get_bucket(source)
-        with _ExceptionHandler.catch(
-                to_catch=_openstack.exceptions.NotFoundException,
-                to_raise=_exc.StorageResourceNotExistsException):
-            data = self._session.object_store.download_object(
-                path, container=container)
-        stream.write(data)
+        with _ExceptionHandler.catch():
+            with _ExceptionHandler.catch(
+                    to_catch=_openstack.exceptions.NotFoundException,
+                    to_raise=_exc.StorageResourceNotExistsException):
+                for chunk in self._session.object_store.stream_object(
+                        path, container=container, chunk_size=self._chunk_size):
+                    stream.write(chunk)
 
     def copy_from_stream(self, stream, destination):
         """
@@ -91,7 +208,261 @@ class SwiftStorage(_BucketStorage):
             destination (str): Destination URL.
         """
         container, path = self._get_bucket(destination)
-        data = stream.read()
+
+        segment_size = self._get_segment_size(stream)
+
+        with _ExceptionHandler.catch():
+            # Segments of the object to overwrite, if any
+            old_segments = self._get_segments(container, path)
+
+            # Small object, uploads it directly
+            data = self._read_segment(stream, segment_size)
+            if len(data) < segment_size:
+                self._session.object_store.create_object(
+                    container=container, name=path, data=data)
+
+            # Large object, uploads it by segments
+            else:
+                self._upload_large_object(
+                    container, path, stream, data, segment_size)
+
+            # Deletes segments not used anymore
+            self._delete_segments(old_segments)
+
+    def _get_segment_size(self, stream):
+        """
+        Get size of segments used to upload a stream.
+
+        Args:
+            stream (file-like object): Source binary stream.
+
+        Returns:
+            int: Segment size in bytes. "segment_size", or more if the stream
+                size is known and requires more than "MAX_SEGMENTS" segments.
+        """
+        try:
+            position = stream.tell()
+            stream.seek(0, 2)
+            size = stream.tell() - position
+            stream.seek(position)
+        except (AttributeError, IOError, OSError, ValueError):
+            # Not seekable stream, size unknown
+            return self._segment_size
+        return max(self._segment_size,
+                   int(_ceil(float(size) / self.MAX_SEGMENTS)))
+
+    @staticmethod
+    def _read_segment(stream, segment_size):
+        """
+        Read a segment from stream.
+
+        Raw streams may return less data than requested, reads until
+        segment is complete or stream is exhausted.
+
+        Args:
+            stream (file-like object): Source binary stream.
+            segment_size (int): Segment size in bytes.
+
+        Returns:
+            bytes: Segment content. Shorter than "segment_size" only if
+                stream is exhausted.
+        """
+        data = stream.read(segment_size)
+        if not data or len(data) == segment_size:
+            return data
+
+        chunks = [data]
+        size = len(data)
+        while size < segment_size:
+            chunk = stream.read(segment_size - size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+        return b''.join(chunks)
+
+    def _upload_large_object(self, container, path, stream, data,
+                             segment_size):
+        """
+        Upload a large object as Static Large Object.
+
+        Segments are stored in the "<container>_segments" container, under a
+        prefix unique to this upload. Segments are uploaded in parallel, at
+        most "max_concurrency" + 1 segments are kept in memory at a time.
+        Uploaded segments are deleted on failure.
+
+        Args:
+            container (str): Destination container.
+            path (str): Destination object name.
+            stream (file-like object): Source binary stream.
+            data (bytes): First segment, already read from stream.
+            segment_size (int): Segment size in bytes.
+
+        Raises:
+            apyfal.exceptions.StorageRuntimeException: Object requires more
+                than "MAX_SEGMENTS" segments.
+        """
+        # Creates segments container if not exists
+        segments_container = '%s_segments' % container
+        response = self._session.object_store.put(
+            '/%s' % _quote(segments_container))
+        _openstack.exceptions.raise_from_response(response)
+        prefix = '%s/%s' % (path, _uuid().hex)
+
+        manifest = []
+        pool = _ThreadPool(self._max_concurrency)
+        try:
+            while data:
+                # Reads next segments to upload
+                segments = []
+                while data and len(segments) < self._max_concurrency:
+                    segments.append(data)
+                    data = self._read_segment(stream, segment_size)
+
+                if len(manifest) + len(segments) > self.MAX_SEGMENTS:
+                    raise _exc.StorageRuntimeException(
+                        'Object "%s" requires more than %d segments of %d '
+                        'bytes, increase "segment_size"' % (
+                            path, self.MAX_SEGMENTS, segment_size))
+
+                # Uploads segments in parallel
+                names = ['%s/%06d' % (prefix, index) for index in range(
+                    len(manifest), len(manifest) + len(segments))]
+                manifest += pool.map(
+                    lambda args: self._upload_segment(
+                        segments_container, *args),
+                    zip(names, segments))
+
+            # Creates manifest
+            response = self._session.object_store.put(
+                self._object_url(container, path),
+                params={'multipart-manifest': 'put'},
+                data=_json_dumps(manifest))
+            _openstack.exceptions.raise_from_response(response)
+
+        except Exception:
+            # Deletes uploaded segments
+            self._delete_segments(
+                segment['path'] for segment in manifest)
+            raise
+
+        finally:
+            pool.terminate()
+
+    def _get_segments(self, container, path):
+        """
+        Get segments of a Static Large Object.
+
+        Args:
+            container (str): Container.
+            path (str): Object name.
+
+        Returns:
+            list of str: Segments paths as "/container/name". Empty if
+                object does not exist or is not a Static Large Object.
+        """
+        try:
+            obj = self._session.object_store.get_object_metadata(
+                path, container=container)
+        except _openstack.exceptions.NotFoundException:
+            return []
+        if not obj.is_static_large_object:
+            return []
+
+        response = self._session.object_store.get(
+            self._object_url(container, path),
+            params={'multipart-manifest': 'get'})
+        _openstack.exceptions.raise_from_response(response)
+        return [segment['name'] for segment in response.json()]
+
+    def _delete_segments(self, segments):
+        """
+        Delete segments of a Static Large Object.
+
+        Args:
+            segments (iterable of str): Segments paths as "/container/name".
+        """
+        for segment in segments:
+            response = self._session.object_store.delete(_quote(segment))
+            if response.status_code != 404:
+                _openstack.exceptions.raise_from_response(response)
+
+    def _upload_segment(self, container, name, data):
+        """
+        Upload a large object segment.
+
+        Args:
+            container (str): Destination container.
+            name (str): Segment object name.
+            data (bytes): Segment content.
+
+        Returns:
+            dict: Segment description for Static Large Object manifest.
+        """
+        response = self._session.object_store.put(
+            self._object_url(container, name), data=data)
+        _openstack.exceptions.raise_from_response(response)
+        return {'path': '/%s/%s' % (container, name),
+                'etag': response.headers['Etag'].strip('"'),
+                'size_bytes': len(data)}
+
+    @staticmethod
+    def _object_url(container, name):
+        """
+        Object URL relative to object store endpoint.
+
+        Args:
+            container (str): Container.
+            name (str): Object name.
+
+        Returns:
+            str: URL
+        """
+        return '/%s/%s' % (_quote(container), _quote(name))
+
+    def _copy_from_swift(self, storage, source, destination):
+        """
+        Copy from another OpenStack Swift container to this one.
+
+        If both storage are on the same Swift cluster, copy is performed
+        server side using "X-Copy-From" header, data does not transit by
+        this machine. Else, fall back to copy using temporary file.
+
+        Args:
+            storage (SwiftStorage): Storage from where copy.
+            source (str): Source path in other storage.
+            destination (str): Destination path in this storage.
+        """
+        # Server side copy only available inside a same Swift cluster
+        if storage._cluster_id != self._cluster_id:
+            return self._copy_from_temporary(storage, source, destination)
+
+        container, path = self._get_bucket(destination)
         with _ExceptionHandler.catch():
-            self._session.object_store.create_object(
-                container=container, name=path, data=data)
+            # Segments of the object to overwrite, if any
+            old_segments = self._get_segments(container, path)
+
+            with _ExceptionHandler.catch(
+                    to_catch=_openstack.exceptions.NotFoundException,
+                    to_raise=_exc.StorageResourceNotExistsException):
+                response = self._session.object_store.put(
+                    self._object_url(container, path),
+                    headers={'X-Copy-From': '/%s' % _quote(source),
+                             'Content-Length': '0'})
+                _openstack.exceptions.raise_from_response(response)
+
+            # Deletes segments not used anymore
+            self._delete_segments(old_segments)
+
+    # Other OpenStack Swift based storage
+    _copy_from_ovh = _copy_from_swift
+
+    @property
+    def _cluster_id(self):
+        """
+        Swift cluster this storage is connected to.
+
+        Returns:
+            tuple of str: auth URL, region, project ID.
+        """
+        return self._auth_url, self._region, self._project_id
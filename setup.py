@@ -51,6 +51,12 @@ PACKAGE_INFO = dict(
         # Optional speedup
         'optional': ['pycurl'],
 
+        # Optional checksum algorithms
+        'checksum': ['crc32c', 'xxhash'],
+
+        # Optional compression algorithms
+        'compression': ['zstandard'],
+
         # CSP specific requirements
         'AWS': ['boto3'],
         'OpenStack': ['openstacksdk'],
@@ -220,3 +220,132 @@ def test_accelerator():
     finally:
         apyfal.client.AcceleratorClient = accelerator_client_class
         apyfal.host.Host = host_class
+
+
+def test_accelerator_handle(tmpdir):
+    """Tests Accelerator handle, pickling and fork safety"""
+    import pickle
+    from apyfal import Accelerator
+    from apyfal.configuration import Configuration
+    import apyfal.client as clt
+
+    # Mocks client
+    stopped = []
+
+    class DummyClient(object):
+        """Dummy apyfal.client.AcceleratorClient"""
+
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+            self._stopped = False
+
+        @property
+        def handle(self):
+            """Returns handle"""
+            return clt.AcceleratorHandle(
+                self.kwargs['accelerator'], self.kwargs['host_ip'],
+                self.kwargs['configuration_url'], self.kwargs['session_uuid'],
+                self.kwargs['config'])
+
+        def stop(self, *_, **__):
+            """Marks as stopped"""
+            stopped.append(self)
+
+    accelerator_client_class = clt.AcceleratorClient
+    clt.AcceleratorClient = DummyClient
+
+    # Tests
+    try:
+        config_file = tmpdir.join('accelerator.conf')
+        config_file.write(
+            '[accelize]\nclient_id = dummy_client_id\n'
+            'secret_id = dummy_secret_id\n')
+        config = Configuration(str(config_file))
+        config['host']['secret_id'] = 'dummy_host_secret_id'
+        config['host']['region'] = 'dummy_region'
+        handle = clt.AcceleratorHandle(
+            'dummy_accelerator', 'http://127.0.0.1',
+            'http://127.0.0.1/v1.0/configuration/1/', 'dummy_uuid', config)
+
+        # Tests: Handle pickling without credentials
+        pickled = pickle.dumps(handle)
+        assert b'dummy_client_id' not in pickled
+        assert b'dummy_secret_id' not in pickled
+        assert b'dummy_host_secret_id' not in pickled
+        handle = pickle.loads(pickled)
+        assert handle.name == 'dummy_accelerator'
+        assert handle.url == 'http://127.0.0.1'
+        assert handle.configuration_url == \
+            'http://127.0.0.1/v1.0/configuration/1/'
+        assert handle._config['host']['region'] == 'dummy_region'
+
+        # Tests: Credentials read again from configuration file
+        assert handle._config['accelize']['client_id'] == 'dummy_client_id'
+        assert handle._config['accelize']['secret_id'] == 'dummy_secret_id'
+        assert handle._config['host']['secret_id'] is None
+        assert pickle.loads(pickle.dumps(handle))._config[
+            'accelize']['secret_id'] == 'dummy_secret_id'
+
+        # Tests: Client attached without querying host, and never stopped
+        client = handle.attach_client()
+        assert client.kwargs['client_type'] == 'REST'
+        assert client.kwargs['host_ip'] == handle.url
+        assert client.kwargs['configuration_url'] == handle.configuration_url
+        assert client.kwargs['session_uuid'] == 'dummy_uuid'
+        assert client._stopped
+
+        # Tests: Accelerator attached without host
+        accelerator = handle.attach()
+        assert accelerator.host is None
+        assert accelerator.handle.url == handle.url
+
+        # Tests: Accelerator pickling
+        accelerator = pickle.loads(pickle.dumps(accelerator))
+        assert isinstance(accelerator, Accelerator)
+        assert accelerator.host is None
+        assert accelerator.client.kwargs['host_ip'] == handle.url
+
+        # Tests: Copy in forked process does not stop accelerator
+        del stopped[:]
+        accelerator._pid = -1
+        accelerator.__del__()
+        assert not stopped
+        accelerator._pid = clt._getpid()
+        accelerator.__del__()
+        assert stopped
+
+    # Restore classes
+    finally:
+        clt.AcceleratorClient = accelerator_client_class
+
+
+def test_import_time():
+    """Tests "import apyfal" time and lazy imports"""
+    from subprocess import check_output
+    import json
+
+    # Imports in a new interpreter to not use already imported modules
+    script = (
+        "import json, sys, time\n"
+        "start = time.time()\n"
+        "import apyfal\n"
+        "duration = time.time() - start\n"
+        "print(json.dumps([duration, sorted(sys.modules)]))\n")
+    duration, modules = json.loads(check_output(
+        [sys.executable, '-c', script]).decode().strip().splitlines()[-1])
+
+    # Tests: Slow to import packages are imported on first use only
+    for module in ('requests', 'urllib3', 'psutil', 'boto3', 'openstack',
+                   'pycurl', 'apyfal.client', 'apyfal.host',
+                   'apyfal.storage', 'apyfal.client.rest._openapi'):
+        assert module not in modules
+
+    # Tests: Import time
+    assert duration < 0.5
+
+    # Tests: Sub packages still available from package
+    if sys.version_info >= (3, 7):
+        import apyfal
+        assert apyfal.storage.copy
+        with pytest.raises(AttributeError):
+            apyfal.not_exists
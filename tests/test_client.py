@@ -2,7 +2,8 @@
 """apyfal.client tests"""
 import copy
 import json
-from os.path import isdir
+import os
+from os.path import isdir, isfile
 
 import pytest
 
@@ -126,6 +127,7 @@ def test_data_file(tmpdir):
             """Do nothing"""
             self._cache = {'tmp_dir': str(tmpdir)}
             self._authorized_host_dirs = [str(authorized_dir)]
+            self._checksum = None
 
         def _start(self, *_):
             """Do nothing"""
@@ -186,6 +188,43 @@ def test_data_file(tmpdir):
                 tmp_file.write(content)
     assert file_out.read_binary() == content
 
+    # Input and output buffers
+    with client._data_file(
+            content, parameters, parameter_name, 'rb') as path:
+        with open(path, 'rb') as tmp_file:
+            assert tmp_file.read() == content
+    buffer = bytearray()
+    with client._data_file(
+            buffer, parameters, parameter_name, 'wb') as path:
+        with open(path, 'wb') as tmp_file:
+            tmp_file.write(content)
+    assert buffer == content
+
+    # Checksums of transferred data
+    from hashlib import md5
+    client._checksum = 'md5'
+    checksums = dict()
+    with client._data_file(content, parameters, parameter_name, 'rb',
+                           checksums=checksums) as path:
+        with open(path, 'rb') as tmp_file:
+            assert tmp_file.read() == content
+    assert checksums[parameter_name] == md5(content).hexdigest()
+
+    client.PARAMETER_IO_FORMAT[parameter_name] = 'stream'
+    checksums = dict()
+    with client._data_file(file_in_path, parameters, parameter_name, 'rb',
+                           checksums=checksums) as file:
+        assert file.read() == content
+    assert checksums[parameter_name] == md5(content).hexdigest()
+    client.PARAMETER_IO_FORMAT[parameter_name] = 'file'
+
+    checksums = dict()
+    with client._data_file(file_in_path, parameters, parameter_name, 'rb',
+                           checksums=checksums) as path:
+        assert path is file_in_path
+    assert not checksums
+    client._checksum = None
+
     # host://: Unauthorized dir
     with pytest.raises(ClientSecurityException):
         with client._data_file(
@@ -216,6 +255,12 @@ def test_data_file(tmpdir):
             assert path is not None
     assert not parameters['app']['specific']
 
+    # Remote mode: No change for buffer
+    with client._data_file(
+            content, parameters, parameter_name, 'rb') as path:
+        assert path is not None
+    assert not parameters['app']['specific']
+
     # Remote mode: Others in parameters
     url = 'host://%s' % authorized_file_in_path
     with client._data_file(
@@ -269,3 +314,139 @@ def test_tmp_dir():
     client.stop()
     assert not client._cache
     assert not isdir(tmp_dir)
+
+
+def test_as_tmp_file(tmpdir):
+    """Tests AcceleratorClient.as_tmp_file"""
+    from apyfal.client import AcceleratorClient
+
+    # Mocks Client
+    class DummyClient(AcceleratorClient):
+        """Dummy Client"""
+
+        def _start(self, *_):
+            """Do nothing"""
+
+        def _process(self, *_):
+            """Do nothing"""
+
+        def _stop(self, *_):
+            """Do nothing"""
+
+    client = DummyClient('dummy')
+    content = 'dummy_content'.encode()
+    file = tmpdir.join('file')
+    file.write_binary(content)
+
+    # Input file
+    with client.as_tmp_file(str(file), 'rb') as path:
+        assert path.startswith(client._tmp_dir)
+        with open(path, 'rb') as tmp_file:
+            assert tmp_file.read() == content
+    assert not isfile(path)
+    assert file.read_binary() == content
+
+    # Output file
+    with client.as_tmp_file(str(file), 'wb') as path:
+        with open(path, 'wb') as tmp_file:
+            tmp_file.write(content * 2)
+    assert file.read_binary() == content * 2
+
+    # Input and output file: Copy, not linked
+    with client.as_tmp_file(str(file), 'rwb') as path:
+        assert os.stat(path).st_ino != os.stat(str(file)).st_ino
+        with open(path, 'r+b') as tmp_file:
+            assert tmp_file.read() == content * 2
+            tmp_file.write(content)
+    assert file.read_binary() == content * 3
+    client.stop()
+
+
+def test_configuration_fingerprint(tmpdir):
+    """Tests AcceleratorClient._configuration_fingerprint"""
+    from io import BytesIO
+    from apyfal.client import AcceleratorClient
+
+    fingerprint = AcceleratorClient._configuration_fingerprint
+    datafile = tmpdir.join('datafile')
+    datafile.write_binary(b'dummy_content')
+    parameters = {'app': {'specific': {'key': 1}}, 'env': {'AGFI': 'agfi'}}
+
+    # Tests: Same configuration, same fingerprint
+    assert fingerprint(None, parameters) == fingerprint(
+        None, copy.deepcopy(parameters))
+    assert fingerprint(str(datafile), parameters) == fingerprint(
+        str(datafile), parameters)
+
+    # Tests: Different parameters or data file content
+    other_parameters = copy.deepcopy(parameters)
+    other_parameters['env']['AGFI'] = 'other_agfi'
+    assert fingerprint(None, parameters) != fingerprint(None, other_parameters)
+    assert fingerprint(None, parameters) != fingerprint(
+        str(datafile), parameters)
+    reference = fingerprint(str(datafile), parameters)
+    datafile.write_binary(b'other_content')
+    assert fingerprint(str(datafile), parameters) != reference
+
+    # Tests: Streams can't be fingerprinted
+    assert fingerprint(BytesIO(b'dummy_content'), parameters) is None
+
+    # Tests: Forwarded data file URL identified by its content or metadata
+    forwarded = copy.deepcopy(parameters)
+    forwarded['app']['specific']['datafile'] = str(datafile)
+    reference = fingerprint(None, forwarded)
+    assert reference is not None
+    assert fingerprint(None, forwarded) == reference
+    datafile.write_binary(b'dummy_content')
+    assert fingerprint(None, forwarded) != reference
+    forwarded['app']['specific']['datafile'] = 'host://%s' % datafile
+    assert fingerprint(None, forwarded) is None
+
+
+def test_acceleratorclient_cancel():
+    """Tests AcceleratorClient.cancel"""
+    from io import BytesIO
+    from apyfal.client import AcceleratorClient
+    from apyfal.exceptions import ClientRuntimeException
+
+    processed = []
+
+    # Mocks Client
+    class DummyClient(AcceleratorClient):
+        """Dummy Client"""
+
+        def _start(self, *_):
+            """Do nothing"""
+
+        def _process(self, *_):
+            """Marks as processed"""
+            processed.append(True)
+            return {'app': {'status': 0, 'msg': ''}}
+
+        def _stop(self, *_):
+            """Do nothing"""
+
+    client = DummyClient('dummy')
+
+    class CancellingStream(BytesIO):
+        """Cancels process while input is read"""
+
+        def read(self, *args):
+            """Cancels and reads"""
+            client.cancel()
+            return BytesIO.read(self, *args)
+
+    try:
+        # Tests: Cancelled while getting input files
+        with pytest.raises(ClientRuntimeException):
+            client.process(CancellingStream(b'content'))
+        assert not processed
+        assert not client._cancelled
+
+        # Tests: Cancellation before process does not apply to it
+        client.cancel()
+        client.process(b'content')
+        assert processed
+        assert not client._cancelled
+    finally:
+        client.stop()
@@ -0,0 +1,172 @@
+# coding=utf-8
+"""apyfal.client.broker tests"""
+
+import pytest
+
+
+def test_fair_queue():
+    """Tests _FairQueue"""
+    from apyfal.client.broker import _FairQueue
+
+    queue = _FairQueue()
+    assert queue.get(timeout=0.0) is None
+    for client, job in (('a', 'a1'), ('a', 'a2'), ('a', 'a3'), ('b', 'b1'),
+                        ('b', 'b2'), ('c', 'c1')):
+        queue.put(client, job)
+    assert len(queue) == 6
+
+    # Tests: Clients served in turn
+    assert [queue.get() for _ in range(6)] == [
+        'a1', 'b1', 'c1', 'a2', 'b2', 'a3']
+    assert not len(queue)
+
+    # Tests: Remove client jobs
+    for client, job in (('a', 'a1'), ('a', 'a2'), ('b', 'b1')):
+        queue.put(client, job)
+    assert queue.remove('a', lambda job: job == 'a1') == ['a1']
+    assert queue.remove('b', lambda job: True) == ['b1']
+    assert queue.remove('c', lambda job: True) == []
+    assert [queue.get() for _ in range(len(queue))] == ['a2']
+
+
+def test_broker(tmpdir):
+    """Tests Broker and BrokerClient"""
+    from os import stat
+    from threading import Event, Thread
+    from time import sleep
+    from apyfal.client import AcceleratorClient
+    from apyfal.client.broker import Broker, BrokerClient
+    from apyfal.exceptions import (
+        ClientConfigurationException, ClientRuntimeException)
+
+    socket_path = str(tmpdir.join('broker.sock'))
+    file_in = tmpdir.join('file_in')
+    file_in.write('content')
+    file_out = tmpdir.join('file_out')
+
+    # Mocks broker accelerator client
+    calls = []
+    fail = []
+    block = []
+    started = Event()
+
+    class DummyBrokerClient(AcceleratorClient):
+        """Dummy client"""
+        NAME = 'DummyBrokerClient'
+
+        def _start(self, datafile, parameters):
+            calls.append('start')
+            if fail:
+                return {'app': {'status': 1, 'msg': 'dummy_error'}}
+            return {'app': {'status': 0, 'msg': ''}}
+
+        def _process(self, file_in, file_out, parameters):
+            calls.append('process')
+            if fail:
+                raise ClientRuntimeException('dummy_error')
+            if block:
+                # Waits cancellation
+                started.set()
+                while not self._cancelled:
+                    sleep(0.01)
+                self._check_cancelled()
+            with open(file_in, 'rb') as input_file:
+                with open(file_out, 'wb') as output_file:
+                    output_file.write(input_file.read().upper())
+            return {'app': {'status': 0, 'msg': '',
+                            'specific': {'result': 'dummy_result'}}}
+
+        def _stop(self, info_dict):
+            calls.append('stop')
+
+    # Tests: Broker not running
+    with pytest.raises(ClientConfigurationException):
+        BrokerClient('dummy_accelerator', socket_path=socket_path)
+
+    with Broker('dummy_accelerator', socket_path=socket_path,
+                client_type='DummyBrokerClient') as broker:
+        assert isinstance(broker.client, DummyBrokerClient)
+        assert broker.socket_path == socket_path
+
+        # Tests: Socket only accessible by current user
+        assert stat(socket_path).st_mode & 0o777 == 0o600
+
+        # Tests: Configures accelerator only once
+        client = AcceleratorClient(
+            'dummy_accelerator', client_type='Broker', socket_path=socket_path)
+        assert isinstance(client, BrokerClient)
+        client.start()
+        BrokerClient('dummy_accelerator', socket_path=socket_path).start()
+        assert calls == ['start']
+        client.start(datafile=str(file_in))
+        assert calls == ['start', 'start']
+        client.start(datafile=str(file_in))
+        assert calls == ['start', 'start']
+
+        # Tests: Failed configuration not memorized
+        datafile = tmpdir.join('datafile')
+        datafile.write('other_content')
+        fail.append(True)
+        with pytest.raises(ClientRuntimeException):
+            client.start(datafile=str(datafile))
+        del fail[:]
+        client.start(datafile=str(datafile))
+        client.start(datafile=str(datafile))
+        assert calls == ['start'] * 4
+
+        # Tests: Process
+        assert client.process(str(file_in), str(file_out)) == {
+            'result': 'dummy_result'}
+        assert file_out.read() == 'CONTENT'
+
+        # Tests: Errors
+        fail.append(True)
+        with pytest.raises(ClientRuntimeException):
+            client.process(str(file_in), str(file_out))
+        del fail[:]
+
+        # Tests: Cancel queued and running process
+        errors = {}
+
+        def process(name, broker_client):
+            """Process in thread"""
+            try:
+                broker_client.process(str(file_in), str(file_out))
+            except ClientRuntimeException as exception:
+                errors[name] = exception
+
+        other_client = BrokerClient('dummy_accelerator',
+                                    socket_path=socket_path)
+        block.append(True)
+        running = Thread(target=process, args=('running', client))
+        running.start()
+        assert started.wait(10)
+        queued = Thread(target=process, args=('queued', other_client))
+        queued.start()
+        while not len(broker._queue):
+            sleep(0.01)
+        del calls[:]
+
+        other_client.cancel()
+        queued.join(10)
+        assert 'Process cancelled' in str(errors['queued'])
+        assert 'running' not in errors
+
+        client.cancel()
+        running.join(10)
+        assert 'Process cancelled' in str(errors['running'])
+        assert not calls
+        del block[:]
+
+        # Tests: Cancellation does not affect next process
+        assert client.process(str(file_in), str(file_out))
+
+        # Tests: Client stop does not stop broker accelerator
+        client.stop()
+        assert 'stop' not in calls
+        assert client.process(str(file_in), str(file_out))
+
+    # Tests: Broker stop
+    assert calls[-1] == 'stop'
+    with pytest.raises(ClientConfigurationException):
+        BrokerClient('dummy_accelerator', socket_path=socket_path)
@@ -0,0 +1,168 @@
+# coding=utf-8
+"""apyfal.client._cache tests"""
+from io import BytesIO
+import os
+
+
+def test_result_cache(tmpdir):
+    """Tests ResultCache"""
+    from apyfal.client._cache import ResultCache
+
+    content = b'dummy_content'
+    file_in = tmpdir.join('file_in')
+    file_in.write_binary(content)
+    file_in_path = str(file_in)
+    output = tmpdir.join('output')
+    output.write_binary(content.upper())
+    response = {'app': {'status': 0, 'specific': {'result': 1}}}
+
+    cache = ResultCache(str(tmpdir.join('cache')))
+    assert tmpdir.join('cache').check(dir=True)
+
+    # Tests: Keys from in memory content
+    key = cache.key('accelerator', {'app': {}}, content)
+    stream = BytesIO(b'header' + content)
+    stream.read(6)
+    assert cache.key('accelerator', {'app': {}}, stream) == key
+    assert stream.tell() == 6
+    assert cache.key('other', {'app': {}}, content) != key
+    assert cache.key('accelerator', {'app': {'a': 1}}, content) != key
+    assert cache.key('accelerator', {'app': {}}, b'other') != key
+
+    # Tests: Keys from local file status, without reading it
+    file_key = cache.key('accelerator', {'app': {}}, file_in_path)
+    assert file_key is not None
+    assert cache.key('accelerator', {'app': {}}, os.path.join(
+        str(tmpdir), '.', 'file_in')) == file_key
+    with open(file_in_path, 'rb') as file_stream:
+        stream_key = cache.key('accelerator', {'app': {}}, file_stream)
+        assert stream_key is not None
+        assert file_stream.tell() == 0
+        file_stream.read(1)
+        assert cache.key(
+            'accelerator', {'app': {}}, file_stream) != stream_key
+    stat = os.stat(file_in_path)
+    os.utime(file_in_path, (stat.st_atime, stat.st_mtime + 10))
+    assert cache.key('accelerator', {'app': {}}, file_in_path) != file_key
+
+    # Tests: Keys from local files content
+    hash_cache = ResultCache(str(tmpdir.join('cache')), hash_content=True)
+    hash_key = hash_cache.key('accelerator', {'app': {}}, content)
+    assert hash_cache.key('accelerator', {'app': {}}, file_in_path) == hash_key
+    with open(file_in_path, 'rb') as file_stream:
+        assert hash_cache.key(
+            'accelerator', {'app': {}}, file_stream) == hash_key
+        assert file_stream.tell() == 0
+
+    # Tests: Keys from configuration
+    configuration = cache.configuration({'app': {}}, content)
+    assert cache.configuration({'app': {}}, content) == configuration
+    assert hash_cache.configuration(
+        {'app': {}}, file_in_path) == configuration
+    assert cache.configuration({'app': {}}, file_in_path) is not None
+    assert cache.configuration({'app': {}}, b'other') != configuration
+    assert cache.configuration({'app': {'a': 1}}, content) != configuration
+    assert cache.configuration({'app': {}}) != configuration
+    assert cache.configuration(
+        {}, str(tmpdir.join('not_exists'))) is None
+    assert cache.key(
+        'accelerator', {'app': {}}, content, configuration) != key
+
+    # Tests: Not cacheable inputs
+    assert cache.key('accelerator', {}, str(tmpdir.join('not_exists'))) is None
+    assert cache.key('accelerator', {}, 'host://%s' % file_in_path) is None
+
+    class NotSeekable(object):
+        """Stream with only read"""
+
+        @staticmethod
+        def read(size=-1):
+            """Read"""
+            return b''
+
+    assert cache.key('accelerator', {}, NotSeekable()) is None
+
+    # Tests: Cache miss
+    assert cache.get(key) is None
+
+    # Tests: Cache hit
+    cache.put(key, response, str(output))
+    assert cache.get(key) == response
+    file_out = bytearray()
+    assert cache.get(key, file_out) == response
+    assert file_out == content.upper()
+
+    # Tests: Cached without output
+    key = cache.key('accelerator', {}, content)
+    cache.put(key, response)
+    assert cache.get(key) == response
+    assert cache.get(key, bytearray()) is None
+
+
+def test_process_result_cache(tmpdir):
+    """Tests AcceleratorClient.process with result cache"""
+    from apyfal.client import AcceleratorClient
+    from apyfal.client._cache import ResultCache
+    import apyfal.storage as srg
+
+    processed = []
+
+    # Mocks Client
+    class DummyClient(AcceleratorClient):
+        """Dummy Client"""
+
+        def _start(self, *_):
+            """Do nothing"""
+            return {'app': {'status': 0}}
+
+        def _process(self, file_in, file_out, parameters):
+            """Converts to upper case"""
+            processed.append(file_in)
+            with srg.open(file_in, 'rb') as src:
+                srg.copy(src.read().upper(), file_out)
+            return {'app': {'status': 0, 'specific': {'result': 1}}}
+
+        def _stop(self, *_):
+            """Do nothing"""
+
+    client = DummyClient('dummy')
+    client._result_cache = ResultCache(str(tmpdir.join('cache')))
+    content = b'dummy_content'
+
+    # Tests: Not cached if not configured
+    client.process(content, bytearray())
+    client.process(content, bytearray())
+    assert len(processed) == 2
+    del processed[:]
+    client.start(datafile=b'datafile')
+
+    # Tests: Cache miss
+    file_out = bytearray()
+    assert client.process(content, file_out, info_dict=True) == (
+        {'result': 1}, {'app': {'status': 0}})
+    assert file_out == content.upper()
+    assert len(processed) == 1
+
+    # Tests: Cache hit
+    file_out = bytearray()
+    assert client.process(content, file_out, info_dict=True) == (
+        {'result': 1}, {'app': {'status': 0, 'cached': True}})
+    assert file_out == content.upper()
+    assert len(processed) == 1
+
+    # Tests: Other input
+    file_out = bytearray()
+    client.process(b'other', file_out)
+    assert file_out == b'OTHER'
+    assert len(processed) == 2
+
+    # Tests: Other configuration
+    client.start(datafile=b'other_datafile')
+    client.process(content, bytearray())
+    assert len(processed) == 3
+    client.start(datafile=b'datafile')
+    client.process(content, bytearray())
+    assert len(processed) == 3
+
+    # Tests: No temporary file left
+    assert not os.listdir(client._tmp_dir)
@@ -0,0 +1,87 @@
+# coding=utf-8
+"""apyfal.client._datafile tests"""
+from hashlib import sha256
+from threading import Thread
+
+import pytest
+
+try:
+    # Python 3
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+except ImportError:
+    # Python 2
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+
+def test_datafile_upload(tmpdir):
+    """Tests digest and upload against a local stand-in host"""
+    from apyfal.client._datafile import digest, upload, DATAFILE_PATH
+    from apyfal.exceptions import ClientRuntimeException
+
+    content = b'dummy_content' * 1000
+    datafile = tmpdir.join('datafile')
+    datafile.write_binary(content)
+    file_digest = sha256(content).hexdigest()
+
+    # Tests: Digest
+    assert digest(str(datafile)) == file_digest
+
+    # Mocks host storing data files by digest
+    stored = dict()
+    requests = []
+    prefix = DATAFILE_PATH.split('{', 1)[0]
+
+    class Handler(BaseHTTPRequestHandler):
+        """Stand-in host datafile API"""
+
+        def log_message(self, *_):
+            """Silent"""
+
+        def _digest(self):
+            """Returns requested digest"""
+            requests.append(self.command)
+            assert self.path.startswith(prefix)
+            return self.path[len(prefix):].strip('/')
+
+        def do_HEAD(self):
+            """Checks data file presence"""
+            self.send_response(200 if self._digest() in stored else 404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def do_PUT(self):
+            """Stores data file"""
+            key = self._digest()
+            data = self.rfile.read(int(self.headers['Content-Length']))
+            if sha256(data).hexdigest() == key:
+                stored[key] = data
+                self.send_response(201)
+            else:
+                self.send_response(400)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    thread = Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    url = 'http://127.0.0.1:%d' % server.server_address[1]
+
+    try:
+        # Tests: Missing data file uploaded
+        assert upload(url, str(datafile), file_digest)
+        assert stored[file_digest] == content
+        assert requests == ['HEAD', 'PUT']
+
+        # Tests: Stored data file not uploaded again
+        del requests[:]
+        assert not upload(url + '/', str(datafile), file_digest)
+        assert requests == ['HEAD']
+
+        # Tests: Host error
+        with pytest.raises(ClientRuntimeException):
+            upload(url, str(datafile), sha256(b'other').hexdigest())
+
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,118 @@
+# coding=utf-8
+"""apyfal.client._health tests"""
+
+import pytest
+
+
+def test_host_health():
+    """Tests HostHealth"""
+    from apyfal.client._health import HostHealth
+    from apyfal.exceptions import ClientRuntimeException
+    import apyfal.client._health as health_module
+
+    # Mocks host probe
+    host_up = []
+    health_module._utl.check_url, check_url = (
+        lambda *_, **__: bool(host_up), health_module._utl.check_url)
+
+    try:
+        # Tests: Closed on start
+        health = HostHealth('http://host', max_failures=2, reset_timeout=0.0)
+        assert health.state == HostHealth.CLOSED
+        assert health.available
+        assert health.error_rate == 0.0
+        assert health.latency is None
+        health.before_call()
+
+        # Tests: Success and latency
+        health.record_success(1.0)
+        health.record_success(2.0)
+        assert health.latency == pytest.approx(1.2)
+        assert health.error_rate == 0.0
+
+        # Tests: Consecutive failures open circuit
+        health.record_failure()
+        assert health.state == HostHealth.CLOSED
+        assert health.consecutive_failures == 1
+        health.record_failure()
+        assert health.state == HostHealth.OPEN
+        assert health.error_rate == 0.5
+
+        # Tests: Probe failure, circuit stays open
+        with pytest.raises(ClientRuntimeException):
+            health.before_call()
+        assert health.state == HostHealth.OPEN
+
+        # Tests: Probe success, half open, closed on success
+        host_up.append(True)
+        health.before_call()
+        assert health.state == HostHealth.HALF_OPEN
+        health.record_success()
+        assert health.state == HostHealth.CLOSED
+        assert health.consecutive_failures == 0
+        assert health.error_rate == 0.0
+
+        # Tests: Half open, opened again on failure
+        health.record_failure()
+        health.record_failure()
+        health.before_call()
+        health.record_failure()
+        assert health.state == HostHealth.OPEN
+
+        # Tests: Single prober and trial caller, probe without lock
+        health = HostHealth('http://host', max_failures=1, reset_timeout=60)
+        health.record_failure()
+        health._opened_at -= 60
+        concurrent = []
+
+        def probe(*_, **__):
+            """Concurrent call while probing"""
+            assert health._lock.acquire(False)
+            health._lock.release()
+            with pytest.raises(ClientRuntimeException):
+                health.before_call()
+            concurrent.append(True)
+            return True
+
+        health_module._utl.check_url = probe
+        health.before_call()
+        assert concurrent
+        assert health.state == HostHealth.HALF_OPEN
+        with pytest.raises(ClientRuntimeException):
+            health.before_call()
+        health._trial_at -= 60
+        health.before_call()
+        health.record_success()
+        assert health.state == HostHealth.CLOSED
+        health.before_call()
+        health_module._utl.check_url = lambda *_, **__: bool(host_up)
+
+        # Tests: Fails fast before reset timeout
+        health = HostHealth('http://host', max_failures=1, reset_timeout=60)
+        health.record_failure()
+        assert not health.available
+        with pytest.raises(ClientRuntimeException):
+            health.before_call()
+
+        # Tests: Error rate opens circuit
+        health = HostHealth('http://host', max_failures=10,
+                            max_error_rate=0.5, history_size=4)
+        for success in (True, False, True, False):
+            if success:
+                health.record_success()
+            else:
+                health.record_failure()
+        assert health.state == HostHealth.OPEN
+
+    finally:
+        health_module._utl.check_url = check_url
+
+
+def test_get_health():
+    """Tests get_health"""
+    from apyfal.client._health import get_health
+
+    health = get_health('http://health_host', max_failures=5)
+    assert get_health('http://health_host') is health
+    assert health._max_failures == 5
+    assert get_health('http://other_health_host') is not health
@@ -7,6 +7,7 @@ import io
 import gc
 import json
 import sys
+import zlib
 
 import pytest
 import requests
@@ -107,6 +108,7 @@ def test_restclient_start():
 
     base_parameters_result = {
         'app': {'status': 0, 'msg': 'dummy_msg'}}
+    create_calls = []
 
     class ConfigurationApi:
         """Fake rest_api.ConfigurationApi"""
@@ -118,6 +120,7 @@ def test_restclient_start():
         @staticmethod
         def configuration_create(parameters, datafile):
             """Checks input arguments and returns fake response"""
+            create_calls.append(parameters)
 
             # Check parameters
             if excepted_parameters is not None:
@@ -216,6 +219,20 @@ def test_restclient_start():
         with pytest.raises(ClientRuntimeException):
             accelerator.start()
 
+        # Reuses configuration if unchanged
+        configuration_read_in_error = 0
+        excepted_parameters = None
+        accelerator.start(host_env={'dummy_env': 1})
+        calls = len(create_calls)
+        response = accelerator.start(host_env={'dummy_env': 1}, info_dict=True)
+        assert len(create_calls) == calls
+        assert response['app']['reused']
+        assert response['url_config'] == 'dummy_url'
+
+        # Configures again if changed
+        accelerator.start(host_env={'dummy_env': 2})
+        assert len(create_calls) == calls + 1
+
     # Restore OpenApi client API
     finally:
         rest_api.ConfigurationApi = rest_api_configuration_api
@@ -224,6 +241,7 @@ def test_restclient_start():
 def test_restclient_use_last_configuration():
     """Tests RESTClient._use_last_configuration"""
     from apyfal.client.rest import RESTClient
+    import apyfal.client.rest as rest
     import apyfal.client.rest._openapi as rest_api
 
     # Mock OpenApi REST API ConfigurationApi
@@ -277,6 +295,30 @@ def test_restclient_use_last_configuration():
             'Dummy', host_ip='https://www.accelize.com')
         assert accelerator._configuration_url == 'dummy_config_url_2'
 
+        # Fingerprints host configuration without data file
+        FullConfig = collections.namedtuple('FullConfig', [
+            'url', 'used', 'datafile', 'parameters', 'parametersresult'])
+        parameters = {'app': {'specific': {}}, 'env': {}}
+        config_list.insert(0, FullConfig(
+            url='dummy_config_url_3', used=1, datafile='',
+            parameters=json.dumps(parameters),
+            parametersresult=str({'app': {'status': 0, 'msg': ''}})))
+        accelerator = RESTClient(
+            'Dummy', host_ip='https://www.accelize.com')
+        assert accelerator._configuration_url == 'dummy_config_url_3'
+        assert accelerator._start(None, parameters)['app']['reused']
+
+        # Host configuration with data file memorized without fingerprint
+        config_list.insert(0, FullConfig(
+            url='dummy_config_url_4', used=1, datafile='dummy_datafile_url',
+            parameters=json.dumps(parameters),
+            parametersresult=str({'app': {'status': 0, 'msg': ''}})))
+        accelerator = RESTClient(
+            'Dummy', host_ip='https://www.accelize.com')
+        assert accelerator._configuration_url == 'dummy_config_url_4'
+        assert rest._CONFIGURATIONS[accelerator.url][:2] == (
+            None, 'dummy_config_url_4')
+
     # Restore OpenApi client API
     finally:
         rest_api.ConfigurationApi = rest_api_configuration_api
@@ -623,15 +665,18 @@ def test_restclient_process(tmpdir):
         """Fake requests.Session"""
 
         @staticmethod
-        def get(datafile_result_arg, **_):
+        def get(datafile_result_arg, headers=None, **_):
             """Checks input arguments and returns fake response"""
-            Response = collections.namedtuple('Response', ['raw'])
+            Response = collections.namedtuple('Response', ['raw', 'headers'])
 
             # Checks input parameters
             assert json.loads(datafile_result_arg) == datafile_result
 
-            # Returns fake response
-            return Response(raw=io.BytesIO(out_content))
+            # Returns fake response, compressed if requested
+            if headers['Accept-Encoding'] == 'gzip':
+                return Response(raw=io.BytesIO(zlib.compress(out_content)),
+                                headers={'Content-Encoding': 'deflate'})
+            return Response(raw=io.BytesIO(out_content), headers={})
 
     # Monkey patch OpenApi client with mocked API
     openapi_client_process_api = rest_api.ProcessApi
@@ -680,6 +725,16 @@ def test_restclient_process(tmpdir):
         # Checks without info_dict
         assert accelerator.process(str(file_in), str(file_out)) == specific
 
+        # Checks with compressed result
+        accelerator._compression = 'gzip'
+        result = accelerator.process(
+            str(file_in), str(file_out), info_dict=True)[1]
+        assert file_out.read_binary() == out_content
+        stats = result['app']['compression']['result']
+        assert stats['encoding'] == 'deflate'
+        assert stats['size'] == len(out_content)
+        accelerator._compression = None
+
         # Checks without result
         del parameters_result['app']['specific']
         assert accelerator.process(str(file_in), str(file_out)) == dict()
@@ -688,3 +743,120 @@ def test_restclient_process(tmpdir):
     finally:
         requests.Session = requests_session
         rest_api.ProcessApi = openapi_client_process_api
+
+
+def test_restclient_compression():
+    """Tests RESTClient data file compression"""
+    from apyfal.client.rest import RESTClient
+
+    # Mock some accelerators parts
+    class DummyAccelerator(RESTClient):
+        """Dummy AcceleratorClient"""
+
+        def __init__(self, compression):
+            """Do not initialize"""
+            self._url = 'http://dummy'
+            self._compression = compression
+            self._compression_level = None
+            self._host_encodings = None
+            self._host_schema = None
+
+        def __del__(self):
+            """Do nothing"""
+
+    # Mocks requests in utilities
+    schema = {'paths': {'/v1.0/process/': {'post': {'parameters': [
+        {'name': 'datafile'},
+        {'name': 'datafile_encoding', 'enum': ['gzip']}]}}}}
+
+    class DummySession(requests.Session):
+        """Fake requests.Session"""
+
+        @staticmethod
+        def get(url, **_):
+            """Returns fake schema"""
+            assert url == 'http://dummy/v1.0/schema/'
+            response = requests.Response()
+            response.status_code = 200
+            response._content = json.dumps(schema).encode()
+            return response
+
+    requests_session = requests.Session
+    requests.Session = DummySession
+
+    try:
+        # Test: Disabled
+        assert DummyAccelerator(None)._datafile_encoding() is None
+
+        # Test: Supported by host
+        accelerator = DummyAccelerator('gzip')
+        assert accelerator._datafile_encoding() == 'gzip'
+        assert accelerator._host_encodings == ('gzip',)
+
+        # Test: Not supported by host
+        assert DummyAccelerator('zstd')._datafile_encoding() is None
+        del schema['paths']['/v1.0/process/']['post']['parameters'][1]
+        assert DummyAccelerator('gzip')._datafile_encoding() is None
+
+    finally:
+        requests.Session = requests_session
+
+    # Test: Multipart body
+    content = b'content' * 100
+    read_function = DummyAccelerator._multipart_body(
+        'boundary', [('parameters', '{}')], '/dir/file',
+        io.BytesIO(zlib.compress(content)))
+    body = b''
+    while True:
+        data = read_function(10)
+        assert len(data) <= 10
+        if not data:
+            break
+        body += data
+    head, datafile = body.split(b'filename="file"\r\n')
+    assert head.startswith(
+        b'--boundary\r\nContent-Disposition: form-data; name="parameters"'
+        b'\r\n\r\n{}\r\n--boundary\r\n')
+    datafile = datafile.split(b'\r\n\r\n', 1)[1]
+    assert datafile.endswith(b'\r\n--boundary--\r\n')
+    assert zlib.decompress(
+        datafile[:-len(b'\r\n--boundary--\r\n')]) == content
+
+
+def test_restclient_forward_url():
+    """Tests RESTClient._forward_url"""
+    from apyfal.client.rest import RESTClient
+    import apyfal.storage as srg
+
+    # Mock some accelerators parts
+    class DummyAccelerator(RESTClient):
+        """Dummy AcceleratorClient"""
+
+        def __init__(self, presigned_urls):
+            """Do not initialize"""
+            self._presigned_urls = presigned_urls
+            self._presigned_urls_expires = 60
+
+        def __del__(self):
+            """Do nothing"""
+
+    srg_presigned_url = srg.presigned_url
+    srg.presigned_url = lambda url, mode, expires: (
+        None if url.startswith('http') else
+        'https://%s/%s/%d' % (url.split('://')[1], mode, expires))
+
+    try:
+        # Test: Disabled
+        assert DummyAccelerator(False)._forward_url(
+            's3://bucket/key', 'rb') == 's3://bucket/key'
+
+        # Test: Enabled
+        client = DummyAccelerator(True)
+        assert client._forward_url(
+            's3://bucket/key', 'wb') == 'https://bucket/key/wb/60'
+
+        # Test: Not supported by storage
+        assert client._forward_url(
+            'http://accelize.com', 'rb') == 'http://accelize.com'
+    finally:
+        srg.presigned_url = srg_presigned_url
@@ -465,3 +465,137 @@ def test_subsections(tmpdir):
 
     assert 'key1' in config['section']
     assert 'key10' not in config['section']
+
+
+def test_configuration_files_cache(tmpdir):
+    """Test parsed configuration files cache"""
+    from io import BytesIO
+    import apyfal.configuration as cfg
+
+    config_file = tmpdir.join(cfg.Configuration.DEFAULT_CONFIG_FILE)
+    config_file.write('[host]\nhost_type = AWS\n')
+    config_path = str(config_file)
+
+    # Counts files parsing
+    parsed = []
+    config_parser = cfg.ConfigParser
+
+    class ConfigParser(config_parser):
+        """Counting ConfigParser"""
+
+        def __init__(self, *args, **kwargs):
+            parsed.append(1)
+            config_parser.__init__(self, *args, **kwargs)
+
+    cfg.ConfigParser = ConfigParser
+    try:
+        # Test: File parsed only once
+        config1 = cfg.Configuration(config_path)
+        config2 = cfg.Configuration(config_path)
+        assert len(parsed) == 1
+        assert config1['host']['host_type'] == 'AWS'
+        assert config2['host']['host_type'] == 'AWS'
+
+        # Test: Each configuration has its own parameters
+        config1['host']['host_type'] = 'OpenStack'
+        config1['host']['region'] = 'region'
+        assert config2['host']['host_type'] == 'AWS'
+        assert config2['host']['region'] is None
+        assert cfg.Configuration(config_path)['host']['host_type'] == 'AWS'
+        assert len(parsed) == 1
+
+        # Test: Modified file parsed again
+        config_file.write('[host]\nhost_type = OVH\n')
+        os.utime(config_path, (0, 0))
+        assert cfg.Configuration(config_path)['host']['host_type'] == 'OVH'
+        assert len(parsed) == 2
+
+        # Test: File-like objects not cached
+        for _ in range(2):
+            config = cfg.Configuration(BytesIO(b'[host]\nhost_type = AWS\n'))
+            assert config['host']['host_type'] == 'AWS'
+        assert len(parsed) == 4
+    finally:
+        cfg.ConfigParser = config_parser
+
+
+def test_compiled_configuration():
+    """Tests CompiledConfiguration"""
+    import apyfal.configuration as cfg
+
+    config = cfg.Configuration(None)
+    config['section']['key1'] = '1'
+    config['section']['key2'] = 'value'
+    config['section']['key3'] = '[1, 2]'
+    config['section.sub']['key1'] = '2'
+    config['section.sub']['key4'] = 'True'
+
+    # Tests: Literal values and inheritance
+    compiled = config.compiled
+    assert config.compiled is compiled
+    section = compiled['section.sub']
+    assert section.name == 'section.sub'
+    assert section['key1'] == 2
+    assert section['key2'] == 'value'
+    assert section['key3'] == [1, 2]
+    assert section['key4'] is True
+    assert section['key5'] is None
+    assert section.get('key5', 'default') == 'default'
+    assert section.get_literal('key1') == 2
+    assert 'key2' in section
+    assert 'key5' not in section
+    assert sorted(section) == ['key1', 'key2', 'key3', 'key4']
+    assert compiled['section']['key1'] == 1
+    assert 'key4' not in compiled['section']
+    assert compiled['section.sub'] is section
+    assert not len(compiled['no_section'])
+    assert 'section' in compiled
+    assert 'no_section' not in compiled
+
+    # Tests: Hash and equality
+    other = cfg.Configuration(None)
+    for section_name in ('section', 'section.sub'):
+        for key, value in config[section_name].items():
+            other[section_name][key] = value
+    assert other.compiled == compiled
+    assert hash(other.compiled) == hash(compiled)
+    assert other.compiled['section.sub'] == section
+    assert hash(other.compiled['section.sub']) == hash(section)
+    assert compiled['section'] != section
+    assert {section: 1}[other.compiled['section.sub']] == 1
+
+    # Tests: Not hashable values set programmatically
+    first = cfg.Configuration(None)
+    second = cfg.Configuration(None)
+    for configuration in (first, second):
+        configuration['section']['key1'] = ['a', {'b': [1]}]
+        configuration['section']['key2'] = {'c': set([2])}
+    first_section = first.compiled['section']
+    assert first_section['key1'] == ['a', {'b': [1]}]
+    assert hash(second.compiled['section']) == hash(first_section)
+    assert second.compiled['section'] == first_section
+    assert hash(second.compiled) == hash(first.compiled)
+    assert second.compiled == first.compiled
+    second['section']['key1'] = ['a', {'b': [2]}]
+    assert second.compiled['section'] != first_section
+    assert second.compiled != first.compiled
+
+    # Tests: Update on configuration change
+    config['section']['key2'] = 'other_value'
+    assert config.compiled is not compiled
+    assert config.compiled['section.sub']['key2'] == 'other_value'
+    assert config.compiled != other.compiled
+    compiled = config.compiled
+    del config['section']['key2']
+    assert config.compiled is not compiled
+    assert config.compiled['section.sub']['key2'] is None
+
+    # Tests: Retry policies shared by section with same policy parameters
+    assert config.get_retry_policy('section') is other.get_retry_policy(
+        'section')
+    assert config.get_retry_policy(
+        'section') is not config.get_retry_policy('section.sub')
+    other['section']['retry_max'] = '1'
+    assert config.get_retry_policy('section') is not other.get_retry_policy(
+        'section')
+    assert other.get_retry_policy('section').max_retries == 1
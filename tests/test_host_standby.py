@@ -0,0 +1,183 @@
+# coding=utf-8
+"""apyfal.host.standby tests"""
+from threading import Event
+import time
+
+import pytest
+
+
+def wait_for(condition, timeout=5.0):
+    """Waits until condition is True"""
+    end = time.time() + timeout
+    while not condition():
+        assert time.time() < end, 'Timeout'
+        time.sleep(0.01)
+
+
+def test_standby_pool():
+    """Tests StandbyPool"""
+    from apyfal.configuration import Configuration
+    from apyfal.exceptions import HostConfigurationException
+    from apyfal.host import Host
+    from apyfal.host._csp import CSPHost
+    import apyfal.host.standby as standby
+
+    # Mocks CSP instances
+    instances = dict()
+    tags = dict()
+    can_create = Event()
+    can_create.set()
+
+    class DummyCSP(CSPHost):
+        """Dummy CSP"""
+        NAME = 'DummyStandby'
+
+        def _set_accelerator_requirements(self, accelerator=None, *_, **__):
+            """Do not request requirements"""
+            self._accelerator = accelerator
+
+        def _check_credential(self):
+            """Do nothing"""
+
+        def _init_key_pair(self):
+            """Do nothing"""
+            return True
+
+        def _create_instance(self):
+            """Do nothing"""
+
+        def _start_new_instance(self):
+            """Creates instance"""
+            can_create.wait()
+            instance_id = 'instance_%d' % len(tags)
+            instances[instance_id] = 'running'
+            tags[instance_id] = None
+            return instance_id, instance_id
+
+        def _start_existing_instance(self, status):
+            """Starts instance"""
+            instances[self._instance_id] = 'running'
+
+        def _get_instance(self):
+            """Returns instance"""
+            return self._instance_id if self._instance_id in instances \
+                else None
+
+        def _get_status(self):
+            """Returns status"""
+            return instances[self._instance_id]
+
+        def _get_public_ip(self):
+            """Returns IP"""
+            return '127.0.0.1'
+
+        def _get_private_ip(self):
+            """Returns IP"""
+            return '127.0.0.1'
+
+        def _wait_instance_boot(self):
+            """Do nothing"""
+
+        def _tag_instance(self, instance_tags):
+            """Tags instance"""
+            tags[self._instance_id] = instance_tags
+
+        def _terminate_instance(self):
+            """Terminates instance"""
+            del instances[self._instance_id]
+
+        def _pause_instance(self):
+            """Stops instance"""
+            instances[self._instance_id] = 'stopped'
+
+    class DummyKeepCSP(DummyCSP):
+        """Dummy CSP not able to stop instances"""
+        NAME = 'DummyStandbyKeep'
+        STANDBY_MODES = ('keep',)
+
+    # Mocks accelerator
+    class DummyAccelerator(object):
+        """Dummy apyfal.Accelerator"""
+
+        def __init__(self, accelerator=None, config=None, host_type=None,
+                     stop_mode='term', **host_kwargs):
+            self.host = Host(host_type=host_type, config=config,
+                             stop_mode=stop_mode, **host_kwargs)
+            self.client = self.Client()
+
+        class Client(object):
+            """Dummy client"""
+
+            @staticmethod
+            def stop():
+                """Do nothing"""
+
+        def start(self):
+            """Starts host"""
+            self.host.start(accelerator='dummy_accelerator')
+
+        def stop(self, stop_mode=None):
+            """Stops host"""
+            self.host.stop(stop_mode)
+
+    accelerator_class = standby._Accelerator
+    standby._Accelerator = DummyAccelerator
+
+    config = Configuration()
+    kwargs = dict(config=config, region='dummy_region',
+                  client_id='dummy_client_id')
+    try:
+        # Tests: Only CSP hosts
+        with pytest.raises(HostConfigurationException):
+            standby.StandbyPool('dummy_accelerator', config=config)
+
+        # Tests: Standby mode supported by host
+        assert standby.StandbyPool(
+            'dummy_accelerator', host_type='DummyStandbyKeep',
+            standby_mode='stop', **kwargs).standby_mode == 'keep'
+
+        pool = standby.StandbyPool(
+            'dummy_accelerator', size=1, host_type='DummyStandby', **kwargs)
+        assert pool.size == 1
+        assert pool.standby_mode == 'stop'
+
+        with pool:
+            # Tests: Pool filled in background with stopped tagged instances
+            wait_for(lambda: pool.instance_ids)
+            instance_id = pool.instance_ids[0]
+            assert instances == {instance_id: 'stopped'}
+            assert tags[instance_id] == {
+                standby.STANDBY_TAG: 'dummy_accelerator'}
+
+            # Tests: Accelerator use standby instance, pool replenished
+            can_create.clear()
+            accelerator = pool.get()
+            assert accelerator.host.instance_id == instance_id
+            assert accelerator.host.stop_mode == 'stop'
+            assert not pool.instance_ids
+            accelerator.start()
+            assert instances[instance_id] == 'running'
+
+            # Tests: Released instance put back in standby, replenished
+            # instance not needed anymore
+            pool.release(accelerator)
+            assert pool.instance_ids == [instance_id]
+            assert instances[instance_id] == 'stopped'
+            can_create.set()
+            wait_for(lambda: len(tags) == 2 and len(instances) == 1)
+            assert pool.instance_ids == [instance_id]
+
+            # Tests: Released instance terminated if pool full
+            accelerator = pool.get()
+            accelerator.start()
+            wait_for(lambda: len(pool.instance_ids) == 1)
+            pool.release(accelerator)
+            assert instance_id not in instances
+            assert pool.instance_ids != [instance_id]
+
+        # Tests: Standby instances terminated with pool
+        assert not instances
+
+    finally:
+        can_create.set()
+        standby._Accelerator = accelerator_class
@@ -0,0 +1,300 @@
+# coding=utf-8
+"""apyfal.pool tests"""
+from io import BytesIO
+from threading import Lock
+import time
+
+import pytest
+
+
+def test_splitters():
+    """Tests RecordSplitter and LineSplitter"""
+    from apyfal.pool import RecordSplitter, LineSplitter, Splitter, Merger
+
+    # Base classes are abstract
+    for base in (Splitter, Merger):
+        with pytest.raises(TypeError):
+            base()
+
+    # Shards sizes must be positive
+    for size in (0, -1):
+        with pytest.raises(ValueError):
+            RecordSplitter(size)
+        with pytest.raises(ValueError):
+            LineSplitter(size)
+
+    lines = [('line%d\n' % index).encode() * (index % 3 + 1)
+             for index in range(100)]
+    content = b''.join(lines)
+
+    # Record splitter
+    for delimiter in (b'\n', b'e1'):
+        shards = list(RecordSplitter(
+            30, delimiter=delimiter, chunk_size=7).split(BytesIO(content)))
+        assert b''.join(shards) == content
+        for shard in shards[:-1]:
+            assert len(shard) >= 30
+            assert shard.endswith(delimiter)
+            assert delimiter not in shard[29:-len(delimiter)]
+
+    # Record splitter: No delimiter
+    assert list(RecordSplitter(10).split(BytesIO(b'a' * 100))) == [b'a' * 100]
+
+    # Line splitter
+    content = b''.join(('line%d\n' % index).encode() for index in range(100))
+    for chunk_size, block_size in ((7, 65536), (1000, 16)):
+        splitter = LineSplitter(15, chunk_size=chunk_size)
+        find_lines_end = splitter._find_lines_end
+        splitter._find_lines_end = (
+            lambda *args: find_lines_end(*args, block_size=block_size))
+        shards = list(splitter.split(BytesIO(content)))
+        assert b''.join(shards) == content
+        assert len(shards) == 7
+        for shard in shards[:-1]:
+            assert shard.count(b'\n') == 15
+        assert shards[-1].count(b'\n') == 10
+
+    # Line splitter: No final new line
+    assert list(LineSplitter(2).split(BytesIO(b'a\nb\nc'))) == [
+        b'a\nb\n', b'c']
+
+
+def test_accelerator_pool():
+    """Tests AcceleratorPool"""
+    from apyfal.pool import AcceleratorPool, RecordSplitter, Merger
+    from apyfal.exceptions import (
+        ClientConfigurationException, ClientRuntimeException)
+    import apyfal.storage as srg
+
+    running = []
+    lock = Lock()
+
+    class DummyAccelerator(object):
+        """Dummy accelerator converting input to upper case"""
+
+        def __init__(self, name):
+            self.name = name
+            self.stopped = False
+            self.running = False
+
+        def process(self, file_in=None, file_out=None, info_dict=False,
+                    **parameters):
+            """Converts to upper case"""
+            # Checks accelerator processes one job at a time
+            assert not self.running
+            self.running = True
+            with lock:
+                running.append(self.name)
+            try:
+                data = bytes(file_in)
+                if data == b'error\n':
+                    raise ClientRuntimeException('error')
+
+                # Reverses completion order of first shards
+                time.sleep(0.02 if data.startswith(b'0') else 0.0)
+                if file_out is not None:
+                    srg.copy(data.upper(), file_out)
+                result = {'shard': data.split(b'\n')[0].decode(),
+                          'parameters': parameters}
+                return (result, {'app': {}}) if info_dict else result
+            finally:
+                self.running = False
+
+        def stop(self, stop_mode=None):
+            """Stops"""
+            self.stopped = stop_mode or True
+
+    # Test: No accelerators
+    with pytest.raises(ClientConfigurationException):
+        AcceleratorPool([])
+
+    accelerators = [DummyAccelerator(index) for index in range(3)]
+    content = b''.join(('%d record\n' % index).encode()
+                       for index in range(100))
+
+    with AcceleratorPool(accelerators) as pool:
+        assert pool.accelerators == accelerators
+
+        # Test: Single process
+        file_out = bytearray()
+        assert pool.process(b'abc', file_out, key='value') == {
+            'shard': 'abc', 'parameters': {'key': 'value'}}
+        assert file_out == b'ABC'
+
+        # Test: Sharded process, outputs merged in order
+        file_out = BytesIO()
+        results = pool.process_sharded(
+            content, file_out, splitter=RecordSplitter(50), max_pending=4,
+            key='value')
+        assert file_out.getvalue() == content.upper()
+        assert [result['shard'] for result in results] == [
+            shard.split(b'\n')[0].decode() for shard in
+            RecordSplitter(50).split(BytesIO(content))]
+        assert results[0]['parameters'] == {'key': 'value'}
+        assert len(set(running)) == 3
+
+        # Test: Info dict and no output
+        results = pool.process_sharded(content, info_dict=True)
+        assert results == [({'shard': '0 record', 'parameters': {}},
+                            {'app': {}})]
+
+        # Test: Custom merger
+        class LineCountMerger(Merger):
+            """Writes line count"""
+
+            def __init__(self):
+                self.lines = 0
+
+            def write(self, output, stream):
+                """Counts lines"""
+                self.lines += bytes(output).count(b'\n')
+
+            def close(self, stream):
+                """Writes count"""
+                stream.write(str(self.lines).encode())
+
+        file_out = BytesIO()
+        pool.process_sharded(content, file_out, merger=LineCountMerger())
+        assert file_out.getvalue() == b'100'
+
+        # Test: Error in a shard
+        with pytest.raises(ClientRuntimeException):
+            pool.process_sharded(
+                content + b'error\n', BytesIO(), splitter=RecordSplitter(1))
+
+    # Test: Accelerators stopped with pool
+    for accelerator in accelerators:
+        assert accelerator.stopped is True
+
+
+def test_accelerator_pool_hedging():
+    """Tests AcceleratorPool hedged jobs"""
+    from threading import Event
+    from apyfal.pool import AcceleratorPool
+    from apyfal.exceptions import ClientRuntimeException
+
+    class DummyClient(object):
+        """Dummy client, waits "stall" seconds or until cancelled"""
+
+        def __init__(self, name):
+            self.name = name
+            self.stall = 0
+            self.fail = False
+            self.cancelled = Event()
+            self.outputs = []
+
+        def process(self, file_in=None, file_out=None, info_dict=False,
+                    **_):
+            """Writes name in output"""
+            self.outputs.append(file_out)
+            self.cancelled.clear()
+            if self.stall and self.cancelled.wait(self.stall):
+                raise ClientRuntimeException('Process cancelled')
+            if self.fail:
+                raise ClientRuntimeException('error')
+            file_out.write(self.name.encode())
+            return {}, {'app': {'profiling': {'wall-clock-time': '0.01'}}}
+
+        def cancel(self):
+            """Cancels process"""
+            self.cancelled.set()
+
+        def stop(self):
+            """Stops"""
+
+    class DummyAccelerator(object):
+        """Dummy accelerator"""
+
+        def __init__(self, name):
+            self.client = DummyClient(name)
+
+        def process(self, **kwargs):
+            """Processes with client"""
+            return self.client.process(**kwargs)
+
+        def stop(self, stop_mode=None):
+            """Stops"""
+
+    slow, fast = DummyAccelerator('slow'), DummyAccelerator('fast')
+    with AcceleratorPool([slow, fast], hedge_percentile=90,
+                         hedge_min_samples=4) as pool:
+
+        # Test: Not enough latency samples
+        assert pool.hedge_delay is None
+        for _ in range(4):
+            pool.process(b'data', BytesIO())
+        assert pool.hedge_delay == 0.01
+
+        # Test: Stalled job hedged, other job cancelled
+        slow.client.stall = 5
+        del slow.client.outputs[:], fast.client.outputs[:]
+        hedged = []
+        for _ in range(2):
+            file_out = BytesIO()
+            response = pool.process(b'data', file_out, info_dict=True)[1]
+            hedged.append(response['app'].get('hedged', False))
+            assert file_out.getvalue() == b'fast'
+        assert any(hedged)
+        assert slow.client.cancelled.is_set()
+
+        # Test: Cancelled job accelerator back in idle, its output closed
+        end = time.time() + 5
+        while pool._idle.qsize() != 2:
+            assert time.time() < end
+            time.sleep(0.01)
+        assert all(output.closed for output in slow.client.outputs)
+        assert all(output.closed for output in fast.client.outputs)
+
+        # Test: First job failure, other job result used
+        slow.client.stall = 0.05
+        slow.client.fail = True
+        fast.client.stall = 0.5
+        file_out = BytesIO()
+        response = pool.process(b'data', file_out, info_dict=True)[1]
+        assert response['app']['hedged']
+        assert file_out.getvalue() == b'fast'
+
+        # Test: Input streams are not hedged
+        slow.client.fail = False
+        slow.client.stall = fast.client.stall = 0.05
+        response = pool.process(BytesIO(b'data'), BytesIO(), info_dict=True)[1]
+        assert 'hedged' not in response['app']
+
+        # Test: All jobs failure
+        slow.client.fail = fast.client.fail = True
+        with pytest.raises(ClientRuntimeException):
+            pool.process(b'data', BytesIO())
+
+
+def test_accelerator_pool_health():
+    """Tests AcceleratorPool skips unavailable hosts"""
+    from apyfal.pool import AcceleratorPool
+    from apyfal.client._health import HostHealth
+
+    class DummyClient(object):
+        """Dummy client with host health"""
+
+        def __init__(self, name):
+            self.name = name
+            self.health = HostHealth(name, max_failures=1, reset_timeout=60)
+
+        def process(self, file_in=None, file_out=None, info_dict=False,
+                    **_):
+            """Returns name"""
+            return self.name, {'app': {}}
+
+        def stop(self):
+            """Stops"""
+
+    down, up = DummyClient('down'), DummyClient('up')
+    down.health.record_failure()
+    with AcceleratorPool([down, up]) as pool:
+
+        # Test: Unavailable host skipped
+        for _ in range(3):
+            assert pool.process(b'data') == 'up'
+        assert pool._idle.qsize() == 2
+
+        # Test: Unavailable host used if no other accelerator
+        assert pool._acquire() is up
+        assert pool._acquire() is down
@@ -4,6 +4,8 @@
 from io import BytesIO
 from shutil import copyfileobj
 
+import pytest
+
 
 def test_storage_hook():
     """Tests _StorageHook"""
@@ -54,6 +56,61 @@ def test_storage_hook():
         srg._STORAGE.clear()
 
 
+def test_storage_hook_concurrency():
+    """Tests _StorageHook with threads and forked processes"""
+    from multiprocessing.pool import ThreadPool
+    from threading import Lock
+    from time import sleep
+    import apyfal.storage as srg
+
+    # Mock Storage
+    instances = []
+    instances_lock = Lock()
+
+    class DummyStorage:
+
+        storage_id = 'dummy'
+
+        def __init__(self, storage_type=None, **parameters):
+            self.parameters = parameters
+            sleep(0.01)
+            with instances_lock:
+                instances.append(self)
+
+    srg_storage = srg.Storage
+    srg.Storage = DummyStorage
+
+    # Tests
+    try:
+        # Storage instantiated once on concurrent first use
+        hook = srg._StorageHook()
+        pool = ThreadPool(8)
+        try:
+            storages = pool.map(lambda _: hook['dummy'], range(32))
+        finally:
+            pool.terminate()
+        assert len(instances) == 1
+        assert all(storage is instances[0] for storage in storages)
+
+        # Registered parameters
+        storage = hook.register('dummy', max_workers=4)
+        assert hook['dummy'] is storage
+        assert storage.parameters == {'max_workers': 4}
+
+        # Forked process: Instantiated again with same parameters
+        hook._pid = -1
+        assert hook['dummy'] is not storage
+        assert hook['dummy'].parameters == {'max_workers': 4}
+
+        # Clear parameters
+        hook.clear()
+        assert hook['dummy'].parameters == {}
+
+    # Restore Storage
+    finally:
+        srg.Storage = srg_storage
+
+
 def test_parse_url():
     """Tests parse_url"""
     from apyfal.storage import parse_url
@@ -78,6 +135,12 @@ def test_parse_url():
     assert parse_url('storage.name://path/on/storage') == (
         'storage.name', 'path/on/storage')
 
+    # Tests stream and buffer
+    stream = BytesIO()
+    assert parse_url(stream) == ('stream', stream)
+    buffer = bytearray()
+    assert parse_url(buffer) == ('buffer', buffer)
+
 
 def test_open(tmpdir):
     """Tests open"""
@@ -154,7 +217,9 @@ def test_open(tmpdir):
 
 def test_copy(tmpdir):
     """Tests copy"""
-    from apyfal.storage import copy, _STORAGE, Storage
+    import hashlib
+    from apyfal.storage import copy, open as open_url, _STORAGE, Storage
+    from apyfal.exceptions import StorageRuntimeException
 
     # Initializes local file source
     content = 'dummy_content'.encode()
@@ -290,6 +355,52 @@ def test_copy(tmpdir):
         assert _STORAGE['dummy2'].storage_to_storage
         assert _STORAGE['dummy2'].stream.read() == content
 
+        # Checksum: Local to local
+        md5 = hashlib.md5(content).hexdigest()
+        assert copy(tmp_src_path, tmp_dst_path) is None
+        assert copy(tmp_src_path, tmp_dst_path, checksum='md5') == md5
+        assert tmp_dst.read_binary() == content
+        tmp_dst.remove()
+
+        # Checksum: Local to storage and storage to local, verified
+        DummyStorage.SUPPORTS_CHECKSUM_METADATA = True
+        DummyStorage.get_metadata = lambda *_: {'md5': md5}
+        assert copy(tmp_src_path, 'dummy1://path', checksum='md5') == md5
+        assert copy('dummy1://path', tmp_dst_path, checksum='md5') == md5
+        assert tmp_dst.read_binary() == content
+        tmp_dst.remove()
+
+        # Checksum: Storage to storage, through local machine
+        _STORAGE['dummy2'].storage_to_storage = False
+        checksum = hashlib.sha256()
+        assert copy('dummy1://path', 'dummy2://path',
+                    checksum=checksum) == checksum.hexdigest()
+        assert checksum.hexdigest() == hashlib.sha256(content).hexdigest()
+        assert not _STORAGE['dummy2'].storage_to_storage
+        assert _STORAGE['dummy2'].stream.read() == content
+
+        # Checksum: Mismatch with storage MD5
+        DummyStorage.get_metadata = lambda *_: {'md5': '0' * 32}
+        with pytest.raises(StorageRuntimeException):
+            copy(tmp_src_path, 'dummy1://path', checksum='md5')
+        with pytest.raises(StorageRuntimeException):
+            copy('dummy1://path', BytesIO(), checksum='md5')
+
+        # Checksum: Upload not verified if storage does not provide MD5
+        DummyStorage.SUPPORTS_CHECKSUM_METADATA = False
+        assert copy(tmp_src_path, 'dummy1://path', checksum='md5') == md5
+
+        # Checksum: Open
+        DummyStorage.get_metadata = lambda *_: {'md5': md5}
+        checksum = hashlib.md5()
+        with open_url('dummy1://path', 'rb', checksum=checksum) as file:
+            assert file.read() == content
+        assert checksum.hexdigest() == md5
+        checksum = hashlib.md5()
+        with open_url(BytesIO(content), 'rb', checksum=checksum) as file:
+            assert file.read() == content
+        assert checksum.hexdigest() == md5
+
     # Clear registered storage
     finally:
         _STORAGE.clear()
@@ -303,3 +414,155 @@ def test_storage():
     storage = Storage('http')
     assert storage.NAME == 'HTTP'
     assert storage.storage_id == 'http'
+
+
+def test_presigned_url():
+    """Tests presigned_url"""
+    import apyfal.storage as srg
+
+    # Mocks storage
+    class DummyStorage(srg.Storage):
+        """Dummy storage"""
+
+        @staticmethod
+        def get_presigned_url(path, mode, expires):
+            """Returns dummy URL"""
+            return 'https://%s/%s/%d' % (path, mode, expires)
+
+        def copy_to_stream(self, source, stream):
+            """Do nothing"""
+
+        def copy_from_stream(self, stream, destination):
+            """Do nothing"""
+
+    srg._STORAGE['dummy'] = DummyStorage('dummy')
+    try:
+        # Tests: Storage URL
+        assert srg.presigned_url('dummy://path') == 'https://path/rb/3600'
+        assert srg.presigned_url(
+            'dummy://path', 'wb', 60) == 'https://path/wb/60'
+
+        # Tests: Not storage URL
+        for url in ('path', 'file://path', 'host://path', 'http://path'):
+            assert srg.presigned_url(url) is None
+    finally:
+        srg._STORAGE.clear()
+
+
+def test_open_pipe():
+    """Tests _open_pipe"""
+    import apyfal.storage as srg
+    from apyfal.exceptions import StorageRuntimeException
+
+    content = b'dummy_content' * 100000
+    stored = dict()
+
+    # Mocks storage, streaming content in small chunks
+    class DummyStorage(srg.Storage):
+        """Dummy storage"""
+        fail = False
+
+        def copy_to_stream(self, source, stream):
+            """Writes stored content in stream"""
+            data = stored[source]
+            for index in range(0, len(data), 4096):
+                if self.fail and index:
+                    raise StorageRuntimeException('error')
+                stream.write(data[index:index + 4096])
+
+        def copy_from_stream(self, stream, destination):
+            """Reads stream to stored content"""
+            if self.fail:
+                raise StorageRuntimeException('error')
+            stored[destination] = stream.read()
+
+    storage = srg._STORAGE['dummy'] = DummyStorage('dummy')
+    try:
+        # Tests: Write and read streamed content
+        with srg._open_pipe('dummy://path', 'wb') as stream:
+            assert not stream.seekable()
+            for index in range(0, len(content), 1000):
+                stream.write(content[index:index + 1000])
+        assert stored['path'] == content
+
+        with srg._open_pipe('dummy://path', 'rb') as stream:
+            assert not stream.seekable()
+            assert stream.read() == content
+
+        # Tests: Storage errors raised
+        storage.fail = True
+        with pytest.raises(StorageRuntimeException):
+            with srg._open_pipe('dummy://path', 'rb') as stream:
+                stream.read()
+        with pytest.raises(StorageRuntimeException):
+            with srg._open_pipe('dummy://path', 'wb') as stream:
+                for _ in range(100):
+                    stream.write(content)
+
+        # Tests: Not storage URL opened with "open"
+        buffer = bytearray()
+        with srg._open_pipe(buffer, 'wb') as stream:
+            stream.write(content)
+        assert buffer == content
+    finally:
+        srg._STORAGE.clear()
+
+
+def test_buffer_io(tmpdir):
+    """Tests _BufferIO"""
+    from array import array
+    from apyfal.storage import _BufferIO, copy, open as srg_open
+    from apyfal.exceptions import StorageRuntimeException
+
+    content = 'dummy_content'.encode()
+
+    # Read
+    stream = _BufferIO(content)
+    assert not stream.writable()
+    assert stream.read(5) == content[:5]
+    assert stream.tell() == 5
+    assert stream.read() == content[5:]
+    stream.seek(-7, 2)
+    assert stream.read() == content[-7:]
+
+    # Write in bytearray
+    buffer = bytearray(b'previous_content')
+    stream = _BufferIO(buffer, 'wb')
+    assert not buffer
+    assert stream.write(content) == len(content)
+    assert buffer == content
+    stream.truncate(5)
+    assert buffer == content[:5]
+
+    # Write in fixed size buffer
+    buffer = array('b', bytearray(len(content)))
+    stream = _BufferIO(buffer, 'wb')
+    stream.write(content)
+    assert buffer.tobytes() == content
+    with pytest.raises(StorageRuntimeException):
+        stream.write(content)
+
+    # Copy with buffer
+    file = tmpdir.join('file')
+    file_path = str(file)
+    copy(memoryview(content), file_path)
+    assert file.read_binary() == content
+
+    buffer = bytearray(b'previous_content')
+    copy(file_path, buffer)
+    assert buffer == content
+
+    buffer = bytearray()
+    copy(BytesIO(content), buffer)
+    assert buffer == content
+
+    stream = BytesIO()
+    copy(buffer, stream)
+    assert stream.getvalue() == content
+
+    with pytest.raises(StorageRuntimeException):
+        copy(file_path, memoryview(bytearray(len(content) - 1)))
+
+    # Open buffer
+    with srg_open(content, 'rt') as file:
+        assert file.read() == content.decode()
@@ -0,0 +1,143 @@
+# coding=utf-8
+"""apyfal.storage._cache tests"""
+
+import os
+
+
+def test_storage_cache(tmpdir):
+    """Tests StorageCache"""
+    from apyfal.storage import Storage
+    from apyfal.storage._cache import StorageCache
+
+    content = b'dummy_content'
+    metadata = {'etag': 'etag', 'last_modified': None, 'size': len(content)}
+    downloads = []
+
+    # Mocks storage
+    class DummyStorage(Storage):
+        """Dummy storage"""
+        NAME = 'dummy'
+
+        def get_metadata(self, path):
+            """Returns dummy metadata"""
+            return metadata
+
+        def copy_to_stream(self, source, stream):
+            """Write content in stream"""
+            downloads.append(source)
+            stream.write(content)
+
+        def copy_from_stream(self, stream, destination):
+            """Do nothing"""
+
+    storage = DummyStorage()
+    cache_dir = tmpdir.join('cache')
+    cache = StorageCache(str(cache_dir), max_size=len(content) * 2)
+
+    # Tests: Cache miss
+    dst = tmpdir.join('dst1')
+    cache.copy_to_local(storage, 'file1', str(dst))
+    assert dst.read_binary() == content
+    assert downloads == ['file1']
+    assert len(cache_dir.listdir()) == 1
+
+    # Tests: Cache hit
+    dst = tmpdir.join('dst2')
+    cache.copy_to_local(storage, 'file1', str(dst))
+    assert dst.read_binary() == content
+    assert downloads == ['file1']
+
+    # Tests: Destination is a writable copy not sharing cache entry
+    cached = str(cache_dir.listdir()[0])
+    assert not os.stat(cached).st_mode & 0o222
+    assert os.stat(str(dst)).st_ino != os.stat(cached).st_ino
+    assert os.stat(str(dst)).st_mode & 0o200
+    dst.write_binary(b'modified')
+    assert cache_dir.listdir()[0].read_binary() == content
+
+    # Tests: Temporary files can be linked to cache entry
+    dst = tmpdir.join('dst_tmp')
+    cache.copy_to_local(storage, 'file1', str(dst), link=True)
+    assert os.stat(str(dst)).st_ino == os.stat(cached).st_ino
+
+    # Tests: Modified file
+    metadata['etag'] = 'etag2'
+    dst = tmpdir.join('dst3')
+    cache.copy_to_local(storage, 'file1', str(dst))
+    assert downloads == ['file1', 'file1']
+    assert len(cache_dir.listdir()) == 2
+
+    # Tests: LRU eviction
+    cache_files = {str(path): os.stat(str(path)).st_mtime
+                   for path in cache_dir.listdir()}
+    older = min(cache_files, key=cache_files.get)
+    cache.copy_to_local(storage, 'file2', str(tmpdir.join('dst4')))
+    assert len(cache_dir.listdir()) == 2
+    assert older not in [str(path) for path in cache_dir.listdir()]
+
+    # Tests: File too big not cached
+    metadata['size'] = len(content) * 3
+    cache.copy_to_local(storage, 'file3', str(tmpdir.join('dst5')))
+    assert downloads[-1] == 'file3'
+    assert len(cache_dir.listdir()) == 2
+
+    # Tests: Not cacheable storage
+    metadata = None
+    cache.copy_to_local(storage, 'file4', str(tmpdir.join('dst6')))
+    assert tmpdir.join('dst6').read_binary() == content
+    assert len(cache_dir.listdir()) == 2
+
+
+def test_configure_cache(tmpdir):
+    """Tests configure_cache and copy with cache"""
+    import apyfal.storage as srg
+    from apyfal.storage._cache import StorageCache
+
+    called = {}
+
+    # Mocks cache
+    class DummyCache(StorageCache):
+        """Dummy cache"""
+
+        def copy_to_local(self, storage, source, local_path, link=False):
+            """Checks arguments"""
+            called['copy_to_local'] = (storage, source, local_path, link)
+
+    # Mocks storage
+    class DummyStorage(srg.Storage):
+        """Dummy storage"""
+
+        def copy_to_stream(self, source, stream):
+            """Write content in stream"""
+            called['copy_to_stream'] = source
+            stream.write(b'content')
+
+        def copy_from_stream(self, stream, destination):
+            """Do nothing"""
+
+    srg._STORAGE['dummy'] = storage = DummyStorage('dummy')
+    dst = str(tmpdir.join('dst'))
+    try:
+        # Tests: Cache disabled
+        srg.configure_cache()
+        assert srg._get_local_cache() is None
+        srg.copy('dummy://path', dst)
+        assert called == {'copy_to_stream': 'path'}
+
+        # Tests: Cache enabled
+        called.clear()
+        srg.configure_cache(str(tmpdir.join('cache')), 1024)
+        assert isinstance(srg._get_local_cache(), StorageCache)
+        assert srg._get_local_cache().directory == str(tmpdir.join('cache'))
+        srg._LOCAL_CACHE['cache'] = DummyCache(str(tmpdir.join('cache')), 1024)
+        srg.copy('dummy://path', dst)
+        assert called == {'copy_to_local': (storage, 'path', dst, False)}
+
+        # Tests: Temporary files
+        called.clear()
+        srg._copy_to_tmp('dummy://path', dst)
+        assert called == {'copy_to_local': (storage, 'path', dst, True)}
+
+    finally:
+        srg._STORAGE.clear()
+        srg._LOCAL_CACHE.clear()
@@ -0,0 +1,138 @@
+# coding=utf-8
+"""apyfal.storage._checksum tests"""
+from base64 import b64encode
+import hashlib
+from io import BytesIO
+import os
+from zlib import crc32
+
+import pytest
+
+
+def test_new():
+    """Tests new"""
+    import apyfal.storage._checksum as checksum
+    from apyfal.exceptions import StorageConfigurationException
+
+    content = os.urandom(1024)
+
+    # hashlib algorithms
+    for name in ('md5', 'SHA256'):
+        value = checksum.new(name)
+        value.update(content)
+        assert value.hexdigest() == hashlib.new(
+            name.lower(), content).hexdigest()
+
+    # CRC32
+    value = checksum.new('crc32')
+    value.update(content[:100])
+    value.update(content[100:])
+    assert value.name == 'crc32'
+    assert value.hexdigest() == '%08x' % (crc32(content) & 0xffffffff)
+    assert len(value.digest()) == 4
+
+    # Optional packages not installed
+    crc32c = checksum._crc32c
+    xxhash = checksum._xxhash
+    checksum._crc32c = None
+    checksum._xxhash = None
+    try:
+        for name in ('crc32c', 'xxh64'):
+            with pytest.raises(StorageConfigurationException):
+                checksum.new(name)
+    finally:
+        checksum._crc32c = crc32c
+        checksum._xxhash = xxhash
+
+    # Unknown algorithm
+    with pytest.raises(StorageConfigurationException):
+        checksum.new('not_exists')
+
+
+def test_md5_from_metadata():
+    """Tests md5_from_etag and md5_from_content_md5"""
+    from apyfal.storage._checksum import md5_from_etag, md5_from_content_md5
+
+    md5 = hashlib.md5(b'content')
+
+    # ETag
+    assert md5_from_etag('"%s"' % md5.hexdigest().upper()) == md5.hexdigest()
+    assert md5_from_etag('"%s-2"' % md5.hexdigest()) is None
+    assert md5_from_etag(None) is None
+
+    # Content-MD5
+    assert md5_from_content_md5(
+        b64encode(md5.digest()).decode()) == md5.hexdigest()
+    assert md5_from_content_md5('not_base64!') is None
+
+
+def test_verify():
+    """Tests verify"""
+    from apyfal.storage._checksum import verify
+    from apyfal.exceptions import StorageRuntimeException
+
+    md5 = hashlib.md5(b'content')
+
+    # Valid, no metadata or not MD5
+    verify(md5, {'md5': md5.hexdigest()}, 'url')
+    verify(md5, {'md5': None}, 'url')
+    verify(md5, None, 'url')
+    verify(hashlib.sha1(), {'md5': md5.hexdigest()}, 'url')
+
+    # Mismatch
+    with pytest.raises(StorageRuntimeException):
+        verify(hashlib.md5(), {'md5': md5.hexdigest()}, 'url')
+
+
+def test_checksum_reader():
+    """Tests ChecksumReader"""
+    from apyfal.storage._checksum import ChecksumReader
+    from apyfal.exceptions import StorageRuntimeException
+
+    content = os.urandom(1024)
+    expected = hashlib.md5(content).hexdigest()
+
+    # Read by chunks and until end
+    md5 = hashlib.md5()
+    reader = ChecksumReader(BytesIO(content), md5)
+    assert reader.readable()
+    assert reader.seekable()
+    assert reader.read(100) == content[:100]
+    buffer = bytearray(100)
+    assert reader.readinto(buffer) == 100
+    assert buffer == content[100:200]
+    assert reader.tell() == 200
+    assert reader.read() == content[200:]
+    assert md5.hexdigest() == expected
+
+    # Data read again after backward seek not hashed twice
+    md5 = hashlib.md5()
+    reader = ChecksumReader(BytesIO(content), md5)
+    reader.read(200)
+    assert reader.seek(100) == 100
+    assert reader.read(200) == content[100:300]
+    reader.read()
+    assert md5.hexdigest() == expected
+
+    # Skipped data
+    reader = ChecksumReader(BytesIO(content), hashlib.md5())
+    reader.seek(100)
+    with pytest.raises(StorageRuntimeException):
+        reader.read(10)
+
+
+def test_checksum_writer():
+    """Tests ChecksumWriter"""
+    from apyfal.storage._checksum import ChecksumWriter
+
+    content = os.urandom(1024)
+    md5 = hashlib.md5()
+    stream = BytesIO()
+    writer = ChecksumWriter(stream, md5)
+    assert writer.writable()
+    assert not writer.seekable()
+    assert writer.write(content[:100]) == 100
+    assert writer.write(memoryview(content)[100:]) == 924
+    writer.flush()
+    assert stream.getvalue() == content
+    assert md5.hexdigest() == hashlib.md5(content).hexdigest()
@@ -18,17 +18,33 @@ def test_storage_http():
     # Mocks requests in utilities
 
     dummy_url = 'http://www.accelize.com'
+    presigned_url = dummy_url + '?temp_url_sig=sig&temp_url_expires=1'
     content = 'dummy_content'.encode()
 
+    class Raw:
+        """Fake urllib3.HTTPResponse"""
+
+        @staticmethod
+        def stream(chunk_size, **_):
+            """Yields content by chunks"""
+            for index in range(0, len(content), chunk_size):
+                yield content[index:index + chunk_size]
+
     class GetResponse:
         """Fake requests.Response"""
 
-        raw = BytesIO(content)
+        raw = Raw()
+        status_code = 200
+        headers = {}
 
         @staticmethod
         def raise_for_status():
             """Do nothing"""
 
+        @staticmethod
+        def close():
+            """Do nothing"""
+
     class PostResponse:
         """Fake requests.Response"""
 
@@ -59,6 +75,17 @@ def test_storage_http():
             # Returns fake response
             return PostResponse()
 
+        @staticmethod
+        def put(url, data=None, **_):
+            """Checks input arguments and returns fake response"""
+            # Checks input arguments
+            assert url == presigned_url
+            data.seek(0)
+            assert data.read() == content
+
+            # Returns fake response
+            return PostResponse()
+
     # Monkey patch requests in utilities
     requests_session = requests.Session
     requests.Session = DummySession
@@ -77,6 +104,129 @@ def test_storage_http():
         # Write
         storage.copy_from_stream(stream, dummy_url)
 
+        # Write to pre-signed URL
+        storage.copy_from_stream(stream, presigned_url)
+
     # Restore requests
     finally:
         requests.Session = requests_session
+
+
+def test_storage_http_resume():
+    """Tests HTTPStorage.copy_to_stream resume and conditional requests"""
+    from apyfal.storage.http import HTTPStorage
+    import apyfal.exceptions as exc
+    import pytest
+
+    dummy_url = 'http://www.accelize.com'
+    content = 'dummy_content'.encode()
+    requests_headers = []
+    failures = [5]
+    support_range = [True]
+    fail_at_end = []
+
+    # Mocks requests in utilities
+    class Raw:
+        """Fake urllib3.HTTPResponse"""
+
+        def __init__(self, data):
+            self.data = data
+
+        def stream(self, chunk_size, **_):
+            """Yields content by chunks, fails after "failures" bytes"""
+            for index in range(0, len(self.data), chunk_size):
+                if failures and index >= failures[0]:
+                    failures.pop()
+                    raise requests.ConnectionError()
+                yield self.data[index:index + chunk_size]
+            if fail_at_end:
+                fail_at_end.pop()
+                raise requests.ConnectionError()
+
+    class GetResponse:
+        """Fake requests.Response"""
+
+        def __init__(self, headers):
+            self.headers = {'ETag': 'etag'}
+            start = 0
+            if headers.get('If-None-Match') == 'etag':
+                self.status_code = 304
+            elif 'Range' in headers and support_range[0]:
+                start = int(headers['Range'].split('=')[1].strip('-'))
+                self.status_code = 206 if start < len(content) else 416
+            else:
+                self.status_code = 200
+                self.headers['Content-Length'] = str(len(content))
+            self.raw = Raw(content[start:])
+
+        def raise_for_status(self):
+            """Raises on error status"""
+            if self.status_code >= 400:
+                raise requests.HTTPError()
+
+        @staticmethod
+        def close():
+            """Do nothing"""
+
+    class DummySession(requests.Session):
+        """Fake requests.Session"""
+
+        @staticmethod
+        def get(url, headers=None, **_):
+            """Returns fake response"""
+            assert url == dummy_url
+            requests_headers.append(dict(headers))
+            return GetResponse(headers)
+
+    requests_session = requests.Session
+    requests.Session = DummySession
+
+    try:
+        storage = HTTPStorage(chunk_size=1)
+
+        # Tests: Resume from last written offset
+        stream = BytesIO()
+        assert storage.copy_to_stream(dummy_url, stream)
+        assert stream.getvalue() == content
+        assert requests_headers[0]['Accept-Encoding'] == 'identity'
+        assert requests_headers[1]['Range'] == 'bytes=5-'
+        assert requests_headers[1]['If-Range'] == 'etag'
+
+        # Tests: Interrupted after last byte, range not satisfiable on
+        # resume means download complete
+        del requests_headers[:]
+        fail_at_end.append(True)
+        stream = BytesIO()
+        assert storage.copy_to_stream(dummy_url, stream)
+        assert stream.getvalue() == content
+        assert requests_headers[1]['Range'] == 'bytes=%d-' % len(content)
+
+        # Tests: Server ignore range, restarts from start
+        del requests_headers[:]
+        failures.append(5)
+        support_range[0] = False
+        stream = BytesIO()
+        assert storage.copy_to_stream(dummy_url, stream)
+        assert stream.getvalue() == content
+        assert len(requests_headers) == 2
+
+        # Tests: Too many failures
+        storage = HTTPStorage(chunk_size=1, max_resumes=0)
+        failures.append(5)
+        with pytest.raises(exc.StorageRuntimeException):
+            storage.copy_to_stream(dummy_url, BytesIO())
+
+        # Tests: Conditional request
+        stream = BytesIO()
+        assert not storage.copy_to_stream(dummy_url, stream, etag='etag')
+        assert not stream.getvalue()
+        assert storage.copy_to_stream(dummy_url, stream, etag='other_etag')
+        assert stream.getvalue() == content
+
+        # Tests: Decode content
+        storage = HTTPStorage(decode_content=True)
+        storage.copy_to_stream(dummy_url, BytesIO())
+        assert requests_headers[-1]['Accept-Encoding'] == 'gzip, deflate'
+
+    finally:
+        requests.Session = requests_session
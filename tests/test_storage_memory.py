@@ -0,0 +1,65 @@
+# coding=utf-8
+"""apyfal.storage.memory tests"""
+from io import BytesIO
+
+import pytest
+
+
+def test_memorystorage(tmpdir):
+    """Tests MemoryStorage"""
+    from mmap import mmap
+    import apyfal.configuration as cfg
+    from apyfal.exceptions import StorageResourceNotExistsException
+    from apyfal.storage import copy, Storage
+    from apyfal.storage.memory import MemoryStorage, _FILES
+
+    content = 'dummy_content'.encode()
+    storage = Storage('memory')
+    assert isinstance(storage, MemoryStorage)
+
+    # Tests: put and get without copy
+    buffer = bytearray(content)
+    storage.put('file', buffer)
+    view = storage.get('file')
+    assert view.obj is buffer
+    assert view.tobytes() == content
+
+    # Tests: Not existing file
+    storage.remove('file')
+    with pytest.raises(StorageResourceNotExistsException):
+        storage.get('file')
+
+    # Tests: Copy from and to streams and buffers
+    copy(BytesIO(content), 'memory://file')
+    stream = BytesIO()
+    copy('memory://file', stream)
+    assert stream.getvalue() == content
+
+    copy(content, 'memory://file2')
+    buffer = bytearray()
+    copy('memory://file2', buffer)
+    assert buffer == content
+
+    # Tests: Copy from local file
+    local_file = tmpdir.join('file')
+    local_file.write(content)
+    copy(str(local_file), 'memory://file3')
+    assert storage.get('file3').tobytes() == content
+    assert not isinstance(_FILES['file3'], mmap)
+
+    # Tests: Memory map file in accelerator temporary directory
+    tmp_root = cfg.ACCELERATOR_TMP_ROOT
+    cfg.ACCELERATOR_TMP_ROOT = str(tmpdir)
+    try:
+        copy(str(local_file), 'memory://file4')
+        assert isinstance(_FILES['file4'], mmap)
+        local_file.remove()
+        assert storage.get('file4').tobytes() == content
+
+        empty_file = tmpdir.join('empty')
+        empty_file.write(b'')
+        copy(str(empty_file), 'memory://file5')
+        assert storage.get('file5').tobytes() == b''
+    finally:
+        cfg.ACCELERATOR_TMP_ROOT = tmp_root
+        _FILES.clear()
@@ -40,3 +40,82 @@ def test_exception_handler():
 def test_s3class_real(tmpdir):
     """S3Storage in real case"""
     run_full_real_test_sequence('S3', tmpdir)
+
+
+def test_s3class_copy_from_s3():
+    """Tests S3Storage._copy_from_s3"""
+    from apyfal.storage.s3 import S3Storage
+
+    called = {}
+
+    # Mocks boto3 session and bucket
+    class DummyBucket:
+        """Dummy S3 bucket"""
+
+        def __init__(self, name):
+            self.name = name
+
+        def copy(self, copy_source, key, SourceClient=None, Config=None, **_):
+            """Checks arguments"""
+            called['copy'] = (self.name, copy_source, key, SourceClient, Config)
+
+    class DummyResource:
+        """Dummy S3 resource"""
+
+        def __init__(self):
+            self.meta = self
+            self.client = object()
+
+        @staticmethod
+        def Bucket(name):
+            """Returns dummy bucket"""
+            return DummyBucket(name)
+
+    class DummySession:
+        """Dummy boto3 session"""
+
+        @staticmethod
+        def resource(*_, **__):
+            """Returns dummy resource"""
+            called['resource'] = called.get('resource', 0) + 1
+            return DummyResource()
+
+    src_storage = S3Storage(client_id='dummy_id', secret_id='dummy_secret')
+    src_storage._session = DummySession()
+    dst_storage = S3Storage(
+        client_id='dummy_id', secret_id='dummy_secret',
+        max_pool_connections=20, multipart_threshold=1024)
+    dst_storage._session = DummySession()
+
+    # Tests: Configuration
+    assert dst_storage._client_config.max_pool_connections == 20
+    assert dst_storage._transfer_config.multipart_threshold == 1024
+
+    # Tests: Server side copy using source client
+    dst_storage.copy_from_storage(
+        src_storage, 'src_bucket/src/key', 'dst_bucket/dst/key')
+    assert called['copy'] == (
+        'dst_bucket', {'Bucket': 'src_bucket', 'Key': 'src/key'},
+        'dst/key', src_storage._client, dst_storage._transfer_config)
+
+    # Tests: Resource and buckets are cached
+    bucket = dst_storage._get_bucket('dst_bucket/key')[0]
+    dst_storage.copy_from_storage(
+        src_storage, 'src_bucket/src/key', 'dst_bucket/dst/key')
+    assert dst_storage._get_bucket('dst_bucket/key')[0] is bucket
+    assert called['resource'] == 2
+
+
+def test_s3class_presigned_url():
+    """Tests S3Storage.get_presigned_url"""
+    from apyfal.storage.s3 import S3Storage
+
+    storage = S3Storage(
+        client_id='dummy_id', secret_id='dummy_secret', region='eu-west-1')
+
+    # Tests: GET and PUT URL
+    url = storage.get_presigned_url('bucket/key', 'rb', 60)
+    assert url.startswith('https://')
+    assert 'bucket' in url and 'key' in url
+    assert 'Signature' in url
+    assert url != storage.get_presigned_url('bucket/key', 'wb', 60)
@@ -0,0 +1,302 @@
+# coding=utf-8
+"""apyfal.storage.swift tests"""
+
+import pytest
+import requests
+
+
+def test_swiftclass_copy_from_swift():
+    """Tests SwiftStorage._copy_from_swift"""
+    from apyfal.storage.swift import SwiftStorage
+    import apyfal.exceptions as exc
+
+    from collections import namedtuple
+    import json
+    import openstack
+
+    called = {}
+    status_code = 201
+    segments = []
+
+    # Mocks OpenStack session
+    def dummy_response():
+        """Returns dummy response"""
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = b''
+        return response
+
+    class DummyObjectStore:
+        """Dummy object store proxy"""
+
+        @staticmethod
+        def put(url, headers=None, **_):
+            """Checks arguments"""
+            called['put'] = (url, headers)
+            return dummy_response()
+
+        @staticmethod
+        def get_object_metadata(path, container=None):
+            """Returns destination metadata, Large object if segments"""
+            if not segments:
+                raise openstack.exceptions.NotFoundException()
+            return namedtuple('Object', 'is_static_large_object')(True)
+
+        @staticmethod
+        def get(url, params=None, **_):
+            """Returns destination manifest"""
+            response = requests.Response()
+            response.status_code = 200
+            response._content = json.dumps(
+                [{'name': segment} for segment in segments]).encode()
+            return response
+
+        @staticmethod
+        def delete(url, **_):
+            """Deletes segment"""
+            called.setdefault('delete', []).append(url)
+            response = requests.Response()
+            response.status_code = 204
+            return response
+
+    class DummySession:
+        """Dummy OpenStack connection"""
+        object_store = DummyObjectStore()
+
+    kwargs = dict(client_id='dummy_id', secret_id='dummy_secret',
+                  region='dummy_region', project_id='dummy_project',
+                  auth_url='dummy_url', interface='dummy_interface')
+
+    src_storage = SwiftStorage(**kwargs)
+    dst_storage = SwiftStorage(**kwargs)
+    dst_storage._session = DummySession()
+
+    # Tests: Server side copy in same cluster
+    dst_storage.copy_from_storage(
+        src_storage, 'src_container/src obj', 'dst_container/dst_obj')
+    assert called['put'] == (
+        '/dst_container/dst_obj',
+        {'X-Copy-From': '/src_container/src%20obj', 'Content-Length': '0'})
+    assert 'delete' not in called
+
+    # Tests: Overwritten large object segments deleted
+    segments[:] = ['/dst_container_segments/dst_obj/1/000000',
+                   '/dst_container_segments/dst_obj/1/000001']
+    dst_storage.copy_from_storage(
+        src_storage, 'src_container/src_obj', 'dst_container/dst_obj')
+    assert called['delete'] == segments
+    del segments[:]
+
+    # Tests: Source not found
+    status_code = 404
+    with pytest.raises(exc.StorageResourceNotExistsException):
+        dst_storage.copy_from_storage(
+            src_storage, 'src_container/src_obj', 'dst_container/dst_obj')
+
+    # Tests: Other errors
+    status_code = 500
+    with pytest.raises(exc.StorageRuntimeException):
+        dst_storage.copy_from_storage(
+            src_storage, 'src_container/src_obj', 'dst_container/dst_obj')
+
+    # Tests: Different cluster, use temporary file
+    called.clear()
+    kwargs['region'] = 'other_region'
+    src_storage = SwiftStorage(**kwargs)
+    dst_storage._copy_from_temporary = (
+        lambda *args: called.__setitem__('temporary', args))
+    dst_storage.copy_from_storage(
+        src_storage, 'src_container/src_obj', 'dst_container/dst_obj')
+    assert 'put' not in called
+    assert called['temporary'] == (
+        src_storage, 'src_container/src_obj', 'dst_container/dst_obj')
+
+
+def test_swiftclass_stream():
+    """Tests SwiftStorage.copy_to_stream and copy_from_stream"""
+    from collections import namedtuple
+    from io import BytesIO
+    import json
+    import openstack
+    from apyfal.storage.swift import SwiftStorage
+    import apyfal.exceptions as exc
+
+    objects = {}
+    manifests = set()
+
+    # Mocks OpenStack session
+    def dummy_response(status_code=201, content=b''):
+        """Returns dummy response"""
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = content
+        return response
+
+    class DummyObjectStore:
+        """Dummy object store proxy"""
+
+        @staticmethod
+        def stream_object(path, container=None, chunk_size=None):
+            """Yields object content by chunks"""
+            content = objects['/%s/%s' % (container, path)]
+            for index in range(0, len(content), chunk_size):
+                yield content[index:index + chunk_size]
+
+        @staticmethod
+        def create_object(container=None, name=None, data=None):
+            """Stores object"""
+            url = '/%s/%s' % (container, name)
+            objects[url] = data
+            manifests.discard(url)
+
+        @staticmethod
+        def get_object_metadata(path, container=None):
+            """Returns object metadata"""
+            url = '/%s/%s' % (container, path)
+            if url not in objects:
+                raise openstack.exceptions.NotFoundException()
+            return namedtuple('Object', 'is_static_large_object')(
+                url in manifests)
+
+        @staticmethod
+        def get(url, params=None, **_):
+            """Returns manifest"""
+            assert params == {'multipart-manifest': 'get'}
+            return dummy_response(200, json.dumps([
+                {'name': segment['path']}
+                for segment in objects[url]]).encode())
+
+        @staticmethod
+        def delete(url, **_):
+            """Deletes object"""
+            del objects[url]
+            return dummy_response(204)
+
+        @staticmethod
+        def put(url, data=None, params=None, **_):
+            """Stores containers, segments and manifest"""
+            response = dummy_response()
+            response.headers['Etag'] = '"etag_%s"' % url
+            if url.count('/') == 1:
+                return response
+            objects[url] = data
+            if params:
+                objects[url] = json.loads(data)
+                manifests.add(url)
+            return response
+
+    class DummySession:
+        """Dummy OpenStack connection"""
+        object_store = DummyObjectStore()
+
+    class RawStream(BytesIO):
+        """Stream returning at most 3 bytes by read"""
+
+        def read(self, size=-1):
+            """Short reads"""
+            return BytesIO.read(self, min(size, 3))
+
+    storage = SwiftStorage(
+        client_id='dummy_id', secret_id='dummy_secret',
+        region='dummy_region', project_id='dummy_project',
+        auth_url='dummy_url', interface='dummy_interface',
+        segment_size=4, max_concurrency=2, chunk_size=3)
+    storage._session = DummySession()
+
+    # Tests: Download by chunks
+    content = b'0123456789'
+    objects['/container/object'] = content
+    stream = BytesIO()
+    storage.copy_to_stream('container/object', stream)
+    assert stream.getvalue() == content
+
+    # Tests: Upload small object directly
+    objects.clear()
+    storage.copy_from_stream(BytesIO(b'012'), 'container/small')
+    assert objects == {'/container/small': b'012'}
+
+    # Tests: Upload large object by segments in segments container, even
+    # with short reads
+    objects.clear()
+    storage.copy_from_stream(RawStream(content), 'container/large')
+    manifest = objects['/container/large']
+    assert [segment['size_bytes'] for segment in manifest] == [4, 4, 2]
+    assert b''.join(objects[segment['path']]
+                    for segment in manifest) == content
+    for segment in manifest:
+        assert segment['path'].startswith('/container_segments/large/')
+        assert segment['etag'] == 'etag_%s' % segment['path']
+
+    # Tests: Overwritten large object segments are deleted
+    storage.copy_from_stream(BytesIO(content), 'container/large')
+    assert set(objects) == set(
+        ['/container/large'] +
+        [segment['path'] for segment in objects['/container/large']])
+    storage.copy_from_stream(BytesIO(b'012'), 'container/large')
+    assert objects == {'/container/large': b'012'}
+
+    # Tests: Segment size increased to not exceed segments count limit if
+    # stream size is known
+    objects.clear()
+    storage.MAX_SEGMENTS = 2
+    storage.copy_from_stream(BytesIO(content), 'container/large')
+    assert [segment['size_bytes']
+            for segment in objects['/container/large']] == [5, 5]
+
+    # Tests: Fails if stream size unknown and limit exceeded, without
+    # leaving segments
+    class UnseekableStream(object):
+        """Stream with only read"""
+
+        def __init__(self, data):
+            self._stream = BytesIO(data)
+
+        def read(self, size=-1):
+            """Read"""
+            return self._stream.read(size)
+
+    objects.clear()
+    with pytest.raises(exc.StorageRuntimeException):
+        storage.copy_from_stream(UnseekableStream(content), 'container/other')
+    assert objects == {}
+
+
+def test_swiftclass_presigned_url():
+    """Tests SwiftStorage.get_presigned_url"""
+    import hmac
+    from hashlib import sha256
+    from apyfal.storage.swift import SwiftStorage
+
+    endpoint = 'https://swift.accelize.com/v1/AUTH_account'
+
+    # Mocks OpenStack session
+    class DummyObjectStore:
+        """Dummy object store proxy"""
+
+        @staticmethod
+        def get_endpoint():
+            """Returns endpoint"""
+            return endpoint
+
+    class DummySession:
+        """Dummy OpenStack connection"""
+        object_store = DummyObjectStore()
+
+    kwargs = dict(client_id='dummy_id', secret_id='dummy_secret',
+                  region='dummy_region', project_id='dummy_project',
+                  auth_url='dummy_url', interface='dummy_interface')
+
+    # Tests: Not supported without key
+    storage = SwiftStorage(**kwargs)
+    assert storage.get_presigned_url('container/object', 'rb', 60) is None
+
+    # Tests: TempURL
+    storage = SwiftStorage(temp_url_key='key', **kwargs)
+    storage._session = DummySession()
+    url = storage.get_presigned_url('container/my object', 'wb', 60)
+    base, query = url.split('?')
+    assert base == endpoint + '/container/my%20object'
+    query = dict(item.split('=') for item in query.split('&'))
+    assert query['temp_url_sig'] == hmac.new(
+        b'key', ('PUT\n%s\n/v1/AUTH_account/container/my object' %
+                 query['temp_url_expires']).encode(), sha256).hexdigest()
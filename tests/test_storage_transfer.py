@@ -0,0 +1,81 @@
+# coding=utf-8
+"""apyfal.storage._transfer tests"""
+from io import BytesIO
+import os
+
+
+def test_copy_file(tmpdir):
+    """Tests copy_file and link_or_copy"""
+    from apyfal.storage._transfer import copy_file, link_or_copy
+
+    content = os.urandom(1024 * 3)
+    src = tmpdir.join('src')
+    src.write_binary(content)
+    src.chmod(0o640)
+    src_path = str(src)
+
+    # Copy to file
+    dst = tmpdir.join('dst')
+    assert copy_file(src_path, str(dst)) == str(dst)
+    assert dst.read_binary() == content
+    assert dst.stat().mode & 0o777 == 0o640
+
+    # Copy to directory
+    dst_dir = tmpdir.mkdir('dir')
+    assert copy_file(src_path, str(dst_dir)) == str(dst_dir.join('src'))
+    assert dst_dir.join('src').read_binary() == content
+
+    # Link
+    link = tmpdir.join('link')
+    link_or_copy(src_path, str(link))
+    assert link.read_binary() == content
+
+
+def test_copy_stream(tmpdir):
+    """Tests copy_stream"""
+    import apyfal.storage._transfer as transfer
+
+    content = os.urandom(1024 * 3)
+    src = tmpdir.join('src')
+    src.write_binary(content)
+    dst = tmpdir.join('dst')
+
+    def copy_files(buffer_size=8):
+        """Copy files with non zero streams positions"""
+        with open(str(src), 'rb') as src_file:
+            src_file.read(10)
+            with open(str(dst), 'wb') as dst_file:
+                dst_file.write(b'header')
+                transfer.copy_stream(src_file, dst_file, buffer_size)
+                assert src_file.tell() == len(content)
+                assert dst_file.tell() == len(content) - 4
+                dst_file.write(b'footer')
+        assert dst.read_binary() == b'header' + content[10:] + b'footer'
+
+    # Files: In kernel copy
+    copy_files()
+
+    # Files: In kernel copy not supported
+    def not_supported(*_):
+        """Fails"""
+        raise OSError
+
+    def partial(src_fd, dst_fd, offset, count):
+        """Copy a part, then fails"""
+        if offset > 1024:
+            raise OSError
+        return os.write(dst_fd, os.pread(src_fd, 100, offset)) if hasattr(
+            os, 'pread') else not_supported()
+
+    kernel_copy = transfer._KERNEL_COPY
+    try:
+        for functions in ((not_supported,), (partial,), ()):
+            transfer._KERNEL_COPY = functions
+            copy_files()
+    finally:
+        transfer._KERNEL_COPY = kernel_copy
+
+    # Streams: Buffered copy
+    dst_stream = BytesIO()
+    transfer.copy_stream(BytesIO(content), dst_stream, 10)
+    assert dst_stream.getvalue() == content
@@ -136,3 +136,274 @@ def test_handle_request_exceptions():
     with pytest.raises(exc.AcceleratorException):
         with handle_request_exceptions(exc.AcceleratorException):
             raise requests.RequestException
+
+
+def test_compression():
+    """Tests apyfal._utilities.compression"""
+    from io import BytesIO
+    import zlib
+    import apyfal._utilities.compression as compression
+    from apyfal.exceptions import (
+        ClientConfigurationException, ClientRuntimeException)
+
+    content = os.urandom(100) * 1000
+
+    # Compresses stream
+    reader = compression.CompressReader(
+        BytesIO(content), 'gzip', level=1, chunk_size=1000)
+    assert reader.readable()
+    compressed = reader.read(10)
+    assert len(compressed) == 10
+    buffer = bytearray(100)
+    assert reader.readinto(buffer) == 100
+    compressed += bytes(buffer) + reader.read()
+    assert not reader.read(10)
+    assert zlib.decompress(compressed, 16 + zlib.MAX_WBITS) == content
+    stats = reader.stats
+    assert stats['encoding'] == 'gzip'
+    assert stats['size'] == len(content)
+    assert stats['compressed_size'] == len(compressed)
+    assert stats['cpu_time'] >= 0
+
+    # Decompresses to stream
+    stream = BytesIO()
+    with compression.DecompressWriter(stream, 'gzip') as writer:
+        assert writer.writable()
+        for index in range(0, len(compressed), 1000):
+            writer.write(compressed[index:index + 1000])
+    assert stream.getvalue() == content
+    assert not stream.closed
+    assert writer.stats['size'] == len(content)
+    assert writer.stats['compressed_size'] == len(compressed)
+
+    # zlib "deflate" content encoding
+    stream = BytesIO()
+    with compression.DecompressWriter(stream, 'deflate') as writer:
+        writer.write(zlib.compress(content))
+    assert stream.getvalue() == content
+
+    # zstd, if available
+    if compression._zstd is not None:
+        compressed = compression.CompressReader(
+            BytesIO(content), 'zstd').read()
+        stream = BytesIO()
+        with compression.DecompressWriter(stream, 'zstd') as writer:
+            writer.write(compressed)
+        assert stream.getvalue() == content
+
+    # zstd, not available
+    zstd = compression._zstd
+    compression._zstd = None
+    try:
+        with pytest.raises(ClientConfigurationException):
+            compression.compressor('zstd')
+        with pytest.raises(ClientConfigurationException):
+            compression.decompressor('zstd')
+    finally:
+        compression._zstd = zstd
+
+    # Unsupported encodings
+    with pytest.raises(ClientConfigurationException):
+        compression.compressor('br')
+    with pytest.raises(ClientRuntimeException):
+        compression.decompressor('br')
+
+
+def test_retry_policy():
+    """Tests RetryPolicy"""
+    from requests.packages.urllib3.exceptions import (
+        MaxRetryError, NewConnectionError, ReadTimeoutError)
+    from apyfal._utilities.retry import RetryPolicy
+    from apyfal._utilities.http import TimeoutHTTPAdapter
+    from apyfal.configuration import Configuration
+    import apyfal._utilities.retry as retry_module
+    import apyfal._utilities.http as http_module
+
+    # Mocks sleep
+    slept = []
+    retry_module._sleep, sleep = slept.append, retry_module._sleep
+
+    try:
+        # Tests: Defaults and configuration
+        policy = RetryPolicy()
+        assert policy.max_retries == RetryPolicy.MAX_RETRIES
+        assert policy.timeout == (
+            RetryPolicy.CONNECT_TIMEOUT, RetryPolicy.READ_TIMEOUT)
+
+        config = Configuration()
+        config['storage']['retry_max'] = '5'
+        config['storage']['connect_timeout'] = '2'
+        config['storage.s3']['read_timeout'] = '4'
+        policy = config.get_retry_policy('storage.s3')
+        assert config.get_retry_policy('storage.s3') is policy
+        assert policy.max_retries == 5
+        assert policy.timeout == (2.0, 4.0)
+        assert policy.botocore_kwargs() == dict(
+            connect_timeout=2.0, read_timeout=4.0,
+            retries={'max_attempts': 5})
+
+        # Tests: Exponential backoff with jitter
+        policy = RetryPolicy(backoff=1, max_backoff=5)
+        for retry, maximum in ((0, 1), (1, 2), (2, 4), (3, 5), (100, 5)):
+            for _ in range(20):
+                assert 0 <= policy.delay(retry) <= maximum
+
+        # Tests: Call retried until success
+        calls = []
+
+        def func(fails):
+            """Fails "fails" times"""
+            calls.append(1)
+            if len(calls) <= fails:
+                raise ValueError
+            return len(calls)
+
+        policy = RetryPolicy(max_retries=3)
+        assert policy.call(func, (ValueError,), 2) == 3
+        assert len(slept) == 2
+
+        # Tests: Max retries
+        del calls[:]
+        with pytest.raises(ValueError):
+            policy.call(func, (ValueError,), 10)
+        assert len(calls) == 4
+
+        # Tests: Not retried exception
+        del calls[:]
+        with pytest.raises(ValueError):
+            policy.call(func, (TypeError,), 10)
+        assert len(calls) == 1
+
+        # Tests: Retry budget
+        policy = RetryPolicy(max_retries=100, retry_budget=0.5)
+        del calls[:]
+        with pytest.raises(ValueError):
+            policy.call(func, (ValueError,), 100)
+        assert len(calls) == int(RetryPolicy.MAX_TOKENS) + 1
+        assert not policy.allow_retry(0)
+        policy.record_call()
+        assert not policy.allow_retry(0)
+        policy.record_call()
+        assert policy.allow_retry(0)
+
+        # Tests: urllib3 retries with policy
+        policy = RetryPolicy(max_retries=2)
+        retry = policy.urllib3_retry()
+        error = NewConnectionError(None, 'error')
+        retry = retry.increment('GET', '/', error=error)
+        assert retry.get_backoff_time() <= RetryPolicy.BACKOFF
+        retry = retry.increment('GET', '/', error=error)
+        with pytest.raises(MaxRetryError):
+            retry.increment('GET', '/', error=error)
+
+        # Tests: urllib3 retries stop when budget exhausted
+        policy._tokens = 0.0
+        with pytest.raises(MaxRetryError):
+            policy.urllib3_retry().increment('GET', '/', error=error)
+
+        # Tests: No retry token consumed if urllib3 does not retry
+        policy._tokens = 1.0
+        with pytest.raises(ReadTimeoutError):
+            policy.urllib3_retry().increment(
+                'POST', '/', error=ReadTimeoutError(None, '/', 'error'))
+        assert policy._tokens == 1.0
+
+        # Tests: HTTP adapter default timeout
+        sent = {}
+
+        def send(_, request, **kwargs):
+            """Returns arguments"""
+            sent.update(kwargs)
+
+        adapter = TimeoutHTTPAdapter(RetryPolicy(connect_timeout=1,
+                                                 read_timeout=2))
+        http_module._HTTPAdapter.send, adapter_send = (
+            send, http_module._HTTPAdapter.send)
+        try:
+            adapter.send(None, timeout=None)
+            assert sent['timeout'] == (1.0, 2.0)
+            adapter.send(None, timeout=5)
+            assert sent['timeout'] == 5
+        finally:
+            http_module._HTTPAdapter.send = adapter_send
+        assert adapter.max_retries.total == RetryPolicy.MAX_RETRIES
+
+    finally:
+        retry_module._sleep = sleep
+
+
+def test_factory():
+    """Tests factory and register"""
+    from collections import namedtuple
+    import apyfal._utilities as utl
+    from apyfal.exceptions import AcceleratorException
+
+    class Root(utl.FactoryABC):
+        """Root class"""
+
+        def __new__(cls, cls_type=None):
+            return utl.factory(cls, cls_type, 'cls_type',
+                               AcceleratorException)
+
+    class Child(Root):
+        """Registered on definition"""
+        NAME = 'Child'
+
+    class GrandChild(Child):
+        """Registered on definition"""
+        NAME = 'GrandChild'
+
+    class NotNamed(Child):
+        """Not registered"""
+
+    # Tests: Registered on definition
+    assert type(Root('child')) is Child
+    assert type(Root('GRANDCHILD')) is GrandChild
+    assert type(Root()) is Root
+    assert utl._FACTORY_REGISTRY[Child] == {'grandchild': GrandChild}
+
+    # Tests: Explicit registration
+    utl.register(NotNamed, 'not_named')
+    assert type(Root('not_named')) is NotNamed
+
+    # Tests: Entry point
+    class Plugin(Root):
+        """Loaded from entry point"""
+
+    entry_point = namedtuple('EntryPoint', 'name load')
+    entry_points = utl._entry_points
+    utl._entry_points = lambda group: [
+        entry_point('other', lambda: None),
+        entry_point('plugin', lambda: Plugin)] if group == __name__ else []
+    try:
+        assert type(Root('plugin')) is Plugin
+
+        # Tests: Not found
+        with pytest.raises(AcceleratorException):
+            Root('not_exists')
+    finally:
+        utl._entry_points = entry_points
+
+    # Tests: Existing module without target class
+    Root.__module__ = 'apyfal'
+    with pytest.raises(AcceleratorException):
+        Root('exceptions')
+
+    # Tests: Entry points lookup
+    assert isinstance(utl._entry_points('apyfal.not_exists'), list)
+
+
+def test_openstack_connect():
+    """Tests apyfal._utilities.openstack.connect"""
+    from keystoneauth1.session import TCPKeepAliveAdapter
+    from apyfal._utilities.openstack import connect
+
+    # Tests: Connection pool sized, with TCP keep-alive
+    connection = connect(
+        region='dummy_region', auth_url='http://dummy_url',
+        client_id='dummy_id', secret_id='dummy_secret',
+        project_id='dummy_project', interface='public', pool_size=7)
+    for url in ('https://dummy_url', 'http://dummy_url'):
+        adapter = connection.session.session.get_adapter(url)
+        assert isinstance(adapter, TCPKeepAliveAdapter)
+        assert adapter._pool_maxsize == 7